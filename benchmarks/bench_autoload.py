@@ -0,0 +1,225 @@
+"""Replay recorded snmpwalk fixtures through PanOSGenericSNMPAutoload.discover.
+
+Reports wall time, allocated blocks, allocated and peak memory per stage
+for small, mid and large devices.
+
+Run from the repository root: python -m benchmarks.bench_autoload
+Store results with --json and compare a later run with --baseline, the run
+fails if any stage is slower or takes more memory than the tolerance allows.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from cloudshell.snmp.autoload.helper.snmp_autoload_helper import log_autoload_details
+
+from cloudshell.paloalto.autoload.panos_generic_snmp_autoload import (
+    PanOSGenericSNMPAutoload,
+)
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    create_resource_model,
+    patch_multi_get,
+    read_snmpwalk,
+)
+
+logger = logging.getLogger(__name__)
+
+DEVICES = {
+    "PA-220": "pa-220.snmpwalk",
+    "PA-3220": "pa-3220.snmpwalk",
+    "PA-7080": "pa-7080.snmpwalk.gz",
+}
+STAGES = ("mib load", "system info", "entity table", "port table", "resource model")
+SUPPORTED_OS = ["Palo Alto"]
+
+
+def _mib_load(context: dict) -> None:
+    context["autoload"] = PanOSGenericSNMPAutoload(
+        context["snmp_service"], context["resource_model"]
+    )
+
+
+def _system_info(context: dict) -> None:
+    system_info = context["autoload"].system_info_service
+    if not system_info.is_valid_device_os(SUPPORTED_OS):
+        raise Exception("Benchmark", "Fixture has unsupported device OS")
+    system_info.fill_attributes(context["resource_model"])
+
+
+def _entity_table(context: dict) -> None:
+    physical_table = context["autoload"].physical_table_service
+    physical_table.physical_chassis_dict
+    physical_table.physical_power_ports_dict
+
+
+def _port_table(context: dict) -> None:
+    port_table = context["autoload"].port_table_service
+    port_table.port_channels_dict
+    port_table.ports_dict
+
+
+def _resource_model(context: dict) -> None:
+    autoload = context["autoload"]
+    try:
+        autoload._build_chassis()
+        autoload._build_power_ports()
+        autoload._build_ports_structure()
+        autoload._get_port_channels()
+        context["details"] = context["resource_model"].build()
+        log_autoload_details(logger, context["details"])
+    finally:
+        autoload._destroy_threads()
+
+
+STAGE_FUNCTIONS: dict[str, Callable[[dict], None]] = dict(
+    zip(STAGES, (_mib_load, _system_info, _entity_table, _port_table, _resource_model))
+)
+
+
+@contextmanager
+def _measure_memory(stats: dict):
+    gc.collect()
+    tracemalloc.start()
+    start_blocks = sys.getallocatedblocks()
+    start_size, _ = tracemalloc.get_traced_memory()
+    try:
+        yield
+    finally:
+        end_size, peak_size = tracemalloc.get_traced_memory()
+        stats["blocks"] = sys.getallocatedblocks() - start_blocks
+        stats["allocated"] = end_size - start_size
+        stats["peak"] = peak_size - start_size
+        tracemalloc.stop()
+
+
+def _run_stages(records: dict, memory: bool) -> tuple[dict[str, dict], dict]:
+    # creating snmp engine builds the pysnmp mib compiler, it's the same
+    # for every driver so it's not a part of the autoload stages
+    context = {
+        "snmp_service": FakeSnmpService(records, logger),
+        "resource_model": create_resource_model(),
+    }
+    result = {}
+    for stage in STAGES:
+        stats = {}
+        if memory:
+            with _measure_memory(stats):
+                STAGE_FUNCTIONS[stage](context)
+        else:
+            start = time.perf_counter()
+            STAGE_FUNCTIONS[stage](context)
+            stats["time"] = time.perf_counter() - start
+        result[stage] = stats
+    return result, context
+
+
+def benchmark_device(path: str, rounds: int = 3) -> dict[str, dict]:
+    """Measure autoload stages of the recorded device.
+
+    Time is a median of the rounds measured without tracing, memory stats
+    are taken from a separate traced round.
+    """
+    records = read_snmpwalk(path)
+    with patch_multi_get():
+        timings = [_run_stages(records, memory=False)[0] for _ in range(rounds)]
+        memory, context = _run_stages(records, memory=True)
+
+    result = {}
+    for stage in STAGES:
+        result[stage] = {
+            "time": statistics.median(x[stage]["time"] for x in timings),
+            **memory[stage],
+        }
+    result["total"] = {
+        key: sum(result[stage][key] for stage in STAGES)
+        for key in ("time", "blocks", "allocated")
+    }
+    result["total"]["peak"] = max(result[stage]["peak"] for stage in STAGES)
+    result["total"]["resources"] = len(context["details"].resources)
+    result["total"]["round_trips"] = context["snmp_service"].round_trips
+    return result
+
+
+def find_regressions(
+    results: dict, baseline: dict, tolerance: float, min_time: float = 0.005
+) -> list[str]:
+    """Compare results with the baseline, stages faster than min_time are noise."""
+    regressions = []
+    for device, stages in results.items():
+        for stage, stats in stages.items():
+            base = baseline.get(device, {}).get(stage)
+            if not base:
+                continue
+            for key in ("time", "peak"):
+                if key == "time" and max(stats[key], base[key]) < min_time:
+                    continue
+                if stats[key] > base[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{device} {stage} {key}: {base[key]:.4g} -> {stats[key]:.4g}"
+                    )
+    return regressions
+
+
+def _print_results(results: dict) -> None:
+    print(  # noqa: T201
+        f"{'device':<8} {'stage':<15} {'time ms':>10} {'blocks':>10} "
+        f"{'alloc KiB':>11} {'peak KiB':>10}"
+    )
+    for device, stages in results.items():
+        for stage, stats in stages.items():
+            print(  # noqa: T201
+                f"{device:<8} {stage:<15} {stats['time'] * 1000:10.2f} "
+                f"{stats['blocks']:10d} {stats['allocated'] / 1024:11.1f} "
+                f"{stats['peak'] / 1024:10.1f}"
+            )
+        total = stages["total"]
+        print(  # noqa: T201
+            f"{device:<8} resources {total['resources']}, "
+            f"snmp round trips {total['round_trips']}"
+        )
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--device", action="append", choices=list(DEVICES))
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", help="store results into the file")
+    parser.add_argument("--baseline", help="compare with results stored before")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(args)
+
+    results = {}
+    for device in args.device or DEVICES:
+        path = os.path.join(FIXTURES_DIR, DEVICES[device])
+        results[device] = benchmark_device(path, args.rounds)
+    _print_results(results)
+
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as json_file:
+            regressions = find_regressions(
+                results, json.load(json_file), args.tolerance
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")  # noqa: T201
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Compare PanOSGenericSNMPAutoload construction with and without mib cache.
+
+Run from the repository root: python -m benchmarks.bench_mib_load
+"""
+from __future__ import annotations
+
+import logging
+import statistics
+import time
+from unittest.mock import Mock
+
+from cloudshell.snmp.autoload.generic_snmp_autoload import GenericSNMPAutoload
+from cloudshell.snmp.core.snmp_engine import QualiSnmpEngine
+from cloudshell.snmp.core.snmp_msg_pdu_dsp import QualiMsgAndPduDispatcher
+from cloudshell.snmp.core.snmp_service import SnmpService
+
+from cloudshell.paloalto.autoload.panos_generic_snmp_autoload import (
+    MIBS_FOLDER,
+    PanOSGenericSNMPAutoload,
+)
+
+ROUNDS = 50
+logger = logging.getLogger(__name__)
+
+
+def _create_snmp_service() -> SnmpService:
+    snmp_engine = QualiSnmpEngine(logger, msg_pdu_dsp=QualiMsgAndPduDispatcher())
+    return SnmpService(snmp_engine, None, None, logger)
+
+
+def _json_mibs_autoload(snmp_service):
+    """Construction as it was before the mib cache: parse json every time."""
+    autoload = PanOSGenericSNMPAutoload.__new__(PanOSGenericSNMPAutoload)
+    GenericSNMPAutoload.__init__(autoload, snmp_service, logger, Mock())
+    GenericSNMPAutoload.load_mibs(autoload, MIBS_FOLDER)
+    return autoload
+
+
+def _cached_mibs_autoload(snmp_service):
+    return PanOSGenericSNMPAutoload(snmp_service, Mock())
+
+
+def _measure(factory) -> list[float]:
+    timings = []
+    for _ in range(ROUNDS):
+        snmp_service = _create_snmp_service()
+        start = time.perf_counter()
+        factory(snmp_service)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    for name, factory in (
+        ("json mibs", _json_mibs_autoload),
+        ("cached mibs", _cached_mibs_autoload),
+    ):
+        timings = _measure(factory)
+        print(  # noqa: T201
+            f"{name:<12} first {timings[0] * 1000:8.2f} ms  "
+            f"median {statistics.median(timings) * 1000:8.2f} ms  "
+            f"rounds {ROUNDS}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Compare output checks and prompt matching on multi-MB command outputs.
+
+Prompt matching replays a show config running output read in chunks, the
+way the CLI session reads it, and matches the expected prompt after every
+read against the whole buffer and against its tail.
+
+Run from the repository root: python -m benchmarks.bench_output_patterns
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+from cloudshell.paloalto.cli.panos_command_modes import (
+    ConfigCommandMode,
+    DefaultCommandMode,
+)
+from cloudshell.paloalto.helpers import output_patterns
+
+PROMPTS = f"{DefaultCommandMode.PROMPT}|{ConfigCommandMode.PROMPT}"
+READ_SIZE = 4096
+
+
+def generate_running_config(size: int) -> str:
+    """Set format running config of about size bytes."""
+    lines = []
+    length = 0
+    i = 0
+    while length < size:
+        line = (
+            f"set rulebase security rules rule-{i} from trust to untrust "
+            f"source [ 10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256} ] "
+            f"destination any application web-browsing action allow"
+        )
+        lines.append(line)
+        length += len(line) + 1
+        i += 1
+    return "\n".join(lines) + "\n[edit]\nadmin@fw1# "
+
+
+def _whole_buffer_match(prompt: str, output: str) -> bool:
+    # CLI session default, the pattern is built and searched on every read
+    return bool(re.search(prompt, output, re.DOTALL))
+
+
+def replay_reads(output: str, match: Callable[[str, str], bool]) -> int:
+    """Match the prompt after every read, return the number of reads."""
+    buffer = ""
+    reads = 0
+    for start in range(0, len(output), READ_SIZE):
+        buffer += output[start : start + READ_SIZE]
+        reads += 1
+        if match(PROMPTS, buffer):
+            break
+    return reads
+
+
+def _search_fstring(output: str, filename: str) -> bool:
+    return bool(re.search(rf"Config saved to {filename}", output, re.IGNORECASE))
+
+
+def _search_registry(output: str, filename: str) -> bool:
+    return bool(output_patterns.CONFIG_SAVED.search(output, filename=filename))
+
+
+def _measure(func: Callable[[], object], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def benchmark(size: int, rounds: int = 3) -> dict[str, float]:
+    output = generate_running_config(size)
+    save_output = output.replace("[edit]", "Config saved to running-config.xml\n")
+    return {
+        "prompt whole buffer": _measure(
+            lambda: replay_reads(output, _whole_buffer_match), rounds
+        ),
+        "prompt tail": _measure(
+            lambda: replay_reads(output, output_patterns.match_prompt), rounds
+        ),
+        "check f-string": _measure(
+            lambda: _search_fstring(save_output, "running-config.xml"), rounds
+        ),
+        "check registry": _measure(
+            lambda: _search_registry(save_output, "running-config.xml"), rounds
+        ),
+    }
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, action="append", help="output size in MiB")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(args)
+
+    print(f"{'size MiB':>8} {'case':<20} {'time ms':>10}")  # noqa: T201
+    for size in args.size or (1, 4):
+        for case, result in benchmark(size * 1024 * 1024, args.rounds).items():
+            print(f"{size:>8} {case:<20} {result * 1000:10.2f}")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
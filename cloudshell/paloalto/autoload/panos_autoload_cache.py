@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, ClassVar
+
+from attrs import asdict, define
+
+from cloudshell.shell.core.driver_context import (
+    AutoLoadAttribute,
+    AutoLoadDetails,
+    AutoLoadResource,
+)
+from cloudshell.snmp.core.domain.snmp_oid import SnmpMibObject
+
+from cloudshell.paloalto.autoload.panos_snmp_scalars import ResolvedOid
+
+if TYPE_CHECKING:
+    from cloudshell.snmp.core.snmp_service import SnmpService
+
+logger = logging.getLogger(__name__)
+
+SYS_UP_TIME = SnmpMibObject("SNMPv2-MIB", "sysUpTime", "0")
+IF_NUMBER = SnmpMibObject("IF-MIB", "ifNumber", "0")
+IF_TABLE_LAST_CHANGE = SnmpMibObject("IF-MIB", "ifTableLastChange", "0")
+
+
+@define(frozen=True)
+class DeviceState:
+    """Cheap scalars that change whenever the device structure changes."""
+
+    # sysUpTime drifts from the local clock, allowed difference of boot time
+    BOOT_TIME_TOLERANCE: ClassVar[int] = 60
+
+    sys_up_time: int
+    if_number: int
+    if_table_last_change: int
+    checked_at: float
+
+    @classmethod
+    def from_device(cls, snmp_service: SnmpService) -> DeviceState | None:
+        """Get device state in one round trip, None if it cannot be read."""
+        values = {}
+        checked_at = time.time()
+        try:
+            responses = snmp_service.get_list(
+                [ResolvedOid(x) for x in (SYS_UP_TIME, IF_NUMBER, IF_TABLE_LAST_CHANGE)]
+            )
+            for response in responses:
+                values[response.mib_id] = int(response.raw_value)
+        except Exception:
+            logger.debug("Unable to read device state", exc_info=True)
+            return None
+
+        try:
+            return cls(
+                sys_up_time=values[SYS_UP_TIME.object_name],
+                if_number=values[IF_NUMBER.object_name],
+                if_table_last_change=values[IF_TABLE_LAST_CHANGE.object_name],
+                checked_at=checked_at,
+            )
+        except KeyError:
+            logger.debug(f"Device state is incomplete: {values}")
+            return None
+
+    @property
+    def boot_time(self) -> float:
+        # sysUpTime is in hundredths of a second
+        return self.checked_at - self.sys_up_time / 100
+
+    def is_changed_since(self, previous: DeviceState) -> bool:
+        return (
+            abs(self.boot_time - previous.boot_time) > self.BOOT_TIME_TOLERANCE
+            or self.if_number != previous.if_number
+            or self.if_table_last_change != previous.if_table_last_change
+        )
+
+
+class PanOSAutoloadCache:
+    """On-disk cache of the last autoload details per device."""
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir: str | None = None):
+        self._cache_dir = cache_dir or os.path.join(
+            tempfile.gettempdir(), "cloudshell-paloalto-autoload"
+        )
+
+    def _get_file_path(self, device_key: str) -> str:
+        file_name = hashlib.sha1(device_key.encode()).hexdigest()
+        return os.path.join(self._cache_dir, f"{file_name}.json")
+
+    def load(self, device_key: str) -> tuple[DeviceState, AutoLoadDetails] | None:
+        try:
+            with open(self._get_file_path(device_key)) as cache_file:
+                data = json.load(cache_file)
+            if data["version"] != self.CACHE_VERSION or data["key"] != device_key:
+                return None
+            state = DeviceState(**data["state"])
+            details = AutoLoadDetails(
+                [AutoLoadResource(**x) for x in data["resources"]],
+                [AutoLoadAttribute(**x) for x in data["attributes"]],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return state, details
+
+    def save(
+        self, device_key: str, state: DeviceState, details: AutoLoadDetails
+    ) -> None:
+        data = {
+            "version": self.CACHE_VERSION,
+            "key": device_key,
+            "state": asdict(state),
+            "resources": [
+                {
+                    "model": x.model,
+                    "name": x.name,
+                    "relative_address": x.relative_address,
+                    "unique_identifier": x.unique_identifier,
+                }
+                for x in details.resources
+            ],
+            "attributes": [
+                {
+                    "relative_address": x.relative_address,
+                    "attribute_name": x.attribute_name,
+                    "attribute_value": x.attribute_value,
+                }
+                for x in details.attributes
+            ],
+        }
+        file_path = self._get_file_path(device_key)
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir)
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(data, tmp_file)
+            os.replace(tmp_path, file_path)
+        except (OSError, TypeError, ValueError):
+            logger.warning("Unable to store autoload details", exc_info=True)
+
+    def invalidate(self, device_key: str) -> None:
+        try:
+            os.remove(self._get_file_path(device_key))
+        except OSError:
+            pass
@@ -6,8 +6,14 @@ from functools import cached_property
 from typing import TYPE_CHECKING
 
 from cloudshell.snmp.autoload.generic_snmp_autoload import GenericSNMPAutoload
+from cloudshell.snmp.autoload.snmp.tables.snmp_entity_table import SnmpEntityTable
+from cloudshell.snmp.autoload.snmp.tables.snmp_port_mapping_table import (
+    SnmpPortMappingTable,
+)
+from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
 
 from cloudshell.paloalto.autoload.panos_if_table import PANOSIfTable
+from cloudshell.paloalto.autoload.panos_mib_cache import PanOSCachedMibSource
 from cloudshell.paloalto.autoload.panos_snmp_system_info import PanOSSNMPSystemInfo
 
 if TYPE_CHECKING:
@@ -15,16 +21,41 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+MIBS_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), "mibs"))
+
 
 class PanOSGenericSNMPAutoload(GenericSNMPAutoload):
     def __init__(self, snmp_handler, resource_model):
         super().__init__(snmp_handler, logger, resource_model)
-        self.load_mibs(os.path.abspath(os.path.join(os.path.dirname(__file__), "mibs")))
+        self.load_mibs(MIBS_FOLDER)
+
+    def load_mibs(self, path: str) -> None:
+        """Load mibs inside snmp handler using the precompiled mib bundle."""
+        snmp_engine = getattr(self.snmp_handler, "_snmp_engine", None)
+        if snmp_engine is None:
+            return super().load_mibs(path)
+
+        mib_builder = snmp_engine.mib_builder
+        mib_source = PanOSCachedMibSource(path)
+        mib_builder.setMibSources(mib_source, *mib_builder.getMibSources())
+        mib_source.preload(mib_builder)
 
     @cached_property
     def system_info_service(self) -> SnmpSystemInfo:
         return PanOSSNMPSystemInfo(self.snmp_handler, logger)
 
+    @cached_property
+    def port_snmp_mapping_table(self) -> SnmpPortMappingTable:
+        return SnmpPortMappingTable(snmp_handler=self.snmp_handler, logger=self.logger)
+
+    @cached_property
+    def snmp_physical_structure(self) -> SnmpEntityTable:
+        return SnmpEntityTable(snmp_handler=self.snmp_handler, logger=self.logger)
+
+    @cached_property
+    def port_snmp_table(self) -> SnmpPortsTable:
+        return SnmpPortsTable(snmp_handler=self.snmp_handler, logger=self.logger)
+
     @property
     def port_table_service(self) -> PANOSIfTable:
         if not self._port_table_service:
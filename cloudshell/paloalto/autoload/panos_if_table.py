@@ -1,28 +1,132 @@
-import re
-from functools import lru_cache
-from logging import Logger
-
-from cloudshell.snmp.autoload.helper.types.resource_model import ResourceModelProto
-from cloudshell.snmp.autoload.services.port_table import PortsTable
-from cloudshell.snmp.autoload.snmp.entities.snmp_if_entity import SnmpIfEntity
-from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
-
-
-class PANOSSnmpIfEntity(SnmpIfEntity):
-    @property
-    @lru_cache
-    def port_name(self):
-        result = self.if_name or self.if_descr_name
-        result = re.sub(r"node\d+:", "", result.replace("/", "-"))
-        return result.replace(":", "_")
-
-
-class PANOSIfTable(PortsTable):
-    def __init__(
-        self,
-        resource_model: ResourceModelProto,
-        ports_snmp_table: SnmpPortsTable,
-        logger: Logger,
-    ):
-        super().__init__(resource_model, ports_snmp_table, logger)
-        self._if_entity = PANOSSnmpIfEntity
+from __future__ import annotations
+
+import re
+from functools import cached_property
+from logging import Logger
+
+from cloudshell.snmp.autoload.constants.port_constants import (
+    PORT_DESCR_NAME,
+    PORT_DESCRIPTION,
+    PORT_MAC,
+    PORT_MTU,
+    PORT_NAME,
+    PORT_SPEED,
+    PORT_TYPE,
+)
+from cloudshell.snmp.autoload.helper.types.resource_model import ResourceModelProto
+from cloudshell.snmp.autoload.services.port_table import PortsTable
+from cloudshell.snmp.autoload.snmp.entities.snmp_if_entity import SnmpIfEntity
+from cloudshell.snmp.autoload.snmp.tables.snmp_ports_table import SnmpPortsTable
+
+
+class PANOSSnmpIfEntity:
+    """Compact IF-MIB entity, interface of SnmpIfEntity without global caches.
+
+    Chassis may have thousands of interfaces so the entity keeps only
+    the ifIndex, a link to the IF-MIB row and the calculated port name.
+    """
+
+    __slots__ = ("if_index", "_if_table_row", "_port_name")
+
+    PORT_IDS_PATTERN = SnmpIfEntity.PORT_IDS_PATTERN
+    NODE_PREFIX_PATTERN = re.compile(r"node\d+:")
+
+    def __init__(self, port_index, port_row):
+        self.if_index = port_index
+        self._if_table_row = port_row
+        self._port_name = None
+
+    def _get_value(self, object_name: str) -> str | None:
+        result = self._if_table_row.get(object_name)
+        if result:
+            return result.safe_value
+
+    @property
+    def port_name(self) -> str:
+        if self._port_name is None:
+            result = self.if_name or self.if_descr_name
+            result = self.NODE_PREFIX_PATTERN.sub("", result.replace("/", "-"))
+            self._port_name = result.replace(":", "_")
+        return self._port_name
+
+    @property
+    def if_name(self) -> str:
+        return self._get_value(PORT_NAME.object_name) or ""
+
+    @property
+    def if_descr_name(self) -> str:
+        return self._get_value(PORT_DESCR_NAME.object_name) or ""
+
+    @property
+    def if_port_description(self) -> str | None:
+        return self._get_value(PORT_DESCRIPTION.object_name)
+
+    @property
+    def if_type(self) -> str:
+        if_type = self._if_table_row.get(PORT_TYPE.object_name)
+        result = "other"
+        if if_type:
+            result = if_type.safe_value.strip("'")
+        return result
+
+    @property
+    def port_id(self) -> str | None:
+        port_id = self.PORT_IDS_PATTERN.search(self.port_name)
+        if port_id:
+            return port_id.group().replace("/", "-")
+
+    @property
+    def if_speed(self) -> str:
+        return self._get_value(PORT_SPEED.object_name) or ""
+
+    @property
+    def if_mtu(self) -> str | None:
+        return self._get_value(PORT_MTU.object_name)
+
+    @property
+    def if_mac(self) -> str | None:
+        return self._get_value(PORT_MAC.object_name)
+
+
+class PANOSIfTable(PortsTable):
+    def __init__(
+        self,
+        resource_model: ResourceModelProto,
+        ports_snmp_table: SnmpPortsTable,
+        logger: Logger,
+    ):
+        super().__init__(resource_model, ports_snmp_table, logger)
+        self._if_entity = PANOSSnmpIfEntity
+        self._if_entities: dict[str, PANOSSnmpIfEntity] = {}
+
+    def load_if_port(self, index: str) -> PANOSSnmpIfEntity:
+        """Load IF-MIB entity, entities live as long as the table."""
+        if_entity = self._if_entities.get(index)
+        if if_entity is None:
+            if_entity = super().load_if_port(index)
+            self._if_entities[index] = if_entity
+        return if_entity
+
+    @cached_property
+    def port_exclude_re(self):
+        return re.compile("|".join(self.PORT_EXCLUDE_LIST), re.IGNORECASE)
+
+    @cached_property
+    def port_channel_name_re(self):
+        return re.compile("|".join(self.PORT_CHANNEL_NAME_LIST), re.IGNORECASE)
+
+    @cached_property
+    def port_name_re(self):
+        return re.compile("|".join(self.PORT_NAME_LIST), re.IGNORECASE)
+
+    @cached_property
+    def port_channel_exclude_re(self):
+        return re.compile("|".join(self.PORT_CHANNEL_EXCLUDE_LIST), re.IGNORECASE)
+
+    @cached_property
+    def port_valid_type_re(self):
+        return re.compile("|".join(self.PORT_VALID_TYPE_LIST), re.IGNORECASE)
+
+    @cached_property
+    def port_channel_valid_type_re(self):
+        return re.compile("|".join(self.PORT_CHANNEL_VALID_TYPE_LIST), re.IGNORECASE)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import marshal
+import os
+import tempfile
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from cloudshell.snmp.core.tools.mib_builder_helper import QualiDirMibSource
+from cloudshell.snmp.core.tools.snmp_json_mib import JsonMib
+
+if TYPE_CHECKING:
+    from cloudshell.snmp.core.snmp_mib_builder import QualiMibBuilder
+
+logger = logging.getLogger(__name__)
+
+MIB_CACHE_DIR_ENV = "CLOUDSHELL_PANOS_MIB_CACHE_DIR"
+MIB_CACHE_VERSION = 1
+
+_lock = Lock()
+_bundles: dict[str, tuple[tuple, dict[str, JsonMib]]] = {}
+
+
+def _get_cache_dir() -> str:
+    return os.environ.get(MIB_CACHE_DIR_ENV) or os.path.join(
+        tempfile.gettempdir(), "cloudshell-paloalto-mibs"
+    )
+
+
+def _get_fingerprint(mib_dir: str) -> tuple:
+    """Identify the current state of the json mibs inside the folder."""
+    result = []
+    for file_name in sorted(os.listdir(mib_dir)):
+        if file_name.endswith(".json"):
+            stat = os.stat(os.path.join(mib_dir, file_name))
+            result.append((file_name, stat.st_size, stat.st_mtime_ns))
+    return tuple(result)
+
+
+def _get_cache_file_path(mib_dir: str, fingerprint: tuple) -> str:
+    key = hashlib.sha1(
+        repr((MIB_CACHE_VERSION, os.path.abspath(mib_dir), fingerprint)).encode()
+    ).hexdigest()
+    return os.path.join(_get_cache_dir(), f"{key}.marshal")
+
+
+def _read_json_mibs(mib_dir: str, fingerprint: tuple) -> dict[str, dict]:
+    result = {}
+    for file_name, _, _ in fingerprint:
+        with open(os.path.join(mib_dir, file_name)) as mib_file:
+            result[file_name[: -len(".json")]] = json.load(mib_file)
+    return result
+
+
+def _load_compiled_mibs(mib_dir: str, fingerprint: tuple) -> dict[str, dict]:
+    """Load mibs from the precompiled file, compile it if it's missing."""
+    cache_file_path = _get_cache_file_path(mib_dir, fingerprint)
+    try:
+        with open(cache_file_path, "rb") as cache_file:
+            return marshal.load(cache_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        logger.debug(f"Compiled mibs not found for {mib_dir}, compiling")
+
+    mibs_data = _read_json_mibs(mib_dir, fingerprint)
+    try:
+        os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file_path))
+        with os.fdopen(fd, "wb") as tmp_file:
+            marshal.dump(mibs_data, tmp_file)
+        os.replace(tmp_path, cache_file_path)
+    except OSError:
+        logger.debug("Unable to store compiled mibs", exc_info=True)
+    return mibs_data
+
+
+def get_mib_bundle(mib_dir: str) -> dict[str, JsonMib]:
+    """Get parsed json mibs for the folder, parsed only once per process.
+
+    Returned JsonMib objects are templates that are not bound to a mib builder,
+    use bind_json_mib to get a copy for a specific builder.
+    """
+    mib_dir = os.path.abspath(mib_dir)
+    fingerprint = _get_fingerprint(mib_dir)
+    with _lock:
+        cached = _bundles.get(mib_dir)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        bundle = {}
+        for mib_name, mib_data in _load_compiled_mibs(mib_dir, fingerprint).items():
+            bundle[mib_name] = JsonMib(None, mib_name, mib_data, None)
+        for json_mib in bundle.values():
+            # wait until maps are built so templates are read only from now on
+            json_mib.mib_symbols
+        _bundles[mib_dir] = (fingerprint, bundle)
+        return bundle
+
+
+def bind_json_mib(
+    template: JsonMib, mib_builder: QualiMibBuilder, mib_parser
+) -> JsonMib:
+    """Create a JsonMib for the builder sharing the already built symbol maps."""
+    json_mib = copy.copy(template)
+    json_mib._mib_builder = mib_builder
+    json_mib._mib_parser = mib_parser
+    json_mib._snmp_object_type_map = None
+    return json_mib
+
+
+class PanOSCachedMibSource(QualiDirMibSource):
+    def preload(self, mib_builder):
+        mib_parser = mib_builder.json_mib_parser
+        for mib_name, template in get_mib_bundle(self._srcName).items():
+            mib_parser.json_mibs[mib_name] = bind_json_mib(
+                template, mib_builder, mib_parser
+            )
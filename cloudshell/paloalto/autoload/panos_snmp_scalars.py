@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from cloudshell.snmp.autoload.constants import snmpv_v2_constants
+from cloudshell.snmp.core.domain.snmp_oid import BaseSnmpOid, SnmpMibObject
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from cloudshell.snmp.core.domain.snmp_response import SnmpResponse
+    from cloudshell.snmp.core.snmp_service import SnmpService
+
+PAN_SYS_SW_VERSION = SnmpMibObject("PAN-COMMON-MIB", "panSysSwVersion", "0")
+
+SYSTEM_SCALARS = (
+    snmpv_v2_constants.SYS_DESCR,
+    snmpv_v2_constants.SYS_OBJECT_ID,
+    snmpv_v2_constants.SYS_NAME,
+    snmpv_v2_constants.SYS_CONTACT,
+    snmpv_v2_constants.SYS_LOCATION,
+    PAN_SYS_SW_VERSION,
+)
+
+
+class ResolvedOid(BaseSnmpOid):
+    """MIB object passed to get_list of the SNMP service.
+
+    get_list sends the object type of every oid as the var-bind name while
+    pysnmp dispatcher expects the object name there, so the oid resolved
+    with the engine MIBs is given instead.
+    """
+
+    def __init__(self, snmp_oid: SnmpMibObject):
+        super().__init__()
+        self.snmp_oid = snmp_oid
+
+    def get_oid(self, snmp_engine):
+        return self.snmp_oid.get_oid(snmp_engine)
+
+    def get_object_type(self, snmp_engine):
+        return self.get_oid(snmp_engine)
+
+
+class PanOSSnmpScalars:
+    """Read scalars in one round trip with the GET list of the SNMP service.
+
+    GET requests of all scalars are sent at once and answered in a single
+    dispatcher run. Every request has one var-bind, so agents limiting the
+    PDU size answer them as well. Scalars the device doesn't have are
+    missing from the responses, a timeout fails the read at once.
+    """
+
+    def __init__(
+        self,
+        snmp_handler: SnmpService,
+        logger: Logger,
+        snmp_oids: Iterable[SnmpMibObject] = SYSTEM_SCALARS,
+    ):
+        self._snmp_handler = snmp_handler
+        self._logger = logger
+        self._snmp_oids = tuple(snmp_oids)
+        self._responses: dict[tuple[str, str], SnmpResponse] | None = None
+        self.round_trips = 0
+
+    def get(self, snmp_oid: SnmpMibObject) -> SnmpResponse | None:
+        """Get scalar response, None if device doesn't have it."""
+        if self._responses is None:
+            self.round_trips += 1
+            responses = self._snmp_handler.get_list(
+                [ResolvedOid(x) for x in self._snmp_oids]
+            )
+            self._responses = {(x.mib_name, x.mib_id): x for x in responses}
+            self._logger.debug(f"Read {len(self._responses)} scalars")
+        return self._responses.get((snmp_oid.mib_name, snmp_oid.object_name))
@@ -2,30 +2,67 @@ from __future__ import annotations
 
 import re
 
+from cloudshell.snmp.autoload.constants import snmpv_v2_constants
 from cloudshell.snmp.autoload.services.system_info_table import SnmpSystemInfo
-from cloudshell.snmp.core.domain.snmp_oid import SnmpMibObject
+from cloudshell.snmp.autoload.snmp.snmpv2_data import SnmpV2MibData
+from cloudshell.snmp.core.domain.snmp_response import SnmpResponse
+
+from cloudshell.paloalto.autoload.panos_snmp_scalars import (
+    PAN_SYS_SW_VERSION,
+    PanOSSnmpScalars,
+)
+
+
+class PanOSSnmpV2MibData(SnmpV2MibData):
+    """SNMPv2-MIB system data taken from the prefetched scalars."""
+
+    def __init__(self, scalars: PanOSSnmpScalars, logger):
+        super().__init__(None, logger)
+        self._scalars = scalars
+
+    def get_system_name(self) -> SnmpResponse | None:
+        return self._scalars.get(snmpv_v2_constants.SYS_NAME)
+
+    def get_system_location(self) -> SnmpResponse | None:
+        return self._scalars.get(snmpv_v2_constants.SYS_LOCATION)
+
+    def get_system_contact(self) -> SnmpResponse | None:
+        return self._scalars.get(snmpv_v2_constants.SYS_CONTACT)
+
+    def get_system_description(self) -> str:
+        response = self._scalars.get(snmpv_v2_constants.SYS_DESCR)
+        return response.safe_value if response else ""
+
+    def get_system_object_id(self) -> SnmpResponse | None:
+        return self._scalars.get(snmpv_v2_constants.SYS_OBJECT_ID)
 
 
 class PanOSSNMPSystemInfo(SnmpSystemInfo):
     DEVICE_MODEL_PATTERN = re.compile(r"::pan(?P<model>\S+$)")
 
-    def _get_device_os_version(self) -> str:
-        """Get device OS Version form snmp SNMPv2 mib."""
-        try:
-            result = self._get_val(
-                self._snmp_handler.get_property(
-                    SnmpMibObject("PAN-COMMON-MIB", "panSysSwVersion", "0")
-                )
-            )
-        except Exception:
-            result = ""
+    def __init__(self, snmp_handler, logger, vendor=None):
+        super().__init__(snmp_handler, logger, vendor)
+        self._scalars = PanOSSnmpScalars(snmp_handler, logger)
+        self._snmp_v2_obj = PanOSSnmpV2MibData(self._scalars, logger)
 
-        return result
+    @property
+    def round_trips(self) -> int:
+        """Amount of SNMP GET requests used to read system info."""
+        return self._scalars.round_trips
+
+    def _get_vendor(self):
+        if not self._vendor and self._snmp_v2_obj.get_system_object_id() is None:
+            return ""
+        return super()._get_vendor()
+
+    def _get_device_os_version(self) -> str:
+        """Get device OS Version form snmp PAN-COMMON-MIB."""
+        return self._get_val(self._scalars.get(PAN_SYS_SW_VERSION))
 
     def fill_attributes(self, resource):
         """Fill attributes."""
         super().fill_attributes(resource)
-        if resource.vendor.endswith("root"):
+        if resource.vendor and resource.vendor.endswith("root"):
             resource.vendor = resource.vendor.lower().replace(
                 "panroot", "Palo Alto Networks."
             )
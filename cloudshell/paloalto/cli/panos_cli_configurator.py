@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import re
 from collections.abc import Collection
 from typing import TYPE_CHECKING, ClassVar
 
@@ -13,27 +14,40 @@ from cloudshell.cli.factory.session_factory import (
     GenericSessionFactory,
     SessionFactory,
 )
-from cloudshell.cli.service.cli_service_impl import CliServiceImpl
 from cloudshell.cli.service.command_mode_helper import CommandModeHelper
-from cloudshell.cli.session.ssh_session import SSHSession
-from cloudshell.cli.session.telnet_session import TelnetSession
 
 from cloudshell.paloalto.cli.panos_command_modes import (
     ConfigCommandMode,
     DefaultCommandMode,
 )
+from cloudshell.paloalto.cli.panos_session_pool import (
+    SHARED_SESSION_POOL,
+    PanOSSessionContextManager,
+    PanOSSessionPool,
+)
+from cloudshell.paloalto.cli.panos_sessions import PanOSSSHSession, PanOSTelnetSession
+from cloudshell.paloalto.helpers import output_patterns
 
 if TYPE_CHECKING:
     from cloudshell.cli.service.cli import CLI
+    from cloudshell.cli.service.command_mode import CommandMode
     from cloudshell.cli.types import T_COMMAND_MODE_RELATIONS, CliConfigProtocol
 
+SESSION_SETUP_COMMANDS = (
+    "set cli config-output-format set",
+    "set cli pager off",
+    "set cli terminal width 300",
+)
+
 
 @define
 class PanOSCliConfigurator(AbstractModeConfigurator):
     REGISTERED_SESSIONS: ClassVar[tuple[SessionFactory]] = (
-        CloudInfoAccessKeySessionFactory(SSHSession),
-        GenericSessionFactory(TelnetSession),
+        CloudInfoAccessKeySessionFactory(PanOSSSHSession),
+        GenericSessionFactory(PanOSTelnetSession),
     )
+    # sessions are kept open between flows, shared by the driver process
+    _session_pool: PanOSSessionPool = field(default=SHARED_SESSION_POOL)
     modes: T_COMMAND_MODE_RELATIONS = field(init=False)
 
     def __attrs_post_init__(self):
@@ -52,6 +66,10 @@ class PanOSCliConfigurator(AbstractModeConfigurator):
             logger = logging.getLogger(__name__)
         return super().from_config(conf, logger, cli, registered_sessions)
 
+    @property
+    def host(self) -> str:
+        return self._host
+
     @property
     def default_mode(self):
         return self.modes[DefaultCommandMode]
@@ -64,15 +82,32 @@ class PanOSCliConfigurator(AbstractModeConfigurator):
     def config_mode(self):
         return self.modes[ConfigCommandMode]
 
-    def _on_session_start(self, session, logger):
-        """Send default commands to configure/clear session outputs."""
-        cli_service = CliServiceImpl(
-            session=session, requested_command_mode=self.enable_mode, logger=logger
-        )
-        cli_service.send_command(
-            "set cli config-output-format set", DefaultCommandMode.PROMPT
+    def has_idle_session(self) -> bool:
+        """Check if the pool keeps an open session of the device."""
+        return self._session_pool.has_idle_session(self.host)
+
+    def get_cli_service(self, command_mode: CommandMode) -> PanOSSessionContextManager:
+        """Get pooled session of the device in the required mode."""
+        return PanOSSessionContextManager(
+            self._session_pool, self._defined_sessions(), command_mode, self._logger
         )
-        cli_service.send_command("set cli pager off", DefaultCommandMode.PROMPT)
-        cli_service.send_command(
-            "set cli terminal width 300", DefaultCommandMode.PROMPT
+
+    def _on_session_start(self, session, logger):
+        """Send default commands to configure/clear session outputs.
+
+        Commands are sent at once and verified with a single prompt read.
+        Called for every new connection, reconnects included. The settings
+        live as long as the connection, pooled sessions keep them and the
+        pool checks the mode of the sessions idle for long.
+        """
+        output = session.hardware_expect(
+            "\n".join(SESSION_SETUP_COMMANDS),
+            expected_string=(
+                rf"{re.escape(SESSION_SETUP_COMMANDS[-1])}.*{DefaultCommandMode.PROMPT}"
+            ),
+            logger=logger,
+            remove_command_from_output=False,
         )
+        if output_patterns.SESSION_SETUP_ERROR.search(output):
+            logger.error(f"Session setup failed: {output}")
+            raise Exception("CLI", "Failed to set up CLI session. See logs for details")
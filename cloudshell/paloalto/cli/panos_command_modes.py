@@ -4,12 +4,14 @@ from typing import TYPE_CHECKING
 
 from cloudshell.cli.service.command_mode import CommandMode
 
+from cloudshell.paloalto.helpers.output_patterns import register_prompt
+
 if TYPE_CHECKING:
     from cloudshell.cli.service.auth_model import Auth
 
 
 class DefaultCommandMode(CommandMode):
-    PROMPT: str = r">\s*$"
+    PROMPT: str = register_prompt(r">\s*$")
     ENTER_COMMAND: str = ""
     EXIT_COMMAND: str = ""
 
@@ -25,7 +27,7 @@ class DefaultCommandMode(CommandMode):
 
 
 class ConfigCommandMode(CommandMode):
-    PROMPT: str = r"[\[\(]edit[\)\]]\s*\S*#\s*$"
+    PROMPT: str = register_prompt(r"[\[\(]edit[\)\]]\s*\S*#\s*$")
     ENTER_COMMAND: str = "configure"
     EXIT_COMMAND: str = "exit"
 
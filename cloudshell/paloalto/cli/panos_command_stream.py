@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from typing import IO, TYPE_CHECKING, ClassVar
+
+from cloudshell.cli.session.helper.normalize_buffer import normalize_buffer
+from cloudshell.cli.session.session_exceptions import (
+    ExpectedSessionException,
+    SessionReadEmptyData,
+    SessionReadTimeout,
+)
+
+from cloudshell.paloalto.helpers import output_patterns
+
+if TYPE_CHECKING:
+    from cloudshell.cli.service.cli_service_impl import CliServiceImpl
+
+logger = logging.getLogger(__name__)
+
+INTERRUPT = "\x03"
+
+
+def receive_chunk(session, timeout: float | None, read_timeout: float = 0.1) -> str:
+    """Read the data the session has got, wait for it up to the timeout.
+
+    Unlike _receive_all it doesn't read till the device pauses, so a long
+    output is consumed piece by piece while the device sends it.
+    """
+    timeout = timeout or session._timeout
+    start = time.monotonic()
+    while True:
+        try:
+            data = session._receive(read_timeout, logger)
+        except (SessionReadTimeout, SessionReadEmptyData):
+            data = ""
+        if data:
+            return data
+        if time.monotonic() - start > timeout:
+            raise ExpectedSessionException(
+                session.__class__.__name__, "Socket closed by timeout"
+            )
+
+
+def is_prompt_line(prompt: str, previous_line: str | None, line: str) -> bool:
+    """Check that the last partial line of the output is the prompt.
+
+    Config mode prompt is preceded by the [edit] line.
+    """
+    return bool(
+        output_patterns.PROMPT_LINE.search(line)
+        and output_patterns.match_prompt(prompt, f"{previous_line}\n{line}")
+    )
+
+
+class CommandOutputStream:
+    """Output of the command read line by line while the device sends it.
+
+    Data is read chunk by chunk as it comes, only the current partial line
+    is kept in memory. Closing the stream before the prompt interrupts the
+    command with Ctrl+C, so the session can be used further.
+    """
+
+    READ_TIMEOUT: ClassVar[float] = 0.1
+
+    def __init__(
+        self, cli_service: CliServiceImpl, command: str, timeout: int | None = None
+    ):
+        self._session = cli_service.session
+        self._prompt = cli_service.command_mode.prompt
+        self._command = command
+        self._timeout = timeout
+        self._lines: Iterator[str] | None = None
+        self.finished = False
+        self.bytes_read = 0
+
+    def __enter__(self) -> CommandOutputStream:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[str]:
+        if self._lines is None:
+            self._lines = self._read_lines()
+        return self._lines
+
+    def _read_lines(self) -> Iterator[str]:
+        session = self._session
+        session._clear_buffer(session._clear_buffer_timeout, logger)
+        logger.debug(f"Command: {self._command}")
+        session.send_line(self._command, logger)
+
+        partial = ""
+        # the last line is held back, config mode prompt starts with [edit]
+        held = None
+        echo_skipped = False
+        while True:
+            data = normalize_buffer(
+                receive_chunk(session, self._timeout, self.READ_TIMEOUT)
+            )
+            self.bytes_read += len(data)
+            *lines, partial = (partial + data).replace("\r", "").split("\n")
+            for line in lines:
+                if not echo_skipped and line.strip().endswith(self._command):
+                    echo_skipped = True
+                    continue
+                if held is not None:
+                    yield held
+                held = line
+            if is_prompt_line(self._prompt, held, partial):
+                break
+
+        self.finished = True
+        if held is not None and not output_patterns.CONFIG_PATH_LINE.search(held):
+            yield held
+
+    def close(self) -> None:
+        """Stop reading, interrupt the command if it's still running."""
+        if self._lines is not None:
+            self._lines.close()
+        if self._lines is not None and not self.finished:
+            logger.debug(f"Interrupting command: {self._command}")
+            self._session.send_line(INTERRUPT, logger)
+            self._session.hardware_expect(
+                None, expected_string=self._prompt, timeout=self._timeout, logger=logger
+            )
+            self._session._clear_buffer(self._session._clear_buffer_timeout, logger)
+        self.finished = True
+
+    def write_to(self, file_obj: IO[str]) -> int:
+        """Write output lines to the file, return number of lines."""
+        count = 0
+        for line in self:
+            file_obj.write(f"{line}\n")
+            count += 1
+        return count
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from threading import Condition, Timer
+from typing import TYPE_CHECKING, ClassVar
+
+from attrs import define
+
+from cloudshell.cli.service.cli_service_impl import CliServiceImpl
+from cloudshell.cli.service.command_mode_helper import CommandModeHelper
+from cloudshell.cli.service.session_pool import SessionPool
+from cloudshell.cli.service.session_pool_manager import SessionPoolException
+from cloudshell.cli.session.expect_session import CommandExecutionException
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from cloudshell.cli.service.command_mode import CommandMode
+    from cloudshell.cli.types import T_SESSION
+
+logger = logging.getLogger(__name__)
+
+
+@define(eq=False)
+class _IdleSession:
+    session: T_SESSION
+    # type of the command mode the session was returned in
+    mode_type: type[CommandMode] | None
+    returned_at: float
+
+
+class PanOSSessionPool(SessionPool):
+    """Sessions kept open between flows, keyed by the device.
+
+    Idle sessions are closed after IDLE_TTL by a reaper timer that runs
+    while the pool has idle sessions. A session returned less than
+    HEALTH_CHECK_INTERVAL ago is given out with its known command mode,
+    an older one is checked by detecting its mode and reconnected if dead.
+    """
+
+    IDLE_TTL: ClassVar[float] = 300
+    HEALTH_CHECK_INTERVAL: ClassVar[float] = 30
+    MAX_SESSIONS_PER_DEVICE: ClassVar[int] = 2
+    POOL_TIMEOUT: ClassVar[float] = 100
+
+    def __init__(
+        self,
+        idle_ttl: float | None = None,
+        health_check_interval: float | None = None,
+        max_sessions_per_device: int | None = None,
+        pool_timeout: float | None = None,
+    ):
+        self.idle_ttl = self.IDLE_TTL if idle_ttl is None else idle_ttl
+        self.health_check_interval = (
+            self.HEALTH_CHECK_INTERVAL
+            if health_check_interval is None
+            else health_check_interval
+        )
+        self.max_sessions_per_device = (
+            max_sessions_per_device or self.MAX_SESSIONS_PER_DEVICE
+        )
+        self.pool_timeout = pool_timeout or self.POOL_TIMEOUT
+        self._condition = Condition()
+        self._idle: dict[tuple, list[_IdleSession]] = defaultdict(list)
+        self._busy: dict[tuple, list[T_SESSION]] = defaultdict(list)
+        # sessions being connected, they take a place of the device
+        self._connecting: dict[tuple, int] = defaultdict(int)
+        self._reaper: Timer | None = None
+
+    @staticmethod
+    def _get_key(session: T_SESSION) -> tuple:
+        return session.host, session.port
+
+    def sessions_count(self, host: str, port: int | None = None) -> int:
+        key = (host, port)
+        with self._condition:
+            return len(self._idle[key]) + len(self._busy[key]) + self._connecting[key]
+
+    def has_idle_session(self, host: str) -> bool:
+        with self._condition:
+            now = time.monotonic()
+            return any(
+                key[0] == host and now - x.returned_at <= self.idle_ttl
+                for key, sessions in self._idle.items()
+                for x in sessions
+            )
+
+    def get_session(
+        self, new_sessions: list[T_SESSION], prompt: str, logger: Logger
+    ) -> T_SESSION:
+        return self.checkout(new_sessions, prompt, logger)[0]
+
+    def checkout(
+        self,
+        new_sessions: list[T_SESSION],
+        prompt: str,
+        logger: Logger,
+        mode_type: type[CommandMode] | None = None,
+    ) -> tuple[T_SESSION, type[CommandMode] | None]:
+        """Get idle session or create new one.
+
+        :param mode_type: requested command mode, the session left in this
+            mode is preferred
+        :return: session and its command mode if it's known
+        """
+        key = self._get_key(new_sessions[0])
+        deadline = time.monotonic() + self.pool_timeout
+        # sessions detached from the pool, disconnected without the lock
+        closing = []
+        try:
+            with self._condition:
+                while True:
+                    closing += self._pop_expired()
+                    idle = self._pick_idle(key, new_sessions, mode_type)
+                    if idle:
+                        self._idle[key].remove(idle)
+                        self._busy[key].append(idle.session)
+                        fresh = time.monotonic() - idle.returned_at
+                        known = fresh < self.health_check_interval
+                        logger.debug(f"Reusing session to {key[0]}, idle {fresh:.1f}s")
+                        return idle.session, idle.mode_type if known else None
+
+                    count = (
+                        len(self._idle[key])
+                        + len(self._busy[key])
+                        + self._connecting[key]
+                    )
+                    if count < self.max_sessions_per_device:
+                        self._connecting[key] += 1
+                        break
+                    if self._idle[key]:
+                        # idle sessions left have other credentials or type
+                        closing.append(self._idle[key].pop(0).session)
+                        continue
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SessionPoolException(
+                            self.__class__.__name__,
+                            f"Cannot get session to {key[0]} during "
+                            f"{self.pool_timeout} sec.",
+                        )
+                    self._condition.wait(remaining)
+        finally:
+            self._close(closing, logger)
+
+        session = None
+        try:
+            session = self._connect(new_sessions, prompt, logger)
+        finally:
+            with self._condition:
+                self._connecting[key] -= 1
+                if session is not None:
+                    self._busy[key].append(session)
+                self._condition.notify_all()
+        return session, None
+
+    def return_session(
+        self,
+        session: T_SESSION,
+        logger: Logger,
+        mode_type: type[CommandMode] | None = None,
+    ) -> None:
+        logger.debug("Return session to the pool")
+        key = self._get_key(session)
+        with self._condition:
+            self._remove_busy(key, session)
+            self._idle[key].append(_IdleSession(session, mode_type, time.monotonic()))
+            self._schedule_reaper()
+            self._condition.notify_all()
+
+    def remove_session(self, session: T_SESSION, logger: Logger) -> None:
+        logger.debug("Removing session")
+        key = self._get_key(session)
+        with self._condition:
+            self._remove_busy(key, session)
+            self._condition.notify_all()
+        self._close([session], logger)
+
+    def close_idle(self, logger: Logger) -> None:
+        """Close all idle sessions, e.g. on driver cleanup."""
+        with self._condition:
+            closing = [x.session for y in self._idle.values() for x in y]
+            self._idle.clear()
+            self._condition.notify_all()
+        self._close(closing, logger)
+
+    def _pick_idle(
+        self,
+        key: tuple,
+        new_sessions: list[T_SESSION],
+        mode_type: type[CommandMode] | None,
+    ) -> _IdleSession | None:
+        compatible = [
+            x for x in self._idle[key] if any(x.session == y for y in new_sessions)
+        ]
+        # the most recently used session in the requested mode first
+        compatible.sort(key=lambda x: (x.mode_type is mode_type, x.returned_at))
+        return compatible[-1] if compatible else None
+
+    def _pop_expired(self) -> list[T_SESSION]:
+        """Remove expired idle sessions from the pool, the caller closes them."""
+        now = time.monotonic()
+        expired = []
+        for sessions in self._idle.values():
+            for idle in [x for x in sessions if now - x.returned_at > self.idle_ttl]:
+                sessions.remove(idle)
+                expired.append(idle.session)
+        return expired
+
+    def _schedule_reaper(self) -> None:
+        """Start the timer closing the oldest idle session when it expires."""
+        if self._reaper is not None:
+            return
+        returned = [x.returned_at for y in self._idle.values() for x in y]
+        if not returned:
+            return
+        delay = max(min(returned) + self.idle_ttl - time.monotonic(), 0)
+        # expired sessions are older than the TTL, not equal to it
+        self._reaper = Timer(delay + 0.01, self._reap)
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        with self._condition:
+            self._reaper = None
+            expired = self._pop_expired()
+            self._schedule_reaper()
+            self._condition.notify_all()
+        self._close(expired, logger)
+
+    def _remove_busy(self, key: tuple, session: T_SESSION) -> None:
+        # sessions compare by connection params, so remove by identity
+        busy = self._busy[key]
+        for i, x in enumerate(busy):
+            if x is session:
+                del busy[i]
+                break
+
+    @staticmethod
+    def _connect(
+        new_sessions: list[T_SESSION], prompt: str, logger: Logger
+    ) -> T_SESSION:
+        for session in new_sessions:
+            try:
+                session.connect(prompt, logger)
+                logger.debug(f"Created new {session.session_type} session")
+                return session
+            except Exception as e:
+                logger.debug(e)
+        raise SessionPoolException(
+            PanOSSessionPool.__name__,
+            "Failed to create new session for type {}, see logs for details".format(
+                ", ".join(x.session_type for x in new_sessions)
+            ),
+        )
+
+    @staticmethod
+    def _close(sessions: list[T_SESSION], logger: Logger) -> None:
+        # called without the pool lock, a slow disconnect doesn't block
+        # flows of other devices
+        for session in sessions:
+            try:
+                session.disconnect()
+            except Exception:
+                logger.debug("Failed to disconnect session", exc_info=True)
+
+
+class PanOSCliService(CliServiceImpl):
+    """CLI service that skips mode detection when the session mode is known."""
+
+    def __init__(
+        self,
+        session: T_SESSION,
+        requested_command_mode: CommandMode,
+        logger: Logger,
+        current_mode: CommandMode | None = None,
+    ):
+        self._current_mode = current_mode
+        super().__init__(session, requested_command_mode, logger)
+
+    def _initialize(self, requested_command_mode: CommandMode) -> None:
+        if self._current_mode is None:
+            super()._initialize(requested_command_mode)
+        else:
+            self.command_mode = self._current_mode
+            self._change_mode(requested_command_mode)
+
+
+class PanOSSessionContextManager:
+    """Check out a pooled session and switch it into the requested mode."""
+
+    IGNORED_EXCEPTIONS = (CommandExecutionException,)
+
+    def __init__(
+        self,
+        session_pool: PanOSSessionPool,
+        defined_sessions: list[T_SESSION],
+        command_mode: CommandMode,
+        logger: Logger,
+    ):
+        self._session_pool = session_pool
+        self._defined_sessions = defined_sessions
+        self._command_mode = command_mode
+        self._logger = logger
+        self._active_session = None
+        self._cli_service: PanOSCliService | None = None
+
+    def __enter__(self) -> PanOSCliService:
+        modes = CommandModeHelper.defined_modes_by_prompt(self._command_mode)
+        prompts_re = r"|".join(modes.keys())
+        self._active_session, mode_type = self._session_pool.checkout(
+            self._defined_sessions, prompts_re, self._logger, type(self._command_mode)
+        )
+        current_mode = next((x for x in modes.values() if type(x) is mode_type), None)
+        try:
+            self._cli_service = self._create_cli_service(prompts_re, current_mode)
+        except Exception:
+            self._session_pool.remove_session(self._active_session, self._logger)
+            raise
+        return self._cli_service
+
+    def _create_cli_service(
+        self, prompts_re: str, current_mode: CommandMode | None
+    ) -> PanOSCliService:
+        try:
+            return PanOSCliService(
+                self._active_session, self._command_mode, self._logger, current_mode
+            )
+        except Exception:
+            self._active_session.reconnect(prompts_re, self._logger)
+            return PanOSCliService(
+                self._active_session, self._command_mode, self._logger
+            )
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._active_session:
+            if (
+                exc_type
+                and not issubclass(exc_type, self.IGNORED_EXCEPTIONS)
+                or not self._active_session.active()
+            ):
+                self._session_pool.remove_session(self._active_session, self._logger)
+            else:
+                self._session_pool.return_session(
+                    self._active_session,
+                    self._logger,
+                    type(self._cli_service.command_mode),
+                )
+
+
+SHARED_SESSION_POOL = PanOSSessionPool()
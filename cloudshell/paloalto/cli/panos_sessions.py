@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from cloudshell.cli.session.ssh_session import SSHSession
+from cloudshell.cli.session.telnet_session import TelnetSession
+
+from cloudshell.paloalto.helpers import output_patterns
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+
+class TailPromptMatchMixin:
+    """Match prompts on the end of the output with compiled patterns."""
+
+    def match_prompt(self, prompt: str, match_string: str, logger: Logger) -> bool:
+        return output_patterns.match_prompt(prompt, match_string)
+
+
+class PanOSSSHSession(TailPromptMatchMixin, SSHSession):
+    pass
+
+
+class PanOSTelnetSession(TailPromptMatchMixin, TelnetSession):
+    pass
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from typing import TYPE_CHECKING
+
+from attrs import define
+
+from cloudshell.cli.session.helper.normalize_buffer import normalize_buffer
+from cloudshell.cli.session.session_exceptions import ExpectedSessionException
+
+from cloudshell.paloalto.cli.panos_command_stream import is_prompt_line, receive_chunk
+from cloudshell.paloalto.command_templates import configuration
+from cloudshell.paloalto.helpers import output_patterns
+
+if TYPE_CHECKING:
+    from cloudshell.cli.service.cli_service import CliService
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class BatchCommand:
+    command: str
+    # None to choose the mode by the command
+    config: bool | None = None
+
+    @property
+    def is_config(self) -> bool:
+        if self.config is not None:
+            return self.config
+        return self.command.split(maxsplit=1)[0] in configuration.CONFIG_MODE_COMMANDS
+
+    def can_pipeline(self, stop_on_error: bool = False) -> bool:
+        """Check if the command can be sent with others without waiting.
+
+        Only show commands are sent together if the batch stops on errors,
+        so no changes are made after the failed command.
+        """
+        name = self.command.split(maxsplit=1)[0]
+        if stop_on_error:
+            return name == "show"
+        return name in configuration.PIPELINE_COMMANDS
+
+
+@define
+class CommandResult:
+    command: str
+    config: bool
+    output: str = ""
+    success: bool = False
+    error: str | None = None
+    # seconds till the command output was read
+    latency: float = 0.0
+    executed: bool = True
+
+
+@define
+class BatchCommandActions:
+    _cli_service: CliService
+
+    def run_commands(
+        self,
+        commands: list[BatchCommand],
+        pipeline_size: int = 20,
+        stop_on_error: bool = False,
+        timeout: int | None = None,
+    ) -> list[CommandResult]:
+        """Run commands in the current mode.
+
+        Successive show and set/delete commands are sent together and
+        split by the echo of every command, others wait for the prompt one
+        by one. Stopping on errors, set/delete commands aren't sent
+        together. Commands are failed by errors in their output. Session
+        errors and timed out groups stop the batch, the rest of commands
+        are not executed.
+        """
+        results = []
+        for group in self._get_groups(commands, pipeline_size, stop_on_error):
+            try:
+                if len(group) > 1:
+                    group_results = self._run_pipelined(group, timeout)
+                else:
+                    group_results = [self._run_command(group[0], timeout)]
+            except Exception as e:
+                logger.exception("Batch stopped by the session error")
+                results.extend(
+                    CommandResult(x.command, x.is_config, error=str(e)) for x in group
+                )
+                break
+            results.extend(group_results)
+            if not all(x.executed for x in group_results) or (
+                stop_on_error and not all(x.success for x in group_results)
+            ):
+                break
+        return results
+
+    @staticmethod
+    def _get_groups(
+        commands: list[BatchCommand], pipeline_size: int, stop_on_error: bool
+    ) -> list[list[BatchCommand]]:
+        groups = []
+        for command in commands:
+            if (
+                groups
+                and command.can_pipeline(stop_on_error)
+                and groups[-1][-1].can_pipeline(stop_on_error)
+                and len(groups[-1]) < pipeline_size
+            ):
+                groups[-1].append(command)
+            else:
+                groups.append([command])
+        return groups
+
+    def _run_command(self, command: BatchCommand, timeout: int | None) -> CommandResult:
+        start = time.monotonic()
+        output = self._cli_service.send_command(
+            command.command, remove_prompt=True, timeout=timeout
+        )
+        latency = time.monotonic() - start
+        return self._create_result(command, self._strip_config_path(output), latency)
+
+    def _run_pipelined(
+        self, commands: list[BatchCommand], timeout: int | None
+    ) -> list[CommandResult]:
+        """Send the commands at once, time every one by its output end.
+
+        Output of a command ends when the echo of the next one is read
+        after the prompt, the last one ends with the prompt. Every command
+        adds its timeout to the group deadline; commands which don't finish
+        in time are failed, the ones not started are marked not executed.
+        """
+        session = self._cli_service.session
+        prompt = self._cli_service.command_mode.prompt
+        session._clear_buffer(session._clear_buffer_timeout, logger)
+        logger.debug(f"Pipelined commands: {[x.command for x in commands]}")
+        session.send_line("\n".join(x.command for x in commands), logger)
+
+        start = time.monotonic()
+        deadline = start + (timeout or session._timeout) * len(commands)
+        buffer = ""
+        echoes: list[re.Match] = []
+        finished_at: list[float] = []
+        prompt_start = None
+        while prompt_start is None:
+            try:
+                data = receive_chunk(session, deadline - time.monotonic())
+            except ExpectedSessionException:
+                if time.monotonic() < deadline:
+                    raise
+                break
+            buffer += normalize_buffer(data).replace("\r", "")
+            now = time.monotonic()
+            while len(echoes) < len(commands):
+                echo = output_patterns.COMMAND_ECHO.compile(
+                    command=commands[len(echoes)].command
+                ).search(buffer, echoes[-1].end() if echoes else 0)
+                if not echo:
+                    break
+                if echoes:
+                    finished_at.append(now)
+                echoes.append(echo)
+
+            if len(echoes) == len(commands):
+                *lines, last_line = buffer[echoes[-1].end() :].split("\n")
+                if lines and is_prompt_line(prompt, lines[-1], last_line):
+                    finished_at.append(now)
+                    prompt_start = len(buffer) - len(last_line)
+
+        results = []
+        previous = start
+        ends = [x.start() for x in echoes[1:]] + [prompt_start]
+        for command, echo, end, finished in zip(commands, echoes, ends, finished_at):
+            output = self._strip_config_path(buffer[echo.end() : end])
+            results.append(self._create_result(command, output, finished - previous))
+            previous = finished
+        if prompt_start is None:
+            logger.warning(f"Pipelined commands timed out after {len(results)}")
+            running = commands[len(results)]
+            results.append(
+                CommandResult(
+                    running.command,
+                    running.is_config,
+                    error="Command timed out",
+                    latency=time.monotonic() - previous,
+                    executed=len(echoes) > len(results),
+                )
+            )
+            results.extend(
+                CommandResult(x.command, x.is_config, executed=False)
+                for x in commands[len(results) :]
+            )
+        return results
+
+    @staticmethod
+    def _strip_config_path(output: str) -> str:
+        lines = output.strip("\n").split("\n")
+        while lines and output_patterns.CONFIG_PATH_LINE.search(lines[-1]):
+            lines.pop()
+        return "\n".join(lines).strip("\n")
+
+    @staticmethod
+    def _create_result(
+        command: BatchCommand, output: str, latency: float
+    ) -> CommandResult:
+        error = output_patterns.CONFIG_COMMAND_ERROR.search(output)
+        return CommandResult(
+            command.command,
+            command.is_config,
+            output=output,
+            success=not error,
+            error=error.group().strip() if error else None,
+            latency=latency,
+        )
@@ -9,12 +9,37 @@ from cloudshell.cli.command_template.command_template_executor import (
 )
 
 from cloudshell.paloalto.command_templates import enable_disable_snmp
+from cloudshell.paloalto.helpers import output_patterns
+from cloudshell.paloalto.helpers.set_commands import parse_set_commands
 
 if TYPE_CHECKING:
     from cloudshell.cli.service.cli_service import CliService
     from cloudshell.snmp.snmp_parameters import SNMPV3Parameters
 
 
+@define
+class SnmpSettingsActions:
+    _cli_service: CliService
+
+    def is_snmp_service_enabled(self) -> bool:
+        """Check SNMP service state, runs in the operational mode."""
+        output = CommandTemplateExecutor(
+            self._cli_service, enable_disable_snmp.SHOW_SYSTEM_SERVICES
+        ).execute_command()
+        match = output_patterns.SNMP_SERVICE_STATE.search(output)
+        return bool(match) and match.group("state").lower() == "enabled"
+
+    def get_snmp_settings(self) -> set[tuple[str, ...]]:
+        """Get SNMP access settings, runs in the configuration mode.
+
+        Settings are tokenized set commands without the access-setting prefix.
+        """
+        output = CommandTemplateExecutor(
+            self._cli_service, enable_disable_snmp.SHOW_SNMP_SETTINGS
+        ).execute_command()
+        return parse_set_commands(output, enable_disable_snmp.SNMP_ACCESS_SETTING)
+
+
 @define
 class EnableDisableSnmpV2Actions:
     _cli_service: CliService
@@ -31,6 +56,10 @@ class EnableDisableSnmpV2Actions:
             self._cli_service, enable_disable_snmp.CONFIGURE_V2C
         ).execute_command(community=community)
 
+    @staticmethod
+    def is_snmp_configured(settings: set[tuple[str, ...]], community: str) -> bool:
+        return ("version", "v2c", "snmp-community-string", community) in settings
+
     def disable_snmp(self):
         """Disable snmp on the device."""
         CommandTemplateExecutor(
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from attrs import define, field
+
+from cloudshell.cli.command_template.command_template_executor import (
+    CommandTemplateExecutor,
+)
+
+from cloudshell.paloalto.command_templates import jobs
+from cloudshell.paloalto.helpers import output_patterns
+
+if TYPE_CHECKING:
+    from cloudshell.cli.service.cli_service import CliService
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class PanOSJob:
+    job_id: int
+    job_type: str
+    status: str
+    result: str
+    progress: int | None = None
+    warnings: list[str] = field(factory=list)
+    details: list[str] = field(factory=list)
+    # seconds from the start of waiting till the job finished
+    duration: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status == "FIN"
+
+    @property
+    def success(self) -> bool:
+        return self.finished and self.result == "OK"
+
+    @classmethod
+    def from_output(cls, job_id: int, output: str) -> PanOSJob:
+        for match in output_patterns.JOB_LINE.compile().finditer(output):
+            if int(match.group("job_id")) == job_id:
+                break
+        else:
+            raise Exception("Job", f"Unable to find job {job_id} in: {output}")
+
+        progress_match = output_patterns.JOB_PROGRESS.search(match.group("completed"))
+        progress = int(progress_match.group("progress")) if progress_match else None
+        sections = {"warnings": [], "details": []}
+        section = None
+        for line in output[match.end() :].splitlines():
+            name, _, value = line.partition(":")
+            if name.strip().lower() in sections:
+                section = sections[name.strip().lower()]
+                line = value
+            if section is not None and line.strip():
+                section.append(line.strip())
+        return cls(
+            job_id=job_id,
+            job_type=match.group("job_type"),
+            status=match.group("status"),
+            result=match.group("result"),
+            progress=progress,
+            **sections,
+        )
+
+
+@define
+class JobActions:
+    _cli_service: CliService
+    # operational commands are prefixed with run in the configuration mode
+    _config_mode: bool = False
+
+    def get_job(self, job_id: int) -> PanOSJob:
+        template = jobs.SHOW_JOB_FROM_CONFIG if self._config_mode else jobs.SHOW_JOB
+        output = CommandTemplateExecutor(self._cli_service, template).execute_command(
+            job_id=job_id
+        )
+        return PanOSJob.from_output(job_id, output)
+
+    def wait_for_job(
+        self,
+        job_id: int,
+        timeout: float = 600,
+        interval: float = 1,
+        max_interval: float = 15,
+    ) -> PanOSJob:
+        """Poll the job till it's finished.
+
+        Polling interval grows while the job runs, if the device reports
+        progress the interval is based on the estimated time left.
+        """
+        started = time.monotonic()
+        while True:
+            job = self.get_job(job_id)
+            elapsed = time.monotonic() - started
+            if job.finished:
+                job.duration = elapsed
+                logger.info(
+                    f"Job {job_id} finished with {job.result} in {elapsed:.0f}s"
+                )
+                return job
+            if elapsed >= timeout:
+                raise Exception(
+                    "Job", f"Job {job_id} didn't finish in {timeout} seconds"
+                )
+
+            delay = interval
+            if job.progress:
+                estimated_left = elapsed * (100 - job.progress) / job.progress
+                delay = max(delay, estimated_left / 2)
+            time.sleep(min(delay, max_interval, timeout - elapsed))
+            interval = min(interval * 1.5, max_interval)
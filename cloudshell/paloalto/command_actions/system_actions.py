@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-import os
 import re
+import time
+from collections.abc import Iterable
+from contextlib import AbstractContextManager, nullcontext
+from threading import Thread
 
 import tftpy
 from attrs import define
@@ -12,15 +16,53 @@ from cloudshell.cli.command_template.command_template_executor import (
 )
 from cloudshell.cli.service.cli_service import CliService
 
+from cloudshell.paloalto.cli.panos_command_modes import ConfigCommandMode
+from cloudshell.paloalto.cli.panos_command_stream import CommandOutputStream
+from cloudshell.paloalto.command_actions.job_actions import JobActions, PanOSJob
 from cloudshell.paloalto.command_templates import configuration, firmware
-from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+from cloudshell.paloalto.helpers import output_patterns
+from cloudshell.paloalto.helpers.bounded_pipe import BoundedPipe
+from cloudshell.paloalto.helpers.commit_coordinator import CommitCoordinator
+from cloudshell.paloalto.helpers.readiness_prober import ReadinessProber, ReloadTimings
 
 logger = logging.getLogger(__name__)
 
+# prompt without the end of output anchor, to find every prompt in the output
+CONFIG_PROMPT = re.compile(ConfigCommandMode.PROMPT.removesuffix(r"\s*$"))
+
+
+@define
+class _TftpUploadSource:
+    """Input of the rename upload, a failed read aborts the upload.
+
+    Without the error packet the server waits for the next block until
+    its timeout, the reader side doesn't know the upload session.
+    """
+
+    _pipe: BoundedPipe
+    _tftp: tftpy.TftpClient
+
+    @property
+    def closed(self) -> bool:
+        return self._pipe.closed
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._pipe.read(size)
+        except Exception:
+            # tftpy can't encode the not defined error code
+            self._tftp.context.state.sendError(tftpy.TftpErrors.IllegalTftpOp)
+            raise
+
+    def close(self) -> None:
+        self._pipe.close()
+
 
 @define
 class SystemConfigurationActions:
     _cli_service: CliService
+    # shares commits with concurrent flows of the device
+    _commit_coordinator: CommitCoordinator | None = None
 
     def save_config(self, destination, action_map=None, error_map=None, timeout=None):
         """Save current configuration to local file on device filesystem.
@@ -39,8 +81,7 @@ class SystemConfigurationActions:
             timeout=timeout,
         ).execute_command(filename=destination)
 
-        pattern = rf"Config saved to {destination}"
-        status_match = re.search(pattern, output, re.IGNORECASE)
+        status_match = output_patterns.CONFIG_SAVED.search(output, filename=destination)
 
         if not status_match:
             logger.error(f"Save configuration failed: {output}")
@@ -65,8 +106,7 @@ class SystemConfigurationActions:
             timeout=timeout,
         ).execute_command(filename=source)
 
-        pattern = rf"Config loaded from {source}"
-        status_match = re.search(pattern, output, re.IGNORECASE)
+        status_match = output_patterns.CONFIG_LOADED.search(output, filename=source)
 
         if not status_match:
             logger.error(f"Load configuration failed: {output}")
@@ -74,13 +114,171 @@ class SystemConfigurationActions:
                 "Load configuration", "Load configuration failed. See logs for details"
             )
 
+    def stream_config(
+        self, path: str | None = None, timeout: int | None = None
+    ) -> CommandOutputStream:
+        """Stream candidate config lines in set format.
+
+        :param path: config hierarchy to show, e.g. "address", whole if None
+        """
+        command = configuration.SHOW_CONFIG.get_command(path=path)["command"]
+        return CommandOutputStream(self._cli_service, command, timeout)
+
+    def has_pending_changes(self) -> bool:
+        """Check candidate config differs from running, True if unknown."""
+        output = CommandTemplateExecutor(
+            cli_service=self._cli_service,
+            command_template=configuration.CHECK_PENDING_CHANGES,
+        ).execute_command()
+        return not output_patterns.NO_PENDING_CHANGES.search(output)
+
+    def changes(self) -> AbstractContextManager:
+        """Keep config loads of other flows out while changing and committing."""
+        if self._commit_coordinator:
+            return self._commit_coordinator.changes()
+        return nullcontext()
+
     def commit_changes(self, action_map=None, error_map=None):
-        CommandTemplateExecutor(
+        def commit():
+            return CommandTemplateExecutor(
+                cli_service=self._cli_service,
+                command_template=configuration.COMMIT,
+                action_map=action_map,
+                error_map=error_map,
+            ).execute_command()
+
+        if self._commit_coordinator:
+            return self._commit_coordinator.commit(commit)
+        return commit()
+
+    def apply_commands(
+        self,
+        commands: Iterable[str],
+        chunk_size: int = 100,
+        commit: bool = True,
+        timeout: int | None = None,
+    ) -> int:
+        """Apply set/delete commands in bulk and commit them once.
+
+        Commands are pasted in chunks, every chunk is one round trip, its end
+        is marked with check pending-changes. Per command errors are taken
+        from the output, changes are not committed if any command failed.
+
+        :return: number of applied commands
+        """
+        commands = [x.strip() for x in commands if x.strip()]
+        for command in commands:
+            if command.split(maxsplit=1)[0] not in configuration.BULK_COMMANDS:
+                raise Exception("Apply commands", f"Unsupported command: {command}")
+
+        with self.changes():
+            errors = []
+            has_changes = False
+            for start in range(0, len(commands), chunk_size):
+                chunk = commands[start : start + chunk_size]
+                output = self._send_commands_chunk(chunk, timeout)
+                chunk_errors, has_changes = self._parse_chunk_output(chunk, output)
+                errors.extend(chunk_errors)
+
+            if errors:
+                for command, error in errors:
+                    logger.error(f"Command '{command}' failed: {error}")
+                raise Exception(
+                    "Apply commands",
+                    f"{len(errors)} of {len(commands)} commands failed, changes "
+                    f"are left in the candidate config. See logs for details",
+                )
+            if commit and has_changes:
+                self.commit_changes()
+        return len(commands)
+
+    def _send_commands_chunk(self, chunk: list[str], timeout: int | None) -> str:
+        marker = configuration.CHECK_PENDING_CHANGES_COMMAND
+        return self._cli_service.send_command(
+            "\n".join([*chunk, marker]),
+            expected_string=rf"{re.escape(marker)}.*{ConfigCommandMode.PROMPT}",
+            remove_command_from_output=False,
+            timeout=timeout,
+        )
+
+    @staticmethod
+    def _parse_chunk_output(
+        chunk: list[str], output: str
+    ) -> tuple[list[tuple[str, str]], bool]:
+        """Get errors of the chunk commands and pending changes state.
+
+        Output of every command starts with its echo and ends with a prompt.
+        """
+        errors = []
+        pending_output = ""
+        expected = set(chunk)
+        for part in CONFIG_PROMPT.split(output):
+            echo, _, command_output = part.strip().partition("\n")
+            echo = echo.strip()
+            if echo in expected:
+                match = output_patterns.CONFIG_COMMAND_ERROR.search(command_output)
+                if match:
+                    errors.append((echo, match.group().strip()))
+            elif echo == configuration.CHECK_PENDING_CHANGES_COMMAND:
+                pending_output = command_output
+        has_changes = not output_patterns.NO_PENDING_CHANGES.search(pending_output)
+        return errors, has_changes
+
+    def start_commit(self, action_map=None, error_map=None) -> int | None:
+        """Start commit without waiting for it.
+
+        :return: commit job id, None if there is nothing to commit
+        """
+        output = CommandTemplateExecutor(
             cli_service=self._cli_service,
             command_template=configuration.COMMIT,
             action_map=action_map,
             error_map=error_map,
+            expected_string=(
+                f"{output_patterns.COMMIT_JOB_STARTED.pattern}|"
+                f"{ConfigCommandMode.PROMPT}"
+            ),
+        ).execute_command()
+
+        match = output_patterns.COMMIT_JOB_STARTED.search(output)
+        if not match:
+            if output_patterns.NO_CHANGES_TO_COMMIT.search(output):
+                logger.info("There are no changes to commit")
+                return None
+            logger.error(f"Commit failed to start: {output}")
+            raise Exception("Commit", "Commit failed to start. See logs for details")
+
+        CommandTemplateExecutor(
+            cli_service=self._cli_service,
+            command_template=configuration.INTERRUPT,
         ).execute_command()
+        return int(match.group("job_id"))
+
+    def wait_for_commit(self, job_id: int, timeout: float = 600) -> PanOSJob:
+        """Poll the commit job, raise if the commit failed."""
+        job = JobActions(self._cli_service, config_mode=True).wait_for_job(
+            job_id, timeout=timeout
+        )
+        for warning in job.warnings:
+            logger.warning(f"Commit job {job_id}: {warning}")
+        if not job.success:
+            logger.error(f"Commit job {job_id} failed: {job.details}")
+            error = "; ".join(job.details) or f"job {job_id} result {job.result}"
+            raise Exception("Commit", f"Commit failed: {error}")
+        return job
+
+    def commit_changes_async(self, timeout: float = 600) -> PanOSJob | None:
+        """Commit polling the job instead of waiting on a single read.
+
+        :return: finished commit job, None if there was nothing to commit
+        """
+        started = time.monotonic()
+        job_id = self.start_commit()
+        if job_id is None:
+            return None
+        job = self.wait_for_commit(job_id, timeout)
+        job.duration = time.monotonic() - started
+        return job
 
 
 @define
@@ -97,15 +295,18 @@ class SystemActions:
         user=None,
         password=None,
         remote_path=None,
-    ):
-        """Import configuration file from remote TFTP or SCP server."""
+    ) -> int | None:
+        """Import configuration file from remote TFTP or SCP server.
+
+        :return: number of bytes received by TFTP, None for SCP
+        """
         if protocol.upper() == "TFTP":
             output = CommandTemplateExecutor(
                 self._cli_service, configuration.COPY_FROM_TFTP
             ).execute_command(
                 remote_path=remote_path, file_type=file_type, tftp_host=host, port=port
             )
-            pattern = r"Received \d+ bytes in -?\d+.\d+ seconds"
+            status_match = output_patterns.TFTP_RECEIVED.search(output)
         elif protocol.upper() == "SCP":
             src = f"{user}@{host}:{remote_path}"
 
@@ -119,21 +320,24 @@ class SystemActions:
             output = CommandTemplateExecutor(
                 self._cli_service, configuration.COPY_FROM_SCP, action_map=action_map
             ).execute_command(src=src, file_type=file_type, port=port)
-            pattern = rf"{filename} saved"
+            status_match = output_patterns.SCP_IMPORTED.search(
+                output, filename=filename
+            )
         else:
             raise Exception(
                 f"Import {file_type}",
                 f"Protocol type <{protocol}> is unsupportable",
             )
 
-        status_match = re.search(pattern, output, re.IGNORECASE)
-
         if not status_match:
             logger.error(f"Import {file_type} failed: {output}")
             raise Exception(
                 f"Import {file_type}",
                 f"Import {file_type} failed. See logs for details",
             )
+        if "size" in status_match.groupdict():
+            return int(status_match.group("size"))
+        return None
 
     def export_config(
         self,
@@ -162,7 +366,7 @@ class SystemActions:
                     tftp_host=host,
                     tftp_port=port,
                 )
-            pattern = r"Sent \d+ bytes in -?\d+.\d+ seconds"
+            status_match = output_patterns.TFTP_SENT.search(output)
         elif protocol.upper() == "SCP":
             dst = f"{user}@{host}:{remote_path}"
 
@@ -176,15 +380,15 @@ class SystemActions:
             output = CommandTemplateExecutor(
                 self._cli_service, configuration.COPY_TO_SCP, action_map=action_map
             ).execute_command(filename=config_file_name, dst=dst, port=port)
-            pattern = rf"{config_file_name}\s+100%"
+            status_match = output_patterns.SCP_EXPORTED.search(
+                output, filename=config_file_name
+            )
         else:
             raise Exception(
                 "Export configuration",
                 f"Protocol type <{protocol}> is unsupportable",
             )
 
-        status_match = re.search(pattern, output, re.IGNORECASE)
-
         if not status_match:
             logger.error(f"Export configuration failed: {output}")
             raise Exception(
@@ -192,37 +396,148 @@ class SystemActions:
                 "Export configuration failed. See logs for details",
             )
 
+    def get_config_fingerprint(self) -> str:
+        """Hash of the running config streamed from the device.
+
+        Lines are hashed without trailing spaces and blank lines, so the
+        output framing doesn't change the hash. Partial output is an error.
+        """
+        config_hash = hashlib.sha256()
+        with CommandOutputStream(
+            self._cli_service, configuration.SHOW_RUNNING_CONFIG_COMMAND
+        ) as stream:
+            for line in stream:
+                line = line.rstrip()
+                if line:
+                    config_hash.update(f"{line}\n".encode())
+            if not stream.finished:
+                raise Exception("Config fingerprint", "Config output is incomplete")
+        return config_hash.hexdigest()
+
     def _rename_file_on_tftp(
         self, initial_file_name, new_file_name, tftp_host, tftp_port
     ):
-        """Rename file on remote TFTP Server."""
-        if tftp_port:
-            tftp = tftpy.TftpClient(host=tftp_host, port=int(tftp_port))
-        else:
-            tftp = tftpy.TftpClient(host=tftp_host)
+        """Rename file on remote TFTP Server.
 
-        with TempDirContext(new_file_name) as temp_dir:
-            tftp.download(
-                filename=initial_file_name, output=os.path.join(temp_dir, new_file_name)
+        Downloaded data is uploaded under the new name at the same time,
+        only a bounded part of the file is held in memory. A failed download
+        aborts the upload, the partial target is left on the server.
+        """
+        pipe = BoundedPipe()
+        download_thread = Thread(
+            target=self._download_from_tftp,
+            args=(
+                self._create_tftp_client(tftp_host, tftp_port),
+                initial_file_name,
+                pipe,
+            ),
+            name="TftpRenameDownload",
+            daemon=True,
+        )
+        download_thread.start()
+        upload_tftp = self._create_tftp_client(tftp_host, tftp_port)
+        try:
+            upload_tftp.upload(
+                filename=new_file_name, input=_TftpUploadSource(pipe, upload_tftp)
             )
-            tftp.upload(
-                filename=new_file_name, input=os.path.join(temp_dir, new_file_name)
+        except Exception:
+            # TFTP can't delete files, the server keeps what it received
+            logger.warning(
+                f"Upload of {new_file_name} to {tftp_host} failed, "
+                "the file may be left on the server partially written"
             )
+            raise
+        finally:
+            pipe.close()
+            download_thread.join()
+
+    @staticmethod
+    def _create_tftp_client(tftp_host, tftp_port) -> tftpy.TftpClient:
+        # transfers use the in-memory pipe, there are no files to lock
+        if tftp_port:
+            return tftpy.TftpClient(host=tftp_host, port=int(tftp_port), flock=False)
+        return tftpy.TftpClient(host=tftp_host, flock=False)
+
+    @staticmethod
+    def _download_from_tftp(tftp, file_name, pipe: BoundedPipe):
+        try:
+            tftp.download(filename=file_name, output=pipe)
+        except BrokenPipeError:
+            logger.debug(f"Upload stopped, download of {file_name} cancelled")
+            pipe.close_writer()
+        except Exception as e:
+            logger.exception(f"Failed to download {file_name} from TFTP")
+            pipe.close_writer(e)
+        else:
+            pipe.close_writer()
 
-    def reload_device(self, timeout=500, action_map=None, error_map=None):
-        """Reload device.
+    def reload_device(
+        self, timeout=500, action_map=None, error_map=None
+    ) -> ReloadTimings:
+        """Reload device and wait till its management plane is ready.
 
-        :param timeout: session reconnect timeout
+        :param timeout: time for the device to go down and come back
         :param action_map: actions will be taken during executing commands
         :param error_map: errors will be raised during executing commands
         """
+        prober = self._create_readiness_prober()
+        timings = ReloadTimings()
+        start = time.monotonic()
+        deadline = start + timeout
         try:
             CommandTemplateExecutor(
                 self._cli_service, configuration.RELOAD
             ).execute_command(action_map=action_map, error_map=error_map)
         except Exception:
-            logger.info("Device rebooted, starting reconnect")
-        self._cli_service.reconnect(timeout)
+            logger.info("Device rebooted, waiting for it to go down")
+
+        if not prober.wait_down(deadline - time.monotonic()):
+            raise Exception("Reload device", "Device didn't go down after restart")
+        timings.down = time.monotonic() - start
+
+        if not prober.wait_up(deadline - time.monotonic()):
+            raise Exception(
+                "Reload device", f"Device didn't come back during {timeout} sec."
+            )
+        timings.booting = time.monotonic() - start - timings.down
+        logger.info(f"Device is up after {timings.booting:.1f} sec of booting")
+
+        connected = False
+
+        def is_management_ready() -> bool:
+            nonlocal connected
+            try:
+                if not connected:
+                    self._cli_service.reconnect(max(deadline - time.monotonic(), 1))
+                    connected = True
+                output = CommandTemplateExecutor(
+                    self._cli_service, configuration.SHOW_SYSTEM_INFO
+                ).execute_command()
+            except Exception as e:
+                logger.debug(f"Management plane isn't ready: {e}")
+                connected = False
+                return False
+            return bool(output_patterns.SYSTEM_INFO.search(output))
+
+        if not prober.wait_for(is_management_ready, deadline - time.monotonic()):
+            raise Exception(
+                "Reload device",
+                f"Management plane isn't ready after {timeout} sec.",
+            )
+        timings.management_ready = (
+            time.monotonic() - start - timings.down - timings.booting
+        )
+        logger.info(
+            f"Device reloaded in {timings.total:.1f} sec.: "
+            f"down {timings.down:.1f}, booting {timings.booting:.1f}, "
+            f"management ready {timings.management_ready:.1f}"
+        )
+        return timings
+
+    def _create_readiness_prober(self) -> ReadinessProber:
+        session = self._cli_service.session
+        banner = b"SSH-" if session.session_type == "SSH" else None
+        return ReadinessProber(session.host, session.port, banner)
 
     def shutdown(self, action_map=None, error_map=None):
         """Shutdown the system."""
@@ -234,15 +549,88 @@ class SystemActions:
             logger.info("Device turned off")
 
 
+@define
+class SoftwareImage:
+    version: str
+    downloaded: bool
+    current: bool
+
+    @classmethod
+    def parse_list(cls, output: str) -> list[SoftwareImage]:
+        """Parse images from request system software info output."""
+        images = []
+        for match in output_patterns.SOFTWARE_INFO_LINE.compile().finditer(output):
+            flags = []
+            for value in reversed(match.group("columns").split()):
+                if value.lower() not in ("yes", "no"):
+                    break
+                flags.insert(0, value.lower() == "yes")
+            if len(flags) < 2:
+                continue
+            *_, downloaded, current = flags
+            images.append(cls(match.group("version"), downloaded, current))
+        return images
+
+
 @define
 class FirmwareActions:
     _cli_service: CliService
 
-    def install_software(self, software_file_name):
+    @staticmethod
+    def get_version_from_file_name(software_file_name: str) -> str | None:
+        match = output_patterns.SOFTWARE_FILE_VERSION.search(software_file_name)
+        return match.group("version") if match else None
+
+    def get_software_images(self) -> list[SoftwareImage]:
+        output = CommandTemplateExecutor(
+            self._cli_service, firmware.SOFTWARE_INFO
+        ).execute_command()
+        return SoftwareImage.parse_list(output)
+
+    def get_software_image(self, version: str) -> SoftwareImage | None:
+        return next(
+            (x for x in self.get_software_images() if x.version == version), None
+        )
+
+    def install_software_version(self, version) -> int:
+        """Install software image already downloaded to the device.
+
+        :param version: software version
+        :return: install job id
+        """
+        output = CommandTemplateExecutor(
+            self._cli_service, firmware.INSTALL_SOFTWARE_VERSION
+        ).execute_command(version=version)
+        return self._get_install_job_id(output)
+
+    def wait_for_install(self, job_id: int, timeout: float = 1800) -> PanOSJob:
+        """Poll the install job, raise if the install failed."""
+        job = JobActions(self._cli_service).wait_for_job(job_id, timeout=timeout)
+        if not job.success:
+            logger.error(f"Software install job {job_id} failed: {job.details}")
+            raise Exception(
+                "Install software", "Software install failed. See logs for details"
+            )
+        return job
+
+    @staticmethod
+    def _get_install_job_id(output: str) -> int:
+        match = output_patterns.SOFTWARE_INSTALL_JOB.search(output)
+        if not match:
+            logger.error(f"Software install failed to start: {output}")
+            raise Exception(
+                "Install software",
+                "Software install failed to start. See logs for details",
+            )
+        return int(match.group("job_id"))
+
+    def install_software(self, software_file_name) -> int:
         """Set boot firmware file.
 
         :param software_file_name: software file name
+        :return: install job id
         """
-        CommandTemplateExecutor(
+        output = CommandTemplateExecutor(
             self._cli_service, firmware.INSTALL_SOFTWARE
         ).execute_command(software_file_name=software_file_name)
+        return self._get_install_job_id(output)
@@ -8,15 +8,17 @@ SAVE_CONFIG = CommandTemplate("save config to {filename}")
 LOAD_CONFIG = CommandTemplate("load config from {filename}")
 DELETE_CONFIG = CommandTemplate("delete config saved {filename}")
 COPY_TO_TFTP = CommandTemplate(
-    "tftp export configuration [remote-port {port}]from {filename} to {tftp_host}"
+    "tftp export configuration [remote-port {port} ]from {filename} to {tftp_host}"
 )
 COPY_FROM_TFTP = CommandTemplate(
-    "tftp import {file_type} [remote-port {port}]from {tftp_host} file {remote_path}"
+    "tftp import {file_type} [remote-port {port} ]from {tftp_host} file {remote_path}"
 )
 COPY_TO_SCP = CommandTemplate(
-    "scp export configuration [remote-port {port}]from {filename} to {dst}"
+    "scp export configuration [remote-port {port} ]from {filename} to {dst}"
+)
+COPY_FROM_SCP = CommandTemplate(
+    "scp import {file_type} [remote-port {port} ]from {src}"
 )
-COPY_FROM_SCP = CommandTemplate("scp import {file_type} [remote-port {port}]from {src}")
 RELOAD = CommandTemplate(
     "request restart system",
     action_map={
@@ -26,4 +28,27 @@ RELOAD = CommandTemplate(
     },
 )
 SHUTDOWN = CommandTemplate("request shutdown system")
+SHOW_SYSTEM_INFO = CommandTemplate("show system info")
 COMMIT = CommandTemplate("commit")
+# Ctrl+C returns to the prompt, started job keeps running on the device
+INTERRUPT = CommandTemplate("\x03")
+SHOW_CONFIG = CommandTemplate("show[ {path}]")
+SHOW_RUNNING_CONFIG_COMMAND = "show config running"
+CHECK_PENDING_CHANGES_COMMAND = "check pending-changes"
+CHECK_PENDING_CHANGES = CommandTemplate(CHECK_PENDING_CHANGES_COMMAND)
+# configuration mode commands allowed in bulk apply
+BULK_COMMANDS = ("set", "delete", "rename", "move")
+CONFIG_MODE_COMMANDS = (
+    *BULK_COMMANDS,
+    "edit",
+    "up",
+    "top",
+    "copy",
+    "load",
+    "save",
+    "revert",
+    "validate",
+    "commit",
+)
+# commands without prompts and mode changes, they can be sent together
+PIPELINE_COMMANDS = ("show", *BULK_COMMANDS)
@@ -3,9 +3,8 @@ from __future__ import annotations
 from cloudshell.cli.command_template.command_template import CommandTemplate
 
 SHOW_SYSTEM_SERVICES = CommandTemplate("show system services")
-SHOW_SNMP_SETTINGS = CommandTemplate(
-    "show deviceconfig system snmp-setting access-setting"
-)
+SNMP_ACCESS_SETTING = "deviceconfig system snmp-setting access-setting"
+SHOW_SNMP_SETTINGS = CommandTemplate(f"show {SNMP_ACCESS_SETTING}")
 ENABLE_SNMP_SERVICE = CommandTemplate("set deviceconfig system service disable-snmp no")
 DISABLE_SNMP_SERVICE = CommandTemplate(
     "set deviceconfig system service disable-snmp yes"
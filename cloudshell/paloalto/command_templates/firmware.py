@@ -5,3 +5,7 @@ from cloudshell.cli.command_template.command_template import CommandTemplate
 INSTALL_SOFTWARE = CommandTemplate(
     "request system software install file {software_file_name}"
 )
+INSTALL_SOFTWARE_VERSION = CommandTemplate(
+    "request system software install version {version}"
+)
+SOFTWARE_INFO = CommandTemplate("request system software info")
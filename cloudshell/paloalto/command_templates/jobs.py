@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+from cloudshell.cli.command_template.command_template import CommandTemplate
+
+SHOW_JOB = CommandTemplate("show jobs id {job_id}")
+# operational commands have to be prefixed with run in the configuration mode
+SHOW_JOB_FROM_CONFIG = CommandTemplate("run show jobs id {job_id}")
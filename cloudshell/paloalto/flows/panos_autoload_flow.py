@@ -1,29 +1,107 @@
 from __future__ import annotations
 
+import hashlib
+import logging
 from typing import TYPE_CHECKING
 
 from cloudshell.shell.flows.autoload.basic_flow import AbstractAutoloadFlow
 
+from ..autoload.panos_autoload_cache import DeviceState
 from ..autoload.panos_generic_snmp_autoload import PanOSGenericSNMPAutoload
 
 if TYPE_CHECKING:
+    from typing import Union
+
     from cloudshell.shell.core.driver_context import AutoLoadDetails
     from cloudshell.shell.standards.firewall.autoload_model import FirewallResourceModel
     from cloudshell.snmp.snmp_configurator import EnableDisableSnmpConfigurator
+    from cloudshell.snmp.snmp_parameters import (
+        SNMPReadParameters,
+        SNMPV3Parameters,
+        SNMPWriteParameters,
+    )
+
+    from ..autoload.panos_autoload_cache import PanOSAutoloadCache
+
+    SnmpParams = Union[SNMPReadParameters, SNMPWriteParameters, SNMPV3Parameters]
+
+
+logger = logging.getLogger(__name__)
 
 
 class PanOSSnmpAutoloadFlow(AbstractAutoloadFlow):
     """Autoload flow."""
 
-    def __init__(self, snmp_configurator: EnableDisableSnmpConfigurator):
+    def __init__(
+        self,
+        snmp_configurator: EnableDisableSnmpConfigurator,
+        autoload_cache: PanOSAutoloadCache | None = None,
+        snmp_parameters: SnmpParams | None = None,
+    ):
+        """Autoload flow.
+
+        :param autoload_cache: enables incremental autoload, previous autoload
+            details are returned while the device state is not changed
+        :param snmp_parameters: parameters the SNMP configurator was created
+            with, they identify the device in the autoload cache
+        """
         super().__init__()
         self._snmp_configurator = snmp_configurator
+        self._autoload_cache = autoload_cache
+        self._snmp_parameters = snmp_parameters
 
     def _autoload_flow(
         self, supported_os: list[str], resource_model: FirewallResourceModel
     ) -> AutoLoadDetails:
         """Autoload Flow."""
         with self._snmp_configurator.get_service() as snmp_service:
-            snmp_autoload = PanOSGenericSNMPAutoload(snmp_service, resource_model)
-            autoload_details = snmp_autoload.discover(supported_os)
+            if self._autoload_cache is None:
+                return self._discover(snmp_service, supported_os, resource_model)
+            return self._incremental_discover(
+                snmp_service, supported_os, resource_model
+            )
+
+    @staticmethod
+    def _discover(snmp_service, supported_os, resource_model) -> AutoLoadDetails:
+        snmp_autoload = PanOSGenericSNMPAutoload(snmp_service, resource_model)
+        return snmp_autoload.discover(supported_os)
+
+    def _incremental_discover(
+        self, snmp_service, supported_os, resource_model
+    ) -> AutoLoadDetails:
+        device_key = self._get_device_key(resource_model)
+        if device_key is None:
+            logger.warning("SNMP parameters are unknown, autoload cache is skipped")
+            return self._discover(snmp_service, supported_os, resource_model)
+        state = DeviceState.from_device(snmp_service)
+        cached = self._autoload_cache.load(device_key)
+        if state and cached and not state.is_changed_since(cached[0]):
+            logger.info("Device is not changed since last autoload, using cache")
+            return cached[1]
+
+        autoload_details = self._discover(snmp_service, supported_os, resource_model)
+        if state:
+            self._autoload_cache.save(device_key, state, autoload_details)
+        else:
+            self._autoload_cache.invalidate(device_key)
         return autoload_details
+
+    def _get_device_key(self, resource_model: FirewallResourceModel) -> str | None:
+        """Cache key of the device the SNMP service is connected to.
+
+        Resource name alone can be shared or re-pointed to another device,
+        so the address and the SNMP identity are part of the key. Community
+        and user are hashed as the key is stored in the cache file.
+        """
+        params = self._snmp_parameters
+        if params is None or not params.ip:
+            return None
+        if params.version == params.SnmpVersion.V3:
+            identity = params.snmp_user
+        else:
+            identity = params.snmp_community
+        identity_hash = hashlib.sha256(str(identity).encode()).hexdigest()[:16]
+        return (
+            f"{resource_model.name}@{params.ip}:{params.port}"
+            f"/v{params.version}/{identity_hash}"
+        )
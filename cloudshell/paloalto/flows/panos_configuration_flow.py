@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from typing import TYPE_CHECKING
 
 from cloudshell.shell.flows.configuration.basic_flow import (
@@ -8,21 +9,27 @@ from cloudshell.shell.flows.configuration.basic_flow import (
     ConfigurationType,
     RestoreMethod,
 )
+from cloudshell.shell.flows.utils.url import BasicLocalUrl
 
 from cloudshell.paloalto.command_actions.system_actions import (
     SystemActions,
     SystemConfigurationActions,
 )
+from cloudshell.paloalto.helpers.commit_coordinator import CommitCoordinator
 
 if TYPE_CHECKING:
     from typing import ClassVar, Union
 
-    from cloudshell.shell.flows.utils.url import BasicLocalUrl, RemoteURL
+    from cloudshell.shell.flows.utils.url import RemoteURL
     from cloudshell.shell.standards.firewall.resource_config import (
         FirewallResourceConfig,
     )
 
     from ..cli.panos_cli_configurator import PanOSCliConfigurator
+    from ..helpers.config_backup_store import ConfigBackupStore
+    from ..helpers.local_tftp_receiver import LocalTftpReceiver
+    from ..helpers.panos_xml_api import PanOSXmlApiClient
+    from ..helpers.transfer_verifier import TransferVerifier
 
     Url = Union[RemoteURL, BasicLocalUrl]
 
@@ -40,14 +47,39 @@ class PanOSConfigurationFlow(AbstractConfigurationFlow):
     #   CloudShell reserves 7ch+13ch+4ch+3ch(three delimiters "-") = 27ch
     FILE_TYPE: ClassVar[str] = "configuration"
     FILE_EXTENSION: ClassVar[str] = "xml"
+    LOCAL_RECEIVER_TIMEOUT: ClassVar[int] = 300
 
     def __init__(
         self,
         resource_config: FirewallResourceConfig,
         cli_configurator: PanOSCliConfigurator,
+        local_receiver: LocalTftpReceiver | None = None,
+        backup_store: ConfigBackupStore | None = None,
+        reload_on_restore: bool = False,
+        transfer_verifier: TransferVerifier | None = None,
+        xml_api: PanOSXmlApiClient | None = None,
     ):
+        """Init the flow.
+
+        :param local_receiver: running TFTP receiver of the driver process,
+            used for local destinations and TFTP URLs of the receiver host
+        :param backup_store: deduplicated store of configs saved to local
+            destinations, unchanged running config isn't exported again
+        :param reload_on_restore: reboot the device after restoring the
+            running config, by default the committed config is applied
+            without a reboot
+        :param transfer_verifier: checks the imported config against the
+            source before it's loaded
+        :param xml_api: streams the running config to local destinations and
+            local configs to the device instead of CLI transfers
+        """
         super().__init__(resource_config)
         self.cli_configurator = cli_configurator
+        self.local_receiver = local_receiver
+        self.backup_store = backup_store
+        self.reload_on_restore = reload_on_restore
+        self.transfer_verifier = transfer_verifier
+        self.xml_api = xml_api
 
     @property
     def file_system(self) -> str:
@@ -70,6 +102,34 @@ class PanOSConfigurationFlow(AbstractConfigurationFlow):
         :param vrf_management_name: Virtual Routing and
         Forwarding management name
         """
+        remote_file_name = f"{file_dst_url.filename}.{self.FILE_EXTENSION}"
+        use_xml_api = self.xml_api and configuration_type == ConfigurationType.RUNNING
+        if use_xml_api:
+            local_path = self._get_local_path(file_dst_url, remote_file_name)
+        else:
+            local_path = self._get_receiver_path(file_dst_url, remote_file_name)
+        fingerprint = None
+        if (
+            local_path
+            and self.backup_store
+            and configuration_type == ConfigurationType.RUNNING
+        ):
+            fingerprint = self._get_config_fingerprint()
+            version = self.backup_store.find_version(
+                self._resource_config.address, fingerprint
+            )
+            if version:
+                logger.info(
+                    f"Running config didn't change since the backup {version['hash']}"
+                )
+                self.backup_store.export(version["hash"], local_path)
+                return remote_file_name
+
+        if use_xml_api and local_path:
+            self.xml_api.export_running_config(local_path)
+            self._add_backup(local_path, fingerprint)
+            return remote_file_name
+
         if configuration_type == ConfigurationType.RUNNING:
             config_file_name = f"{file_dst_url.filename}.{self.FILE_EXTENSION}"
             with self.cli_configurator.config_mode_service() as config_cli_service:
@@ -79,11 +139,16 @@ class PanOSConfigurationFlow(AbstractConfigurationFlow):
             # Filename for startup configuration is running-config.xml
             config_file_name = "running-config.xml"
 
+        if local_path:
+            self._export_to_receiver(config_file_name, local_path)
+            self._add_backup(local_path, fingerprint)
+            return remote_file_name
+
         with self.cli_configurator.enable_mode_service() as enable_cli_service:
             save_actions = SystemActions(enable_cli_service)
             save_actions.export_config(
                 config_file_name=config_file_name,
-                remote_file_name=f"{file_dst_url.filename}.{self.FILE_EXTENSION}",
+                remote_file_name=remote_file_name,
                 protocol=file_dst_url.scheme,
                 host=file_dst_url.host,
                 port=file_dst_url.port,
@@ -91,7 +156,57 @@ class PanOSConfigurationFlow(AbstractConfigurationFlow):
                 password=file_dst_url.password,
                 remote_path=file_dst_url.path,
             )
-        return f"{file_dst_url.filename}.{self.FILE_EXTENSION}"
+        return remote_file_name
+
+    def _get_config_fingerprint(self) -> str:
+        with self.cli_configurator.enable_mode_service() as enable_cli_service:
+            return SystemActions(enable_cli_service).get_config_fingerprint()
+
+    def _add_backup(self, local_path: str, fingerprint: str | None) -> None:
+        if self.backup_store:
+            with open(local_path, "rb") as config_file:
+                self.backup_store.add(
+                    self._resource_config.address, config_file.read(), fingerprint
+                )
+
+    def _get_receiver_path(self, file_dst_url: Url, file_name: str) -> str | None:
+        """Local path for the file if the local receiver accepts the URL."""
+        if not self.local_receiver:
+            return None
+        return self._get_local_path(file_dst_url, file_name)
+
+    def _get_local_path(self, file_dst_url: Url, file_name: str) -> str | None:
+        """Local path for the file of local URLs and the receiver TFTP URLs."""
+        if isinstance(file_dst_url, BasicLocalUrl):
+            return os.path.join(os.path.dirname(file_dst_url.url), file_name)
+        if (
+            self.local_receiver
+            and file_dst_url.scheme.lower() == "tftp"
+            and self.local_receiver.root_dir
+            and file_dst_url.host == self.local_receiver.host
+        ):
+            return self.local_receiver.get_local_path(
+                f"{file_dst_url.get_folder()}/{file_name}"
+            )
+        return None
+
+    def _export_to_receiver(self, config_file_name: str, local_path: str) -> None:
+        """Device sends the file to the local receiver, no rename needed."""
+        transfer = self.local_receiver.expect(
+            config_file_name, local_path, device_host=self._resource_config.address
+        )
+        try:
+            with self.cli_configurator.enable_mode_service() as enable_cli_service:
+                SystemActions(enable_cli_service).export_config(
+                    config_file_name=config_file_name,
+                    remote_file_name=config_file_name,
+                    protocol="tftp",
+                    host=self.local_receiver.host,
+                    port=self.local_receiver.port,
+                )
+            transfer.wait(self.LOCAL_RECEIVER_TIMEOUT)
+        finally:
+            self.local_receiver.cancel(transfer)
 
     def _restore_flow(
         self,
@@ -123,23 +238,40 @@ class PanOSConfigurationFlow(AbstractConfigurationFlow):
 
         with self.cli_configurator.enable_mode_service() as enable_cli_service:
             restore_actions = SystemActions(enable_cli_service)
-            restore_actions.import_config(
-                filename=config_path.filename,
-                protocol=config_path.scheme,
-                host=config_path.host,
-                file_type=self.FILE_TYPE,
-                port=config_path.port,
-                user=config_path.username,
-                password=config_path.password,
-                remote_path=config_path.path,
+            source_path = self.xml_api and self._get_local_path(
+                config_path, config_path.filename
             )
+            if source_path:
+                self.xml_api.import_config(source_path, config_path.filename)
+            else:
+                received_size = restore_actions.import_config(
+                    filename=config_path.filename,
+                    protocol=config_path.scheme,
+                    host=config_path.host,
+                    file_type=self.FILE_TYPE,
+                    port=config_path.port,
+                    user=config_path.username,
+                    password=config_path.password,
+                    remote_path=config_path.path,
+                )
+                if self.transfer_verifier and received_size is not None:
+                    self.transfer_verifier.verify(config_path, received_size)
 
             with enable_cli_service.enter_mode(
                 self.cli_configurator.config_mode
             ) as config_cli_service:
-                restore_conf_action = SystemConfigurationActions(config_cli_service)
-                restore_conf_action.load_config(config_path.filename)
-                restore_conf_action.commit_changes()
+                # load replaces the candidate config, it's committed alone
+                coordinator = CommitCoordinator.for_device(self.cli_configurator.host)
+                with coordinator.exclusive():
+                    restore_conf_action = SystemConfigurationActions(config_cli_service)
+                    restore_conf_action.load_config(config_path.filename)
+                    try:
+                        restore_conf_action.commit_changes_async()
+                    except Exception as e:
+                        raise Exception("Restore failed", e.args[-1]) from e
 
-            if configuration_type == ConfigurationType.RUNNING:
+            if (
+                configuration_type == ConfigurationType.RUNNING
+                and self.reload_on_restore
+            ):
                 restore_actions.reload_device()
@@ -10,10 +10,12 @@ from cloudshell.snmp.snmp_configurator import EnableDisableSnmpFlowInterface
 from cloudshell.paloalto.command_actions.enable_disable_snmp_actions import (  # noqa: E501
     EnableDisableSnmpV2Actions,
     EnableDisableSnmpV3Actions,
+    SnmpSettingsActions,
 )
 from cloudshell.paloalto.command_actions.system_actions import (
     SystemConfigurationActions,
 )
+from cloudshell.paloalto.helpers.commit_coordinator import CommitCoordinator
 
 if TYPE_CHECKING:
     from typing import Union
@@ -38,14 +40,45 @@ class PanOSEnableDisableSnmpFlow(EnableDisableSnmpFlowInterface):
     _cli_configurator: PanOSCliConfigurator
 
     def enable_snmp(self, snmp_parameters: SnmpParams) -> None:
-        with self._cli_configurator.config_mode_service() as cli_service:
-            if snmp_parameters.version == snmp_parameters.SnmpVersion.V3:
-                self._enable_snmp_v3(cli_service, snmp_parameters)
-            else:
-                self._enable_snmp(cli_service, snmp_parameters)
+        with self._cli_configurator.enable_mode_service() as enable_cli_service:
+            service_enabled = SnmpSettingsActions(
+                enable_cli_service
+            ).is_snmp_service_enabled()
+            with enable_cli_service.enter_mode(
+                self._cli_configurator.config_mode
+            ) as cli_service:
+                if snmp_parameters.version == snmp_parameters.SnmpVersion.V3:
+                    self._enable_snmp_v3(cli_service, snmp_parameters, service_enabled)
+                else:
+                    self._enable_snmp(cli_service, snmp_parameters, service_enabled)
+
+    def _get_system_actions(
+        self, cli_service: CliService
+    ) -> SystemConfigurationActions:
+        coordinator = CommitCoordinator.for_device(self._cli_configurator.host)
+        return SystemConfigurationActions(cli_service, coordinator)
 
     @staticmethod
-    def _enable_snmp(cli_service: CliService, snmp_parameters: SnmpParams) -> None:
+    def _is_snmp_in_place(
+        cli_service: CliService, service_enabled: bool, configured: bool
+    ) -> bool:
+        """Check SNMP is enabled and configured in the running config.
+
+        Candidate config may have the settings that are not committed yet,
+        so they are in place only when there are no pending changes.
+        """
+        return (
+            service_enabled
+            and configured
+            and not SystemConfigurationActions(cli_service).has_pending_changes()
+        )
+
+    def _enable_snmp(
+        self,
+        cli_service: CliService,
+        snmp_parameters: SnmpParams,
+        service_enabled: bool = False,
+    ) -> None:
         """Enable SNMPv1,2."""
         snmp_community = snmp_parameters.snmp_community
         if not snmp_community:
@@ -53,23 +86,44 @@ class PanOSEnableDisableSnmpFlow(EnableDisableSnmpFlowInterface):
 
         logger.info(f"Start creating SNMP community {snmp_community}")
         snmp_actions = EnableDisableSnmpV2Actions(cli_service)
-        system_actions = SystemConfigurationActions(cli_service)
-        snmp_actions.enable_snmp_service()
-        snmp_actions.enable_snmp(community=snmp_community)
-        system_actions.commit_changes()
+        system_actions = self._get_system_actions(cli_service)
+        with system_actions.changes():
+            settings = SnmpSettingsActions(cli_service).get_snmp_settings()
+            configured = snmp_actions.is_snmp_configured(settings, snmp_community)
+            if self._is_snmp_in_place(cli_service, service_enabled, configured):
+                logger.info(f"SNMP community {snmp_community} already configured")
+                return
+
+            if not service_enabled:
+                snmp_actions.enable_snmp_service()
+            if not configured:
+                snmp_actions.enable_snmp(community=snmp_community)
+            system_actions.commit_changes()
 
         logger.info(f"SNMP community {snmp_community} created")
 
-    @staticmethod
-    def _enable_snmp_v3(cli_service: CliService, snmp_parameters: SnmpParams) -> None:
-        """Enable SNMPv3."""
+    def _enable_snmp_v3(
+        self,
+        cli_service: CliService,
+        snmp_parameters: SnmpParams,
+        service_enabled: bool = False,
+    ) -> None:
+        """Enable SNMPv3.
+
+        Device shows only encrypted passwords, so the user is always set
+        and pending changes tell if the passwords or the view are changed.
+        """
         logger.info("Start creating SNMPv3 configuration")
         snmp_actions = EnableDisableSnmpV3Actions(cli_service)
-        system_actions = SystemConfigurationActions(cli_service)
-
-        snmp_actions.enable_snmp_service()
-        snmp_actions.enable_snmp(snmp_params=snmp_parameters)
-        system_actions.commit_changes()
+        system_actions = self._get_system_actions(cli_service)
+        with system_actions.changes():
+            if not service_enabled:
+                snmp_actions.enable_snmp_service()
+            snmp_actions.enable_snmp(snmp_params=snmp_parameters)
+            if not system_actions.has_pending_changes():
+                logger.info(f"SNMP User {snmp_parameters.snmp_user} already configured")
+                return
+            system_actions.commit_changes()
 
         logger.info(f"SNMP User {snmp_parameters.snmp_user} created")
 
@@ -80,25 +134,24 @@ class PanOSEnableDisableSnmpFlow(EnableDisableSnmpFlowInterface):
             else:
                 self._disable_snmp(cli_service)
 
-    @staticmethod
-    def _disable_snmp(cli_service: CliService) -> None:
+    def _disable_snmp(self, cli_service: CliService) -> None:
         """Disable SNMPv1,2."""
         logger.info("Start removing SNMP v2c configuration")
         snmp_actions = EnableDisableSnmpV2Actions(cli_service)
-        system_actions = SystemConfigurationActions(cli_service)
-        snmp_actions.disable_snmp()
-        system_actions.commit_changes()
+        system_actions = self._get_system_actions(cli_service)
+        with system_actions.changes():
+            snmp_actions.disable_snmp()
+            system_actions.commit_changes()
 
         logger.info("SNMP v2c configuration removed")
 
-    @staticmethod
-    def _disable_snmp_v3(cli_service: CliService) -> None:
+    def _disable_snmp_v3(self, cli_service: CliService) -> None:
         """Disable SNMPv3."""
         logger.info("Start removing SNMP v3 configuration")
         snmp_actions = EnableDisableSnmpV3Actions(cli_service)
-        system_actions = SystemConfigurationActions(cli_service)
-
-        snmp_actions.disable_snmp()
-        system_actions.commit_changes()
+        system_actions = self._get_system_actions(cli_service)
+        with system_actions.changes():
+            snmp_actions.disable_snmp()
+            system_actions.commit_changes()
 
         logger.info("SNMP v3 configuration removed")
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from attrs import define
+
+from cloudshell.paloalto.flows.panos_autoload_flow import PanOSSnmpAutoloadFlow
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Union
+
+    from cloudshell.shell.core.driver_context import AutoLoadDetails
+    from cloudshell.shell.standards.firewall.autoload_model import FirewallResourceModel
+    from cloudshell.snmp.snmp_configurator import EnableDisableSnmpConfigurator
+    from cloudshell.snmp.snmp_parameters import (
+        SNMPReadParameters,
+        SNMPV3Parameters,
+        SNMPWriteParameters,
+    )
+
+    from ..autoload.panos_autoload_cache import PanOSAutoloadCache
+
+    SnmpParams = Union[SNMPReadParameters, SNMPWriteParameters, SNMPV3Parameters]
+
+
+logger = logging.getLogger(__name__)
+
+
+def check_unique_names(devices: list, title: str) -> None:
+    """Raise if devices share a name, their results would overwrite."""
+    names = [x.name for x in devices]
+    duplicates = sorted({x for x in names if names.count(x) > 1})
+    if duplicates:
+        raise Exception(title, f"Duplicate device names {duplicates}")
+
+
+@define
+class FleetAutoloadDevice:
+    name: str
+    snmp_configurator: EnableDisableSnmpConfigurator
+    resource_model: FirewallResourceModel
+    # identifies the device in the autoload cache
+    snmp_parameters: SnmpParams | None = None
+
+
+@define
+class FleetAutoloadResult:
+    name: str
+    details: AutoLoadDetails | None = None
+    error: Exception | None = None
+    # seconds spent waiting for a free worker
+    queued: float = 0.0
+    # seconds spent discovering the device
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@define
+class _DeviceRun:
+    device: FleetAutoloadDevice
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+@define
+class PanOSFleetAutoloadFlow:
+    """Autoload many PanOS devices on a bounded thread pool.
+
+    A failed or timed out device doesn't affect others. Threads can't be
+    interrupted, so a timed out autoload keeps running in the background
+    till its SNMP requests time out, its result is dropped. It keeps its
+    worker busy meanwhile, queued devices wait for other workers. Device
+    names must be unique as results are keyed by them.
+    """
+
+    max_workers: int = 8
+    timeout: float = 600
+    autoload_cache: PanOSAutoloadCache | None = None
+
+    def discover(
+        self, supported_os: list[str], devices: Iterable[FleetAutoloadDevice]
+    ) -> dict[str, FleetAutoloadResult]:
+        devices = list(devices)
+        check_unique_names(devices, "Fleet autoload")
+        results = {}
+        runs: dict[Future, _DeviceRun] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="PanOSFleetAutoload"
+        )
+        try:
+            for device in devices:
+                run = _DeviceRun(device, time.monotonic())
+                runs[executor.submit(self._discover_device, run, supported_os)] = run
+
+            pending = set(runs)
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=self._get_wait_timeout(runs, pending),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    run = runs[future]
+                    results[run.device.name] = self._get_result(future, run)
+                for future in self._get_timed_out(runs, pending):
+                    run = runs[future]
+                    future.cancel()
+                    logger.error(f"Autoload of {run.device.name} timed out")
+                    results[run.device.name] = self._create_result(
+                        run, error=TimeoutError(f"Autoload timed out {self.timeout}s")
+                    )
+                    pending.discard(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        running = [x.device.name for x in runs.values() if x.finished_at is None]
+        if running:
+            logger.warning(f"Timed out autoload still running for {running}")
+        return results
+
+    def _discover_device(
+        self, run: _DeviceRun, supported_os: list[str]
+    ) -> AutoLoadDetails:
+        run.started_at = time.monotonic()
+        try:
+            autoload_flow = PanOSSnmpAutoloadFlow(
+                run.device.snmp_configurator,
+                self.autoload_cache,
+                run.device.snmp_parameters,
+            )
+            return autoload_flow.discover(supported_os, run.device.resource_model)
+        finally:
+            run.finished_at = time.monotonic()
+
+    def _get_wait_timeout(self, runs, pending) -> float:
+        now = time.monotonic()
+        # re-check at least every second, queued devices get their deadline
+        # only when a worker picks them
+        timeout = 1.0
+        for future in pending:
+            started_at = runs[future].started_at
+            if started_at is not None:
+                timeout = min(timeout, started_at + self.timeout - now)
+        return max(timeout, 0)
+
+    def _get_timed_out(self, runs, pending) -> list[Future]:
+        now = time.monotonic()
+        return [
+            x
+            for x in pending
+            if runs[x].started_at is not None
+            and now - runs[x].started_at >= self.timeout
+        ]
+
+    def _get_result(self, future: Future, run: _DeviceRun) -> FleetAutoloadResult:
+        try:
+            details = future.result()
+        except Exception as e:
+            logger.exception(f"Autoload of {run.device.name} failed")
+            return self._create_result(run, error=e)
+        return self._create_result(run, details=details)
+
+    @staticmethod
+    def _create_result(run: _DeviceRun, **kwargs) -> FleetAutoloadResult:
+        finished_at = run.finished_at or time.monotonic()
+        started_at = run.started_at or finished_at
+        return FleetAutoloadResult(
+            run.device.name,
+            queued=started_at - run.submitted_at,
+            duration=finished_at - started_at,
+            **kwargs,
+        )
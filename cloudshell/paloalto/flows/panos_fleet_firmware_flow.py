@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+from attrs import define
+
+from cloudshell.logging.utils.decorators import command_logging
+
+from cloudshell.paloalto.flows.panos_fleet_autoload_flow import check_unique_names
+from cloudshell.paloalto.flows.panos_load_firmware_flow import PanOSLoadFirmwareFlow
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from cloudshell.shell.standards.firewall.resource_config import (
+        FirewallResourceConfig,
+    )
+
+    from ..cli.panos_cli_configurator import PanOSCliConfigurator
+    from .panos_load_firmware_flow import FirmwareLoadTimings
+
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class FleetFirmwareDevice:
+    name: str
+    resource_config: FirewallResourceConfig
+    cli_configurator: PanOSCliConfigurator
+
+
+@define
+class FleetFirmwareResult:
+    name: str
+    timings: FirmwareLoadTimings | None = None
+    error: Exception | None = None
+    # seconds spent waiting for a free worker
+    queued: float = 0.0
+    # seconds spent upgrading the device
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@define
+class PanOSFleetFirmwareFlow:
+    """Upgrade firmware of many PanOS devices, max_workers at a time.
+
+    A failed device doesn't affect others. Every stage is bounded by its
+    own timeout: install job polling and readiness checks after reload.
+    Device names must be unique as results are keyed by them.
+    """
+
+    max_workers: int = 4
+    reload_after_install: bool = True
+
+    @command_logging
+    def upgrade(
+        self, path: str, devices: Iterable[FleetFirmwareDevice]
+    ) -> dict[str, FleetFirmwareResult]:
+        devices = list(devices)
+        check_unique_names(devices, "Fleet firmware")
+        results = {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="PanOSFleetFirmware"
+        ) as executor:
+            futures = [
+                executor.submit(self._upgrade_device, device, path, time.monotonic())
+                for device in devices
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.name] = result
+        return results
+
+    def _upgrade_device(
+        self, device: FleetFirmwareDevice, path: str, submitted_at: float
+    ) -> FleetFirmwareResult:
+        started_at = time.monotonic()
+        result = FleetFirmwareResult(device.name, queued=started_at - submitted_at)
+        try:
+            flow = PanOSLoadFirmwareFlow(
+                device.resource_config,
+                device.cli_configurator,
+                self.reload_after_install,
+            )
+            result.timings = flow.upgrade_firmware(path)
+        except Exception as e:
+            logger.exception(f"Firmware upgrade of {device.name} failed")
+            result.error = e
+        result.duration = time.monotonic() - started_at
+        return result
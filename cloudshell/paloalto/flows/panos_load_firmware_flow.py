@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
+from attrs import define
+
+from cloudshell.logging.utils.decorators import command_logging
 from cloudshell.shell.flows.firmware.basic_flow import AbstractFirmwareFlow
+from cloudshell.shell.flows.utils.str_helpers import normalize_path
 
 from cloudshell.paloalto.command_actions.system_actions import (
     FirmwareActions,
@@ -19,6 +24,8 @@ if TYPE_CHECKING:
     )
 
     from ..cli.panos_cli_configurator import PanOSCliConfigurator
+    from ..helpers.readiness_prober import ReloadTimings
+    from ..helpers.transfer_verifier import TransferVerifier
 
     Url = Union[RemoteURL, BasicLocalUrl]
 
@@ -26,6 +33,19 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@define
+class FirmwareLoadTimings:
+    """Seconds spent in every stage of the firmware upgrade."""
+
+    transfer: float = 0.0
+    install: float = 0.0
+    reload: ReloadTimings | None = None
+
+    @property
+    def total(self) -> float:
+        return self.transfer + self.install + (self.reload.total if self.reload else 0)
+
+
 class PanOSLoadFirmwareFlow(AbstractFirmwareFlow):
     FILE_TYPE = "software"
 
@@ -33,9 +53,32 @@ class PanOSLoadFirmwareFlow(AbstractFirmwareFlow):
         self,
         resource_config: FirewallResourceConfig,
         cli_configurator: PanOSCliConfigurator,
+        reload_after_install: bool = False,
+        transfer_verifier: TransferVerifier | None = None,
     ):
+        """Init the flow.
+
+        :param reload_after_install: reboot the device into the installed
+            software and wait till its management plane is ready
+        :param transfer_verifier: checks the imported image against the
+            source before it's installed
+        """
         super().__init__(resource_config)
         self.cli_configurator = cli_configurator
+        self.reload_after_install = reload_after_install
+        self.transfer_verifier = transfer_verifier
+
+    @command_logging
+    def upgrade_firmware(
+        self, path: str, expected_sha256: str | None = None
+    ) -> FirmwareLoadTimings:
+        """Load firmware and report time spent in every stage.
+
+        :param expected_sha256: published checksum of the image, the
+            transfer verifier checks the source against it
+        """
+        firmware_url = self._get_firmware_url(normalize_path(path))
+        return self._upgrade_firmware(firmware_url, self._timeout, expected_sha256)
 
     def _load_firmware_flow(
         self,
@@ -44,19 +87,54 @@ class PanOSLoadFirmwareFlow(AbstractFirmwareFlow):
         timeout: int,
     ) -> None:
         """Load firmware."""
+        self._upgrade_firmware(firmware_url, timeout)
+
+    def _upgrade_firmware(
+        self, firmware_url: Url, timeout: int, expected_sha256: str | None = None
+    ) -> FirmwareLoadTimings:
         logger.info("Upgrading firmware")
+        timings = FirmwareLoadTimings()
         with self.cli_configurator.enable_mode_service() as cli_service:
             system_actions = SystemActions(cli_service)
             load_firmware_action = FirmwareActions(cli_service)
-            system_actions.import_config(
-                filename=firmware_url.filename,
-                protocol=firmware_url.scheme,
-                host=firmware_url.host,
-                file_type=self.FILE_TYPE,
-                port=firmware_url.port,
-                user=firmware_url.username,
-                password=firmware_url.password,
-                remote_path=firmware_url.path,
+            version = load_firmware_action.get_version_from_file_name(
+                firmware_url.filename
             )
+            image = version and load_firmware_action.get_software_image(version)
+            if image and image.current:
+                logger.info(f"Software {version} is already installed")
+                return timings
+
+            start = time.monotonic()
+            if image and image.downloaded:
+                logger.info(f"Software {version} is already downloaded")
+                job_id = load_firmware_action.install_software_version(version)
+            else:
+                received_size = system_actions.import_config(
+                    filename=firmware_url.filename,
+                    protocol=firmware_url.scheme,
+                    host=firmware_url.host,
+                    file_type=self.FILE_TYPE,
+                    port=firmware_url.port,
+                    user=firmware_url.username,
+                    password=firmware_url.password,
+                    remote_path=firmware_url.path,
+                )
+                if self.transfer_verifier and received_size is not None:
+                    self.transfer_verifier.verify(
+                        firmware_url, received_size, expected_sha256
+                    )
+                timings.transfer = time.monotonic() - start
+                start = time.monotonic()
+                job_id = load_firmware_action.install_software(firmware_url.filename)
+
+            load_firmware_action.wait_for_install(job_id, timeout)
+            timings.install = time.monotonic() - start
 
-            load_firmware_action.install_software(firmware_url.filename)
+            if self.reload_after_install:
+                timings.reload = system_actions.reload_device()
+        logger.info(
+            f"Firmware upgraded in {timings.total:.0f} sec.: "
+            f"transfer {timings.transfer:.0f}, install {timings.install:.0f}"
+        )
+        return timings
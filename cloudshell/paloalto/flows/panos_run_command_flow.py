@@ -1,7 +1,78 @@
 from __future__ import annotations
 
+import logging
+import time
+from itertools import groupby
+from typing import TYPE_CHECKING
+
 from cloudshell.shell.flows.command.basic_flow import RunCommandFlow
 
+from cloudshell.paloalto.command_actions.batch_command_actions import (
+    BatchCommand,
+    BatchCommandActions,
+    CommandResult,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
 
 class PanOSRunCommandFlow(RunCommandFlow):
-    pass
+    def run_commands(
+        self,
+        commands: Iterable[str | BatchCommand],
+        stop_on_error: bool = False,
+        pipeline_size: int = 20,
+        timeout: int | None = None,
+    ) -> list[CommandResult]:
+        """Run the commands in order in one session.
+
+        The mode is chosen for every command, set/delete and other config
+        commands run in the configuration mode, others in the operational
+        one. Commands not executed after a failure are marked as such.
+
+        :param commands: commands or BatchCommand with the mode set
+        :param stop_on_error: don't run commands after the failed one
+        :param pipeline_size: max number of commands sent together
+        """
+        commands = [
+            x if isinstance(x, BatchCommand) else BatchCommand(x.strip())
+            for x in commands
+            if isinstance(x, BatchCommand) or x.strip()
+        ]
+        start = time.monotonic()
+        results = []
+        with self._cli_configurator.enable_mode_service() as enable_cli_service:
+            for is_config, group in groupby(commands, key=lambda x: x.is_config):
+                group = list(group)
+                if is_config:
+                    with enable_cli_service.enter_mode(
+                        self._cli_configurator.config_mode
+                    ) as config_cli_service:
+                        group_results = BatchCommandActions(
+                            config_cli_service
+                        ).run_commands(group, pipeline_size, stop_on_error, timeout)
+                else:
+                    group_results = BatchCommandActions(
+                        enable_cli_service
+                    ).run_commands(group, pipeline_size, stop_on_error, timeout)
+                results.extend(group_results)
+                if (
+                    len(group_results) < len(group)
+                    or not all(x.executed for x in group_results)
+                    or (stop_on_error and not all(x.success for x in group_results))
+                ):
+                    break
+
+        results.extend(
+            CommandResult(x.command, x.is_config, executed=False)
+            for x in commands[len(results) :]
+        )
+        failed = sum(not x.success for x in results)
+        logger.info(
+            f"Ran {len(commands)} commands in {time.monotonic() - start:.1f} sec., "
+            f"{failed} failed or not executed"
+        )
+        return results
@@ -1,7 +1,164 @@
 from __future__ import annotations
 
+import logging
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, ClassVar
+
+from attrs import define, field
+
+from cloudshell.logging.utils.decorators import command_logging
+from cloudshell.shell.flows.command.basic_flow import RunCommandFlow
 from cloudshell.shell.flows.state.basic_flow import StateFlow
 
+from ..autoload.panos_autoload_cache import SYS_UP_TIME
+from ..autoload.panos_generic_snmp_autoload import MIBS_FOLDER
+from ..autoload.panos_snmp_scalars import PAN_SYS_SW_VERSION, ResolvedOid
+
+if TYPE_CHECKING:
+    from cloudshell.snmp.snmp_configurator import SnmpConfigurator
+
+    from ..cli.panos_cli_configurator import PanOSCliConfigurator
+
+
+logger = logging.getLogger(__name__)
+
+SNMP_TIER = "snmp"
+POOLED_CLI_TIER = "pooled_cli"
+CLI_LOGIN_TIER = "cli_login"
+
+
+@define
+class HealthCheckResult:
+    online: bool
+    # tier that answered, None if the device is offline
+    tier: str | None = None
+    # seconds spent in every tried tier
+    latencies: dict[str, float] = field(factory=dict)
+    checked_at: float = field(factory=time.monotonic)
+
 
 class PanOSStateFlow(StateFlow):
-    pass
+    """Health check without CLI login while the device answers cheaper.
+
+    Tiers are tried in order: SNMP GET of sysUpTime and panSysSwVersion,
+    then CLI. The CLI check reuses an open session from the pool if there
+    is one, its tier tells which one answered. Results are shared by
+    flows of the process during HEALTH_CHECK_TTL, offline results during
+    OFFLINE_RESULT_TTL. One flow checks the device at a time, concurrent
+    flows wait for its result.
+    """
+
+    HEALTH_CHECK_TTL: ClassVar[float] = 30
+    # a device coming back is noticed soon, waiting flows share the result
+    OFFLINE_RESULT_TTL: ClassVar[float] = 3
+    _results: ClassVar[dict[str, HealthCheckResult]] = {}
+    _device_locks: ClassVar[dict[str, Lock]] = {}
+    _results_lock: ClassVar[Lock] = Lock()
+
+    def __init__(
+        self,
+        resource_config,
+        cli_configurator: PanOSCliConfigurator,
+        api,
+        snmp_configurator: SnmpConfigurator | None = None,
+    ):
+        """Init the flow.
+
+        :param snmp_configurator: SNMP service of the device, it shouldn't
+            enable SNMP on the device with CLI
+        """
+        super().__init__(resource_config, cli_configurator, api)
+        self._snmp_configurator = snmp_configurator
+
+    def check_health(self) -> HealthCheckResult:
+        """Check the device, the recent result is used if it's not expired."""
+        device = self.resource_config.address
+        with self._results_lock:
+            device_lock = self._device_locks.setdefault(device, Lock())
+        with device_lock:
+            result = self._get_cached_result(device)
+            if result:
+                logger.debug(f"Using health check result of {device} from cache")
+                return result
+
+            result = self._probe(device)
+            with self._results_lock:
+                self._results[device] = result
+            return result
+
+    def _get_cached_result(self, device: str) -> HealthCheckResult | None:
+        with self._results_lock:
+            result = self._results.get(device)
+        if not result:
+            return None
+        ttl = self.HEALTH_CHECK_TTL if result.online else self.OFFLINE_RESULT_TTL
+        if time.monotonic() - result.checked_at < ttl:
+            return result
+        return None
+
+    def _probe(self, device: str) -> HealthCheckResult:
+        result = HealthCheckResult(online=False)
+        # the pool reconnects a dead idle session, CLI is checked only once
+        cli_tier = (
+            POOLED_CLI_TIER
+            if self._cli_configurator.has_idle_session()
+            else CLI_LOGIN_TIER
+        )
+        tiers = [(cli_tier, self._check_cli)]
+        if self._snmp_configurator:
+            tiers.insert(0, (SNMP_TIER, self._check_snmp))
+        for tier, check in tiers:
+            start = time.monotonic()
+            try:
+                check()
+            except Exception as e:
+                logger.debug(f"Health check tier {tier} failed: {e}")
+            else:
+                result.online = True
+                result.tier = tier
+            finally:
+                result.latencies[tier] = time.monotonic() - start
+            if result.online:
+                break
+
+        # the result is as old as its last tier
+        result.checked_at = time.monotonic()
+        latencies = ", ".join(f"{k} {v:.3f}s" for k, v in result.latencies.items())
+        logger.info(f"Health check of {device}: {result.tier}, {latencies}")
+        return result
+
+    def _check_snmp(self) -> None:
+        with self._snmp_configurator.get_service() as snmp_service:
+            snmp_service.add_mib_folder_path(MIBS_FOLDER)
+            snmp_service.load_mib_tables(["PAN-COMMON-MIB"])
+            responses = snmp_service.get_list(
+                [ResolvedOid(x) for x in (SYS_UP_TIME, PAN_SYS_SW_VERSION)]
+            )
+        values = {x.mib_id: x.safe_value for x in responses}
+        if not all(
+            values.get(x.object_name) for x in (SYS_UP_TIME, PAN_SYS_SW_VERSION)
+        ):
+            raise Exception("Health check", f"Unexpected SNMP response {values}")
+
+    def _check_cli(self) -> None:
+        RunCommandFlow(self._cli_configurator).run_custom_command("")
+
+    @command_logging
+    def health_check(self) -> str:
+        """Verify that device is accessible, update the resource live status."""
+        r_name = self.resource_config.name
+        result = f"Health check on resource {r_name}"
+        if self.check_health().online:
+            api_response = "Online"
+            result += " passed."
+        else:
+            api_response = "Error"
+            result += " failed."
+
+        try:
+            self._api.SetResourceLiveStatus(r_name, api_response, result)
+        except Exception:
+            logger.error(f"Cannot update {r_name} resource status on portal")
+
+        return result
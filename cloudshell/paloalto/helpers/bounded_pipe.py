@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from threading import Condition
+
+
+class BoundedPipe:
+    """In-memory pipe between a writer thread and a reader thread.
+
+    Holds at most max_size bytes, the writer blocks until the reader
+    consumes the data. read(size) returns less than size bytes only at
+    the end of the stream, like a regular file.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024):
+        self.max_size = max_size
+        self.peak_size = 0
+        self._buffer = bytearray()
+        self._condition = Condition()
+        self._writer_closed = False
+        self._writer_error: BaseException | None = None
+        self._reader_closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._reader_closed
+
+    def write(self, data: bytes) -> int:
+        view = memoryview(data)
+        with self._condition:
+            while view:
+                self._condition.wait_for(
+                    lambda: self._reader_closed or len(self._buffer) < self.max_size
+                )
+                if self._reader_closed:
+                    raise BrokenPipeError("Reader side of the pipe is closed")
+                chunk_size = self.max_size - len(self._buffer)
+                self._buffer += view[:chunk_size]
+                view = view[chunk_size:]
+                self.peak_size = max(self.peak_size, len(self._buffer))
+                self._condition.notify_all()
+        return len(data)
+
+    def close_writer(self, error: BaseException | None = None) -> None:
+        """Finish the stream, the error is raised to the reader."""
+        with self._condition:
+            self._writer_closed = True
+            self._writer_error = error
+            self._condition.notify_all()
+
+    def read(self, size: int = -1) -> bytes:
+        with self._condition:
+            # a read bigger than the pipe can hold gets a full pipe
+            wait_size = min(size, self.max_size)
+            self._condition.wait_for(
+                lambda: self._writer_closed
+                or (size >= 0 and len(self._buffer) >= wait_size)
+            )
+            if self._writer_error is not None:
+                raise self._writer_error
+            if size < 0:
+                size = len(self._buffer)
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            self._condition.notify_all()
+            return data
+
+    def close(self) -> None:
+        """Close the reader side, pending and further writes fail."""
+        with self._condition:
+            self._reader_closed = True
+            self._buffer.clear()
+            self._condition.notify_all()
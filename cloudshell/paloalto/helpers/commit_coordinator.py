@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from threading import Condition, Event, Lock
+from typing import Any, ClassVar
+
+logger = logging.getLogger(__name__)
+
+
+class _CommitBatch:
+    """Flows waiting for the same commit."""
+
+    def __init__(self):
+        self.waiters = 1
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self._done = Event()
+
+    def finish(self, result: Any = None, error: BaseException | None = None) -> None:
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class CommitCoordinator:
+    """Coalesce commits of concurrent flows working with the same device.
+
+    PAN-OS admin sessions share the candidate config, so one commit applies
+    changes made by all of them. The first flow waits for the batch window
+    and for the running commit, then commits for every flow joined the batch.
+    Flows that come while the commit runs form the next batch.
+
+    Loading a config replaces the whole candidate config, changes of other
+    flows would be lost but reported as committed. Flows make their changes
+    and commit inside changes(), the load and its commit run inside
+    exclusive() that waits for them and keeps new ones out.
+    """
+
+    BATCH_WINDOW: ClassVar[float] = 0.5
+    # unused coordinators are dropped from the registry after this time
+    IDLE_TTL: ClassVar[float] = 600
+    _coordinators: ClassVar[dict[str, CommitCoordinator]] = {}
+    _registry_lock: ClassVar[Lock] = Lock()
+
+    def __init__(self, device: str, batch_window: float | None = None):
+        self.device = device
+        self.batch_window = self.BATCH_WINDOW if batch_window is None else batch_window
+        self.commits = 0
+        self._condition = Condition()
+        self._pending: _CommitBatch | None = None
+        self._committing = False
+        self._changing = 0
+        self._exclusive = False
+        self._used_at = time.monotonic()
+
+    @classmethod
+    def for_device(cls, device: str) -> CommitCoordinator:
+        """Get the coordinator shared by all flows of the process."""
+        with cls._registry_lock:
+            now = time.monotonic()
+            for key, coordinator in list(cls._coordinators.items()):
+                if key != device and coordinator._is_idle(now):
+                    del cls._coordinators[key]
+            if device not in cls._coordinators:
+                cls._coordinators[device] = cls(device)
+            coordinator = cls._coordinators[device]
+            coordinator._used_at = now
+            return coordinator
+
+    def _is_idle(self, now: float) -> bool:
+        with self._condition:
+            return (
+                now - self._used_at > self.IDLE_TTL
+                and self._pending is None
+                and not self._committing
+                and not self._changing
+                and not self._exclusive
+            )
+
+    @contextmanager
+    def changes(self) -> Iterator[None]:
+        """Make candidate changes and commit them, shared with other flows."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._exclusive)
+            self._changing += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._changing -= 1
+                self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Replace the candidate config and commit it without other flows.
+
+        Waits for flows making changes and for pending commits, commits
+        started meanwhile wait till the block ends.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._exclusive)
+            self._exclusive = True
+            self._condition.wait_for(
+                lambda: not self._changing
+                and self._pending is None
+                and not self._committing
+            )
+            self._committing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._committing = False
+                self._exclusive = False
+                self._used_at = time.monotonic()
+                self._condition.notify_all()
+
+    def commit(self, commit_func: Callable[[], Any]) -> Any:
+        """Commit changes made by the caller, the result is shared by the batch.
+
+        :param commit_func: commits the candidate config, runs only if the
+            caller starts the batch
+        """
+        with self._condition:
+            batch = self._pending
+            if batch is None:
+                batch = self._pending = _CommitBatch()
+                leader = True
+            else:
+                batch.waiters += 1
+                leader = False
+        if not leader:
+            logger.debug(f"Joined pending commit of {self.device}")
+            return batch.wait()
+
+        time.sleep(self.batch_window)
+        with self._condition:
+            self._condition.wait_for(lambda: not self._committing)
+            self._pending = None
+            self._committing = True
+
+        logger.info(f"Committing changes of {batch.waiters} flows on {self.device}")
+        try:
+            batch.finish(result=commit_func())
+        except Exception as e:
+            batch.finish(error=e)
+        finally:
+            with self._condition:
+                self._committing = False
+                self.commits += 1
+                self._condition.notify_all()
+        return batch.wait()
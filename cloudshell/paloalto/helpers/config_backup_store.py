@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from threading import Lock, get_ident
+from typing import ClassVar
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigBackupStore:
+    """Local content-addressed store of device configs.
+
+    Every version is stored once by its SHA-256 as a zlib compressed full
+    copy or a line delta against the previous version of the device. The
+    device index keeps the versions with the fingerprint of the running
+    config, so an unchanged config is recognized before it's exported.
+    """
+
+    # full copy is stored after this many deltas to limit restore time
+    MAX_DELTA_CHAIN: ClassVar[int] = 20
+    FULL: ClassVar[bytes] = b"F"
+    DELTA: ClassVar[bytes] = b"D"
+
+    def __init__(self, root_dir: str):
+        self.root_dir = os.path.abspath(root_dir)
+        self._lock = Lock()
+        os.makedirs(os.path.join(self.root_dir, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(self.root_dir, "devices"), exist_ok=True)
+
+    def _object_path(self, config_hash: str) -> str:
+        return os.path.join(self.root_dir, "objects", config_hash[:2], config_hash)
+
+    def _index_path(self, device: str) -> str:
+        name = re.sub(r"[^\w.-]", "_", device)
+        return os.path.join(self.root_dir, "devices", f"{name}.json")
+
+    def get_versions(self, device: str) -> list[dict]:
+        try:
+            with open(self._index_path(device)) as index_file:
+                return json.load(index_file)["versions"]
+        except FileNotFoundError:
+            return []
+
+    def find_version(self, device: str, fingerprint: str) -> dict | None:
+        """Get the last version if the running config didn't change since.
+
+        Versions without a fingerprint, e.g. startup configs, are skipped.
+        """
+        versions = [x for x in self.get_versions(device) if x.get("fingerprint")]
+        if versions and versions[-1]["fingerprint"] == fingerprint:
+            return versions[-1]
+        return None
+
+    def add(self, device: str, data: bytes, fingerprint: str | None = None) -> dict:
+        """Store new version of the device config.
+
+        :param fingerprint: hash of the running config the version was
+            exported from, None for configs that aren't the running one
+        """
+        config_hash = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            versions = self.get_versions(device)
+            if not os.path.exists(self._object_path(config_hash)):
+                base = versions[-1]["hash"] if versions else None
+                self._write_object(config_hash, data, base)
+            version = {
+                "hash": config_hash,
+                "fingerprint": fingerprint,
+                "saved_at": time.time(),
+                "size": len(data),
+            }
+            versions.append(version)
+            self._write_file(
+                self._index_path(device),
+                json.dumps({"versions": versions}, indent=1).encode(),
+            )
+        return version
+
+    def load(self, config_hash: str) -> bytes:
+        """Get the config, deltas are applied from the closest full copy."""
+        chain = []
+        while True:
+            kind, base, payload = self._read_object(config_hash)
+            if kind == self.FULL:
+                data = payload
+                break
+            chain.append(payload)
+            config_hash = base
+        for delta in reversed(chain):
+            data = self._apply_delta(data, delta)
+        return data
+
+    def export(self, config_hash: str, path: str) -> None:
+        self._write_file(path, self.load(config_hash))
+
+    def _write_object(self, config_hash: str, data: bytes, base: str | None) -> None:
+        content = zlib.compress(self.FULL + b"\n" + data)
+        if base and self._delta_chain_length(base) < self.MAX_DELTA_CHAIN:
+            delta = self._create_delta(self.load(base), data)
+            delta_content = zlib.compress(
+                self.DELTA + f" {base}\n".encode() + json.dumps(delta).encode()
+            )
+            if len(delta_content) < len(content):
+                content = delta_content
+        self._write_file(self._object_path(config_hash), content)
+
+    def _read_object(self, config_hash: str) -> tuple[bytes, str | None, object]:
+        with open(self._object_path(config_hash), "rb") as object_file:
+            header, _, payload = zlib.decompress(object_file.read()).partition(b"\n")
+        kind, _, base = header.partition(b" ")
+        if kind == self.DELTA:
+            return kind, base.decode(), json.loads(payload)
+        return kind, None, payload
+
+    def _delta_chain_length(self, config_hash: str) -> int:
+        length = 0
+        kind, base, _ = self._read_object(config_hash)
+        while kind == self.DELTA:
+            length += 1
+            kind, base, _ = self._read_object(base)
+        return length
+
+    @staticmethod
+    def _split_lines(data: bytes) -> list[str]:
+        return data.decode("utf-8", "surrogateescape").splitlines(keepends=True)
+
+    @classmethod
+    def _create_delta(cls, base: bytes, data: bytes) -> list:
+        """Copy ranges of base lines and inserted lines."""
+        base_lines = cls._split_lines(base)
+        lines = cls._split_lines(data)
+        matcher = difflib.SequenceMatcher(None, base_lines, lines)
+        delta = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                delta.append([i1, i2])
+            elif j2 > j1:
+                delta.append(lines[j1:j2])
+        return delta
+
+    @classmethod
+    def _apply_delta(cls, base: bytes, delta: list) -> bytes:
+        base_lines = cls._split_lines(base)
+        lines = []
+        for op in delta:
+            if op and isinstance(op[0], int):
+                lines.extend(base_lines[op[0] : op[1]])
+            else:
+                lines.extend(op)
+        return "".join(lines).encode("utf-8", "surrogateescape")
+
+    @staticmethod
+    def _write_file(path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        with open(tmp_path, "wb") as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import socket
+import tempfile
+from threading import Event, Lock, Thread
+
+import tftpy
+
+logger = logging.getLogger(__name__)
+
+
+class ExpectedTransfer:
+    """File the receiver waits for from a device."""
+
+    def __init__(self, device_host: str | None, file_name: str, target_path: str):
+        self.device_host = device_host
+        self.file_name = file_name
+        self.target_path = target_path
+        self.success = False
+        self._finished = Event()
+
+    @property
+    def part_path(self) -> str:
+        return f"{self.target_path}.part"
+
+    def finish(self, success: bool) -> None:
+        if success:
+            os.replace(self.part_path, self.target_path)
+        else:
+            try:
+                os.remove(self.part_path)
+            except OSError:
+                pass
+        self.success = success
+        self._finished.set()
+
+    def wait(self, timeout: float | None = None) -> None:
+        if not self._finished.wait(timeout):
+            raise Exception(
+                "Local TFTP receiver",
+                f"File {self.file_name} wasn't received in {timeout} seconds",
+            )
+        if not self.success:
+            raise Exception(
+                "Local TFTP receiver", f"Failed to receive file {self.file_name}"
+            )
+
+
+class _ReceivedFile:
+    """File object given to the tftpy server, completes the transfer on close."""
+
+    def __init__(self, transfer: ExpectedTransfer, context):
+        self._transfer = transfer
+        self._context = context
+        self._file = open(transfer.part_path, "wb")
+        self.name = transfer.part_path
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def write(self, data: bytes) -> int:
+        return self._file.write(data)
+
+    def close(self) -> None:
+        self._file.close()
+        # server context has no state only after the last packet was received
+        self._transfer.finish(success=self._context.state is None)
+
+
+class LocalTftpReceiver:
+    """TFTP server hosted by the driver process that receives device exports.
+
+    Only expected files are accepted, every device upload is written
+    directly to its target path, so many devices can export files with
+    the same name at the same time. Read requests are rejected, the server
+    root is an empty folder of its own, so no local files are served.
+    """
+
+    def __init__(
+        self,
+        listen_ip: str | None = None,
+        listen_port: int = 0,
+        host: str | None = None,
+        root_dir: str | None = None,
+    ):
+        """Init the receiver.
+
+        :param listen_ip: address to listen on, the host by default
+        :param host: address of the receiver reachable from devices, the
+            management interface of the driver host
+        :param root_dir: folder served as tftp://host/, None if TFTP URLs
+            of the host are not stored by the receiver
+        """
+        if not (listen_ip or host):
+            raise Exception(
+                "Local TFTP receiver", "Listen address or host has to be set"
+            )
+        self._listen_ip = listen_ip or host
+        self._listen_port = listen_port
+        self.host = host or listen_ip
+        self.root_dir = root_dir and os.path.abspath(root_dir)
+        self._server_root: str | None = None
+        self._server: tftpy.TftpServer | None = None
+        self._thread: Thread | None = None
+        self._lock = Lock()
+        self._expected: dict[tuple[str | None, str], ExpectedTransfer] = {}
+
+    @property
+    def port(self) -> int:
+        return self._server.listenport
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None and self._server.is_running.is_set()
+
+    def start(self, timeout: float = 10) -> None:
+        if self.root_dir:
+            os.makedirs(self.root_dir, exist_ok=True)
+        # uploads use _upload_open, the server root stays empty
+        self._server_root = tempfile.mkdtemp(prefix="panos-tftp-")
+        self._server = tftpy.TftpServer(
+            self._server_root,
+            dyn_file_func=self._reject_read,
+            upload_open=self._upload_open,
+        )
+        self._thread = Thread(
+            target=self._server.listen,
+            args=(self._listen_ip, self._listen_port),
+            name="LocalTftpReceiver",
+            daemon=True,
+        )
+        self._thread.start()
+        if not self._server.is_running.wait(timeout):
+            raise Exception("Local TFTP receiver", "Failed to start TFTP server")
+
+    def stop(self, timeout: float = 10) -> None:
+        if self._server:
+            # graceful mode discards the wake up packet, the next loop
+            # iteration closes the server without waiting for select timeout
+            self._server.stop(now=False)
+            self._server.stop(now=True)
+            self._wake_up_server()
+            self._thread.join(timeout)
+            self._server = self._thread = None
+        if self._server_root:
+            shutil.rmtree(self._server_root, ignore_errors=True)
+            self._server_root = None
+
+    def _wake_up_server(self) -> None:
+        host = "127.0.0.1" if self._listen_ip == "0.0.0.0" else self._listen_ip
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.sendto(b"", (host, self.port))
+        except OSError:
+            logger.debug("Unable to wake up TFTP server", exc_info=True)
+
+    def __enter__(self) -> LocalTftpReceiver:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def get_local_path(self, remote_path: str) -> str:
+        """Get local path of the file for the path from tftp://host/ URL."""
+        if not self.root_dir:
+            raise Exception("Local TFTP receiver", "TFTP root folder is not set")
+        path = os.path.normpath(os.path.join(self.root_dir, remote_path.lstrip("/")))
+        if os.path.commonpath([self.root_dir, path]) != self.root_dir:
+            raise Exception(
+                "Local TFTP receiver", f"Path {remote_path} is outside root"
+            )
+        return path
+
+    def expect(
+        self, file_name: str, target_path: str, device_host: str | None = None
+    ) -> ExpectedTransfer:
+        """Accept file from the device and store it to the target path.
+
+        :param device_host: address the device sends from, any if None
+        """
+        transfer = ExpectedTransfer(device_host, file_name, target_path)
+        with self._lock:
+            key = (device_host, file_name)
+            if key in self._expected:
+                raise Exception(
+                    "Local TFTP receiver",
+                    f"File {file_name} from {device_host} is already expected",
+                )
+            self._expected[key] = transfer
+        return transfer
+
+    def cancel(self, transfer: ExpectedTransfer) -> None:
+        with self._lock:
+            key = (transfer.device_host, transfer.file_name)
+            if self._expected.get(key) is transfer:
+                del self._expected[key]
+
+    @staticmethod
+    def _reject_read(file_name: str, raddress: str, rport: int) -> None:
+        # None is answered with the file not found error
+        logger.warning(f"Rejected read of {file_name} from {raddress}")
+        return None
+
+    def _upload_open(self, path: str, context) -> _ReceivedFile | None:
+        file_name = os.path.basename(path)
+        with self._lock:
+            transfer = self._expected.pop((context.host, file_name), None)
+            if transfer is None:
+                transfer = self._expected.pop((None, file_name), None)
+        if transfer is None:
+            logger.warning(f"Rejected unexpected file {file_name} from {context.host}")
+            return None
+        try:
+            os.makedirs(os.path.dirname(transfer.target_path) or ".", exist_ok=True)
+            return _ReceivedFile(transfer, context)
+        except OSError:
+            logger.exception(f"Unable to store {file_name} to {transfer.target_path}")
+            transfer.finish(success=False)
+            return None
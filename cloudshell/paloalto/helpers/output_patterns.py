@@ -0,0 +1,108 @@
+"""Compiled patterns for PanOS command output checks and prompts."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# prompt is the end of the output, it's searched only in the tail
+PROMPT_TAIL_SIZE = 4096
+_TAIL_PROMPTS: set[str] = set()
+
+_compile = lru_cache(maxsize=512)(re.compile)
+
+
+class OutputPattern:
+    """Regex checked against the command output.
+
+    Placeholders like {filename} are replaced with escaped values, regex
+    braces of such patterns are doubled. Patterns are compiled once for
+    every set of values.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+
+    def compile(self, **values) -> re.Pattern:
+        pattern = self.pattern
+        if values:
+            pattern = pattern.format(
+                **{key: re.escape(str(value)) for key, value in values.items()}
+            )
+        return _compile(pattern, self.flags)
+
+    def search(self, output: str, **values) -> re.Match | None:
+        return self.compile(**values).search(output)
+
+
+def register_prompt(prompt: str) -> str:
+    """Register the end anchored prompt pattern, it's matched on the tail."""
+    _TAIL_PROMPTS.add(prompt)
+    _get_prompt_matcher.cache_clear()
+    return prompt
+
+
+@lru_cache(maxsize=256)
+def _get_prompt_matcher(prompt: str) -> tuple[re.Pattern, bool]:
+    tail = all(x in _TAIL_PROMPTS for x in prompt.split("|"))
+    return re.compile(prompt, re.DOTALL), tail
+
+
+def match_prompt(prompt: str, output: str) -> bool:
+    """Match expected string like the CLI session does.
+
+    Registered prompts and their alternatives are searched only in the end
+    of the output, so the cost doesn't grow with the output read so far.
+    """
+    pattern, tail = _get_prompt_matcher(prompt)
+    if tail:
+        output = output[-PROMPT_TAIL_SIZE:]
+    return pattern.search(output) is not None
+
+
+CONFIG_SAVED = OutputPattern(r"Config saved to {filename}", re.IGNORECASE)
+CONFIG_LOADED = OutputPattern(r"Config loaded from {filename}", re.IGNORECASE)
+NO_PENDING_CHANGES = OutputPattern(r"^\s*no\s*$", re.IGNORECASE | re.MULTILINE)
+COMMIT_JOB_STARTED = OutputPattern(r"[Cc]ommit job (?P<job_id>\d+) is in progress")
+NO_CHANGES_TO_COMMIT = OutputPattern(r"[Tt]here are no changes to commit")
+CONFIG_COMMAND_ERROR = OutputPattern(
+    r"^\s*(?:Invalid syntax|Unknown command|Server error|Validation Error|Error)\b.*$",
+    re.MULTILINE,
+)
+SESSION_SETUP_ERROR = OutputPattern(
+    r"^\s*(?:Invalid syntax|Unknown command|Server error)\b", re.MULTILINE
+)
+TFTP_RECEIVED = OutputPattern(
+    r"Received (?P<size>\d+) bytes in -?\d+\.\d+ seconds", re.IGNORECASE
+)
+TFTP_SENT = OutputPattern(r"Sent \d+ bytes in -?\d+\.\d+ seconds", re.IGNORECASE)
+SCP_IMPORTED = OutputPattern(r"{filename} saved", re.IGNORECASE)
+SCP_EXPORTED = OutputPattern(r"{filename}\s+100%", re.IGNORECASE)
+SNMP_SERVICE_STATE = OutputPattern(
+    r"^\s*SNMP\s*:\s*(?P<state>\w+)", re.IGNORECASE | re.MULTILINE
+)
+JOB_LINE = OutputPattern(
+    r"^\s*\d{4}/\d\d/\d\d\s+\d\d:\d\d:\d\d\s+(?:\S+\s+)*?"
+    r"(?P<job_id>\d+)\s+(?:\d+\s+)?(?P<job_type>[\w-]+)\s+"
+    r"(?P<status>ACT|FIN|PEND)\s+(?P<result>OK|FAIL|PEND)\s*(?P<completed>\S*)",
+    re.MULTILINE,
+)
+SYSTEM_INFO = OutputPattern(r"^\s*sw-version:\s*\S+", re.MULTILINE)
+# image list rows end with yes/no columns like Downloaded, Currently Installed
+SOFTWARE_INFO_LINE = OutputPattern(
+    r"^\s*(?P<version>\d+\.\d+\.\d+(?:-[\w.]+)?)\s+(?P<columns>.*?)\s*$",
+    re.MULTILINE,
+)
+# version in the image file name like PanOS_vm-10.1.3-h1
+SOFTWARE_FILE_VERSION = OutputPattern(r"(?P<version>\d+\.\d+\.\d+(?:-h\d+)?)$")
+SOFTWARE_INSTALL_JOB = OutputPattern(
+    r"[Ss]oftware install job enqueued with jobid (?P<job_id>\d+)"
+)
+JOB_PROGRESS = OutputPattern(r"^(?P<progress>\d+)%$")
+# prompt line without the end of line, separates it from partial output lines
+PROMPT_LINE = OutputPattern(r"^[^\s<>\"']+[>#]\s*$")
+# echo of a pasted command, the first one follows the prompt read before
+COMMAND_ECHO = OutputPattern(
+    r"(?:\A|^[^\s<>\"']+[>#])[ \t]*{command}[ \t]*$", re.MULTILINE
+)
+CONFIG_PATH_LINE = OutputPattern(r"^\s*\[edit[^\]]*\]\s*$")
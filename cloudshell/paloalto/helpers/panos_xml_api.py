@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import http.client
+import logging
+import os
+import ssl
+import uuid
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+from queue import Empty, Full, LifoQueue
+from threading import Lock, get_ident
+from typing import ClassVar
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class PanOSXmlApiClient:
+    """PanOS XML API over kept-alive HTTPS connections.
+
+    Config files are streamed between the device and local files, without
+    CLI sessions and transfers started by the device. Connections are
+    reused by the following requests, the API key is requested once and
+    renewed if the device rejects it. The API key is requested with the
+    admin credentials, so certificates are verified; pass the CA of a
+    self-signed management certificate in ca_file, verify_ssl=False
+    turns the check off.
+    """
+
+    CHUNK_SIZE: ClassVar[int] = 64 * 1024
+    MAX_IDLE_CONNECTIONS: ClassVar[int] = 4
+    TIMEOUT: ClassVar[float] = 60
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        port: int | None = None,
+        use_https: bool = True,
+        verify_ssl: bool = True,
+        ca_file: str | None = None,
+        timeout: float | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.use_https = use_https
+        self.timeout = timeout or self.TIMEOUT
+        self._username = username
+        self._password = password
+        self._ssl_context = ssl.create_default_context(cafile=ca_file)
+        if not verify_ssl:
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+        self._idle: LifoQueue[http.client.HTTPConnection] = LifoQueue(
+            self.MAX_IDLE_CONNECTIONS
+        )
+        self._key: str | None = None
+        self._key_lock = Lock()
+        self.connections_created = 0
+
+    def _create_connection(self) -> http.client.HTTPConnection:
+        self.connections_created += 1
+        if self.use_https:
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def _request(
+        self,
+        method: str,
+        params: dict[str, str],
+        body: bytes | Callable[[], Iterable[bytes]] | None = None,
+        headers: dict[str, str] | None = None,
+        keyed: bool = True,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send the request, the connection is reused if the body is read.
+
+        The device may close an idle connection, then the request is sent
+        again on a new one. A rejected API key is renewed and the request
+        is sent once more.
+        """
+        url = f"/api/?{urlencode(params)}"
+        headers = dict(headers or {})
+        if keyed:
+            headers["X-PAN-KEY"] = self._get_key()
+        try:
+            conn = self._idle.get_nowait()
+            reused = True
+        except Empty:
+            conn = self._create_connection()
+            reused = False
+        try:
+            try:
+                response = self._send(conn, method, url, body, headers)
+            except (ConnectionError, http.client.RemoteDisconnected):
+                if not reused:
+                    raise
+                logger.debug("Idle XML API connection is closed, reconnecting")
+                conn.close()
+                conn = self._create_connection()
+                response = self._send(conn, method, url, body, headers)
+            if keyed and response.status == HTTPStatus.FORBIDDEN:
+                logger.info("XML API key is rejected, requesting a new one")
+                response.read()
+                headers["X-PAN-KEY"] = self._renew_key(headers["X-PAN-KEY"])
+                response = self._send(conn, method, url, body, headers)
+            yield response
+        except Exception:
+            conn.close()
+            raise
+        if response.isclosed() and not response.will_close:
+            try:
+                self._idle.put_nowait(conn)
+                return
+            except Full:
+                pass
+        conn.close()
+
+    @staticmethod
+    def _send(
+        conn: http.client.HTTPConnection,
+        method: str,
+        url: str,
+        body: bytes | Callable[[], Iterable[bytes]] | None,
+        headers: dict[str, str],
+    ) -> http.client.HTTPResponse:
+        conn.request(method, url, body() if callable(body) else body, headers)
+        return conn.getresponse()
+
+    def _call(self, method: str, params: dict[str, str], **kwargs) -> ET.Element:
+        with self._request(method, params, **kwargs) as response:
+            data = response.read()
+        return self._parse_response(data, response.status)
+
+    @staticmethod
+    def _parse_response(data: bytes, status: int) -> ET.Element:
+        try:
+            root = ET.fromstring(data)
+        except ET.ParseError:
+            raise Exception("XML API", f"Unexpected response, HTTP {status}")
+        if root.get("status") != "success":
+            msg = " ".join(x.strip() for x in root.itertext() if x.strip())
+            raise Exception("XML API", f"Request failed, HTTP {status}: {msg}")
+        return root
+
+    def _get_key(self) -> str:
+        with self._key_lock:
+            if not self._key:
+                body = urlencode(
+                    {"user": self._username, "password": self._password}
+                ).encode()
+                root = self._call(
+                    "POST",
+                    {"type": "keygen"},
+                    body=body,
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    keyed=False,
+                )
+                self._key = root.findtext("result/key")
+                if not self._key:
+                    raise Exception("XML API", "API key isn't found in the response")
+            return self._key
+
+    def _renew_key(self, rejected_key: str) -> str:
+        with self._key_lock:
+            if self._key == rejected_key:
+                self._key = None
+        return self._get_key()
+
+    def export_running_config(self, path: str) -> int:
+        """Stream the running config to the local file, return its size."""
+        params = {"type": "export", "category": "configuration"}
+        tmp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        size = 0
+        try:
+            with self._request("GET", params) as response:
+                with open(tmp_path, "wb") as config_file:
+                    while chunk := response.read(self.CHUNK_SIZE):
+                        if size == 0 and chunk.lstrip().startswith(b"<response"):
+                            # errors are returned instead of the config
+                            self._parse_response(
+                                chunk + response.read(), response.status
+                            )
+                        config_file.write(chunk)
+                        size += len(chunk)
+            if response.status != 200:
+                raise Exception(
+                    "XML API", f"Export configuration failed, HTTP {response.status}"
+                )
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        logger.info(f"Exported running config, {size} bytes")
+        return size
+
+    def import_config(self, path: str, filename: str | None = None) -> None:
+        """Upload the local file as the named config on the device."""
+        filename = filename or os.path.basename(path)
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: application/xml\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        headers = {
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(head) + os.path.getsize(path) + len(tail)),
+        }
+
+        def body() -> Iterator[bytes]:
+            yield head
+            with open(path, "rb") as config_file:
+                while chunk := config_file.read(self.CHUNK_SIZE):
+                    yield chunk
+            yield tail
+
+        self._call(
+            "POST",
+            {"type": "import", "category": "configuration"},
+            body=body,
+            headers=headers,
+        )
+        logger.info(f"Imported config {filename}")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                break
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import random
+import socket
+import time
+from collections.abc import Callable, Iterator
+from typing import ClassVar
+
+from attrs import define
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class ReloadTimings:
+    """Seconds spent in every phase of the device reload."""
+
+    # from the restart command till the management port is closed
+    down: float = 0.0
+    # till the port accepts connections and sends the banner
+    booting: float = 0.0
+    # till the management plane answers CLI commands
+    management_ready: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.down + self.booting + self.management_ready
+
+
+class ReadinessProber:
+    """Cheap TCP probes of the device management port.
+
+    Connecting is enough for Telnet, for SSH the server banner is expected
+    as the port is opened early during the boot. Probes are repeated with
+    exponential backoff and jitter.
+    """
+
+    INITIAL_INTERVAL: ClassVar[float] = 1
+    MAX_INTERVAL: ClassVar[float] = 15
+    JITTER: ClassVar[float] = 0.2
+    PROBE_TIMEOUT: ClassVar[float] = 5
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        banner: bytes | None = None,
+        initial_interval: float | None = None,
+        max_interval: float | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.banner = banner
+        self.initial_interval = initial_interval or self.INITIAL_INTERVAL
+        self.max_interval = max_interval or self.MAX_INTERVAL
+
+    def intervals(self, backoff: bool = True) -> Iterator[float]:
+        interval = self.initial_interval
+        while True:
+            yield interval * random.uniform(1 - self.JITTER, 1 + self.JITTER)
+            if backoff:
+                interval = min(interval * 2, self.max_interval)
+
+    def probe(self) -> bool:
+        """Check that the port accepts connections and sends the banner."""
+        try:
+            with socket.create_connection(
+                (self.host, self.port), timeout=self.PROBE_TIMEOUT
+            ) as sock:
+                if not self.banner:
+                    return True
+                data = b""
+                while len(data) < len(self.banner):
+                    chunk = sock.recv(256)
+                    if not chunk:
+                        break
+                    data += chunk
+                return data.startswith(self.banner)
+        except OSError:
+            return False
+
+    def wait_for(
+        self, check: Callable[[], bool], timeout: float, backoff: bool = True
+    ) -> bool:
+        """Repeat the check till it passes, False if the timeout is over."""
+        deadline = time.monotonic() + timeout
+        for interval in self.intervals(backoff):
+            if check():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+
+    def wait_down(self, timeout: float) -> bool:
+        # the device goes down soon after the restart, no backoff needed
+        return self.wait_for(lambda: not self.probe(), timeout, backoff=False)
+
+    def wait_up(self, timeout: float) -> bool:
+        return self.wait_for(self.probe, timeout)
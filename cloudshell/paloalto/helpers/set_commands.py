@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import shlex
+from collections.abc import Iterable, Iterator
+
+
+def iter_set_commands(
+    lines: Iterable[str], prefix: str = ""
+) -> Iterator[tuple[str, ...]]:
+    """Tokenize config lines shown in 'set' output format one by one.
+
+    Only commands starting with the prefix are returned, without the prefix,
+    quoted values are unquoted.
+    """
+    prefix_tokens = tuple(shlex.split(f"set {prefix}"))
+    for line in lines:
+        line = line.strip()
+        if not line.startswith("set "):
+            continue
+        try:
+            tokens = tuple(shlex.split(line))
+        except ValueError:
+            continue
+        if tokens[: len(prefix_tokens)] == prefix_tokens:
+            yield tokens[len(prefix_tokens) :]
+
+
+def parse_set_commands(output: str, prefix: str = "") -> set[tuple[str, ...]]:
+    """Parse config shown in 'set' output format into tokenized set commands."""
+    return set(iter_set_commands(output.splitlines(), prefix))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import socket
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, ClassVar
+
+import tftpy
+from attrs import define
+from tftpy.TftpPacketFactory import TftpPacketFactory
+from tftpy.TftpPacketTypes import TftpPacketERR, TftpPacketOACK, TftpPacketRRQ
+
+from cloudshell.shell.flows.utils.url import BasicLocalUrl
+
+if TYPE_CHECKING:
+    from typing import Union
+
+    from cloudshell.shell.flows.utils.url import RemoteURL
+
+    from .local_tftp_receiver import LocalTftpReceiver
+
+    Url = Union[RemoteURL, BasicLocalUrl]
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class TransferDigest:
+    size: int
+    sha256: str | None = None
+
+
+class _HashWriter:
+    """File-like sink hashing the TFTP download instead of saving it."""
+
+    def __init__(self):
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        pass
+
+
+class TransferVerifier:
+    """Check files imported to the device against their source.
+
+    PanOS reports only the size of imported files. It's compared with the
+    source size taken from the local TFTP receiver folder or asked from the
+    TFTP server with the tsize option, the file isn't downloaded again.
+    The source is hashed only if an expected checksum is given. Verified
+    digests are cached by the file name and size.
+    """
+
+    CHUNK_SIZE: ClassVar[int] = 1024 * 1024
+    CACHE_SIZE: ClassVar[int] = 256
+    TFTP_TIMEOUT: ClassVar[int] = 5
+
+    def __init__(self, local_receiver: LocalTftpReceiver | None = None):
+        self.local_receiver = local_receiver
+        self._cache: OrderedDict[tuple[str, int], TransferDigest] = OrderedDict()
+        self._lock = Lock()
+
+    def verify(
+        self, url: Url, received_size: int, expected_sha256: str | None = None
+    ) -> TransferDigest | None:
+        """Raise if the device received other content than the source has.
+
+        :param received_size: bytes received by the device
+        :param expected_sha256: published checksum of the file, the source
+            is hashed only if it's set
+        """
+        key = (url.filename, received_size)
+        with self._lock:
+            digest = self._cache.get(key)
+            if digest:
+                self._cache.move_to_end(key)
+        if expected_sha256 and not (digest and digest.sha256):
+            digest = self.get_digest(url)
+        elif not digest:
+            size = self.get_size(url)
+            if size is None:
+                logger.warning(f"Unable to get size of {url.filename}, not verified")
+                return None
+            digest = TransferDigest(size)
+        if digest.size != received_size:
+            raise Exception(
+                "Verify transfer",
+                f"Device received {received_size} bytes of {url.filename}, "
+                f"source file has {digest.size} bytes",
+            )
+        if expected_sha256 and digest.sha256 != expected_sha256.lower():
+            raise Exception(
+                "Verify transfer",
+                f"Checksum of {url.filename} {digest.sha256} doesn't match "
+                f"the expected {expected_sha256}",
+            )
+        with self._lock:
+            self._cache[key] = digest
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        logger.info(
+            f"Verified {url.filename}, {received_size} bytes {digest.sha256 or ''}"
+        )
+        return digest
+
+    def get_size(self, url: Url) -> int | None:
+        """Get size of the source file without reading it."""
+        local_path = self._get_local_path(url)
+        if local_path:
+            return os.path.getsize(local_path)
+        if url.scheme.lower() == "tftp":
+            return self._get_tftp_size(url)
+        raise Exception(
+            "Verify transfer", f"Unable to read {url.scheme} source {url.filename}"
+        )
+
+    def get_digest(self, url: Url) -> TransferDigest:
+        """Hash the source file without loading it into memory."""
+        local_path = self._get_local_path(url)
+        if local_path:
+            return self._hash_file(local_path)
+        if url.scheme.lower() == "tftp":
+            writer = _HashWriter()
+            tftp = tftpy.TftpClient(
+                host=url.host, port=int(url.port or 69), flock=False
+            )
+            tftp.download(filename=url.path, output=writer)
+            return TransferDigest(writer.size, writer.hash.hexdigest())
+        raise Exception(
+            "Verify transfer", f"Unable to read {url.scheme} source {url.filename}"
+        )
+
+    def _get_tftp_size(self, url: Url) -> int | None:
+        """Ask the TFTP server for the file size (RFC 2349) and abort the read.
+
+        Returns None if the server doesn't support the tsize option.
+        """
+        request = TftpPacketRRQ()
+        request.filename = url.path
+        request.mode = "octet"
+        request.options = {"tsize": "0"}
+        abort = TftpPacketERR()
+        abort.errorcode = 8  # failed to negotiate options
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.TFTP_TIMEOUT)
+            sock.sendto(request.encode().buffer, (url.host, int(url.port or 69)))
+            try:
+                buffer, address = sock.recvfrom(65536)
+            except socket.timeout:
+                raise Exception(
+                    "Verify transfer", f"TFTP server {url.host} doesn't respond"
+                )
+            packet = TftpPacketFactory().parse(buffer)
+            if isinstance(packet, TftpPacketERR):
+                raise Exception(
+                    "Verify transfer",
+                    f"Unable to read {url.filename}, TFTP error {packet.errorcode}",
+                )
+            sock.sendto(abort.encode().buffer, address)
+        if isinstance(packet, TftpPacketOACK) and "tsize" in packet.options:
+            return int(packet.options["tsize"])
+        return None
+
+    def _get_local_path(self, url: Url) -> str | None:
+        if isinstance(url, BasicLocalUrl):
+            return url.url
+        if (
+            self.local_receiver
+            and self.local_receiver.root_dir
+            and url.scheme.lower() == "tftp"
+            and url.host == self.local_receiver.host
+        ):
+            return self.local_receiver.get_local_path(url.path)
+        return None
+
+    def _hash_file(self, path: str) -> TransferDigest:
+        file_hash = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as source:
+            while chunk := source.read(self.CHUNK_SIZE):
+                file_hash.update(chunk)
+                size += len(chunk)
+        return TransferDigest(size, file_hash.hexdigest())
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import re
+import socket
+from bisect import bisect_left
+from threading import Event, Thread
+from unittest.mock import Mock
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api, rfc1902
+
+from cloudshell.shell.standards.autoload_generic_models import (
+    GenericChassis,
+    GenericModule,
+    GenericPort,
+    GenericPortChannel,
+    GenericPowerPort,
+    GenericResourceModel,
+    GenericSubModule,
+)
+from cloudshell.snmp.core.domain.snmp_response import SnmpResponse
+from cloudshell.snmp.core.snmp_engine import QualiSnmpEngine
+from cloudshell.snmp.core.snmp_msg_pdu_dsp import QualiMsgAndPduDispatcher
+from cloudshell.snmp.core.snmp_service import SnmpService
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+SNMPWALK_LINE_PATTERN = re.compile(
+    r"^\.?(?P<oid>[\d.]+)\s*=\s*(?:(?P<type>[\w-]+):\s*)?(?P<value>.*)$"
+)
+
+
+def _convert_value(value_type: str | None, value: str):
+    value = value.strip()
+    if value_type in (None, "STRING"):
+        return rfc1902.OctetString(value.strip('"'))
+    if value_type == "Hex-STRING":
+        return rfc1902.OctetString(hexValue=value.replace(" ", ""))
+    if value_type == "OID":
+        return rfc1902.ObjectIdentifier(value.lstrip("."))
+    if value_type == "INTEGER":
+        return rfc1902.Integer32(int(re.sub(r"^\D*\((\d+)\)$", r"\1", value)))
+    if value_type == "Timeticks":
+        return rfc1902.TimeTicks(int(value.strip("()").split(")")[0]))
+    if value_type == "Gauge32":
+        return rfc1902.Gauge32(int(value))
+    if value_type == "Counter32":
+        return rfc1902.Counter32(int(value))
+    if value_type == "Counter64":
+        return rfc1902.Counter64(int(value))
+    if value_type == "IpAddress":
+        return rfc1902.IpAddress(value)
+    raise ValueError(f"Unsupported snmpwalk value type {value_type}")
+
+
+def read_snmpwalk(path: str) -> dict[str, object]:
+    """Read output of 'snmpwalk -On -Oe -Ot' recorded into a file (or .gz)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    records = {}
+    with opener(path, "rt") as snmpwalk_file:
+        for line in snmpwalk_file:
+            match = SNMPWALK_LINE_PATTERN.match(line.strip())
+            if match:
+                records[match.group("oid")] = _convert_value(
+                    match.group("type"), match.group("value")
+                )
+    return records
+
+
+class FakeSnmpService(SnmpService):
+    """SnmpService replaying recorded snmpwalk instead of talking to a device.
+
+    Uses the real snmp engine so oids and values are translated with mibs,
+    only requests to the device are replaced. Every request is counted
+    as a round trip.
+    """
+
+    def __init__(self, records: dict[str, object], logger=None):
+        logger = logger or logging.getLogger(__name__)
+        snmp_engine = QualiSnmpEngine(logger, msg_pdu_dsp=QualiMsgAndPduDispatcher())
+        super().__init__(snmp_engine, None, None, logger)
+        self.records = records
+        self.round_trips = 0
+        self._sorted_oids = sorted(
+            (tuple(int(x) for x in oid.split(".")), oid) for oid in records
+        )
+
+    @classmethod
+    def from_snmpwalk(cls, path: str, logger=None) -> FakeSnmpService:
+        return cls(read_snmpwalk(path), logger)
+
+    def _response(self, oid: str) -> SnmpResponse:
+        return SnmpResponse(
+            oid, self.records[oid], snmp_engine=self._snmp_engine, logger=self._logger
+        )
+
+    def get(self, snmp_oid):
+        self.round_trips += 1
+        oid = str(snmp_oid.get_oid(self._snmp_engine))
+        if oid in self.records:
+            return self._response(oid)
+
+    def get_list(self, snmp_oid_list):
+        self.round_trips += 1
+        result = []
+        for snmp_oid in snmp_oid_list:
+            if hasattr(snmp_oid, "index") and not snmp_oid.index:
+                snmp_oid.index = 0
+            oid = str(snmp_oid.get_oid(self._snmp_engine))
+            if oid in self.records:
+                result.append(self._response(oid))
+        return result
+
+    def _walk(self, snmp_oid_obj, stop_oid=None, get_subtree=True, **kwargs):
+        self.round_trips += 1
+        start_oid = tuple(
+            int(x) for x in str(snmp_oid_obj.get_oid(self._snmp_engine)).split(".")
+        )
+        result = []
+        position = bisect_left(self._sorted_oids, (start_oid,))
+        for oid_tuple, oid in self._sorted_oids[position:]:
+            if oid_tuple[: len(start_oid)] != start_oid:
+                break
+            result.append(self._response(oid))
+        return result
+
+
+class UdpSnmpAgent:
+    """SNMPv2c agent on a local UDP port answering GET from the records.
+
+    Requests with more than max_var_binds var-binds are answered with
+    tooBig like agents limited by the PDU size. A dead agent counts the
+    requests without answering them.
+    """
+
+    def __init__(
+        self,
+        records: dict[str, object],
+        max_var_binds: int | None = None,
+        dead: bool = False,
+    ):
+        self.records = records
+        self.max_var_binds = max_var_binds
+        self.dead = dead
+        self.requests = 0
+        self._proto = api.protoModules[api.protoVersion2c]
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.settimeout(0.1)
+        self.port = self._sock.getsockname()[1]
+        self._stopped = Event()
+        self._thread = Thread(target=self._serve, daemon=True)
+
+    def __enter__(self) -> UdpSnmpAgent:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+        self._sock.close()
+
+    def _serve(self):
+        proto = self._proto
+        while not self._stopped.is_set():
+            try:
+                data, address = self._sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            self.requests += 1
+            if self.dead:
+                continue
+            message, _ = decoder.decode(data, asn1Spec=proto.Message())
+            response_message = proto.apiMessage.getResponse(message)
+            response = proto.apiMessage.getPDU(response_message)
+            var_binds = proto.apiPDU.getVarBinds(proto.apiMessage.getPDU(message))
+            if self.max_var_binds is not None and len(var_binds) > self.max_var_binds:
+                proto.apiPDU.setErrorStatus(response, 1)
+                proto.apiPDU.setVarBinds(response, var_binds)
+            else:
+                proto.apiPDU.setVarBinds(
+                    response,
+                    [
+                        (oid, self.records.get(str(oid), proto.NoSuchInstance()))
+                        for oid, _ in var_binds
+                    ],
+                )
+            self._sock.sendto(encoder.encode(response_message), address)
+
+
+class FirewallEntities:
+    Chassis = GenericChassis
+    Module = GenericModule
+    SubModule = GenericSubModule
+    Port = GenericPort
+    PortChannel = GenericPortChannel
+    PowerPort = GenericPowerPort
+
+
+class FirewallResourceModel(GenericResourceModel):
+    SUPPORTED_FAMILY_NAMES = ["CS_Firewall"]
+
+    @property
+    def entities(self):
+        return FirewallEntities
+
+
+def create_resource_model(name: str = "PanOS Firewall") -> FirewallResourceModel:
+    """Create resource model of not yet autoloaded resource."""
+    api = Mock()
+    api.GetResourceDetails.return_value.ChildResources = []
+    return FirewallResourceModel(name, "PanOS Shell", "CS_Firewall", api)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+from unittest import TestCase
+
+from cloudshell.paloalto.autoload.panos_generic_snmp_autoload import (
+    PanOSGenericSNMPAutoload,
+)
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    create_resource_model,
+    read_snmpwalk,
+)
+
+
+class TestPanOSGenericSNMPAutoload(TestCase):
+    def test_discover_recorded_device(self):
+        records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-3220.snmpwalk"))
+        resource_model = create_resource_model()
+        autoload = PanOSGenericSNMPAutoload(FakeSnmpService(records), resource_model)
+
+        details = autoload.discover(["Palo Alto"])
+
+        names = {x.name for x in details.resources}
+        self.assertEqual(resource_model.model_name, "PA-3220")
+        self.assertEqual(resource_model.os_version, "10.2.4")
+        self.assertIn("ethernet1-20", names)
+        self.assertIn("ae4", names)
+        self.assertEqual(len(details.resources), 227)
+
+    def test_read_compressed_snmpwalk(self):
+        records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-7080.snmpwalk.gz"))
+
+        self.assertEqual(str(records["1.3.6.1.2.1.1.5.0"]), "pa-7080-fw01")
+        self.assertEqual(int(records["1.3.6.1.2.1.2.1.0"]), 5251)
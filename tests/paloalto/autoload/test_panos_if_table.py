@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import gc
+import os
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.snmp.autoload.constants.port_constants import PORT_DESCR_NAME, PORT_NAME
+
+from cloudshell.paloalto.autoload.panos_generic_snmp_autoload import (
+    PanOSGenericSNMPAutoload,
+)
+from cloudshell.paloalto.autoload.panos_if_table import PANOSIfTable, PANOSSnmpIfEntity
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    create_resource_model,
+    read_snmpwalk,
+)
+
+
+def _value(value):
+    return Mock(safe_value=value)
+
+
+class TestPANOSSnmpIfEntity(TestCase):
+    def test_port_name(self):
+        entity = PANOSSnmpIfEntity(
+            "1", {PORT_NAME.object_name: _value("node1:ethernet1/1:1")}
+        )
+        self.assertEqual(entity.port_name, "ethernet1-1_1")
+
+    def test_port_name_from_description(self):
+        entity = PANOSSnmpIfEntity(
+            "1", {PORT_DESCR_NAME.object_name: _value("ethernet1/2")}
+        )
+        self.assertEqual(entity.port_name, "ethernet1-2")
+        self.assertEqual(entity.port_id, "1-2")
+
+    def test_port_name_cached_per_instance(self):
+        row = {PORT_NAME.object_name: _value("ethernet1/1")}
+        entity = PANOSSnmpIfEntity("1", row)
+        self.assertEqual(entity.port_name, "ethernet1-1")
+        row[PORT_NAME.object_name] = _value("ethernet1/3")
+
+        self.assertEqual(entity.port_name, "ethernet1-1")
+        self.assertEqual(PANOSSnmpIfEntity("1", row).port_name, "ethernet1-3")
+
+    def test_entity_is_slotted(self):
+        entity = PANOSSnmpIfEntity("1", {})
+        self.assertFalse(hasattr(entity, "__dict__"))
+        self.assertEqual(entity.if_type, "other")
+        self.assertEqual(entity.if_name, "")
+        self.assertIsNone(entity.if_mac)
+
+
+class TestPANOSIfTable(TestCase):
+    def test_load_if_port_reuses_entity(self):
+        ports_snmp_table = Mock()
+        ports_snmp_table.port_table = {"1": {}, "2": {}}
+        table = PANOSIfTable(Mock(), ports_snmp_table, Mock())
+
+        entity = table.load_if_port("1")
+
+        self.assertIsInstance(entity, PANOSSnmpIfEntity)
+        self.assertIs(table.load_if_port("1"), entity)
+        self.assertIsNot(table.load_if_port("2"), entity)
+
+
+class TestAutoloadMemory(TestCase):
+    AUTOLOAD_COUNT = 3
+
+    def _autoload(self, records):
+        snmp_service = FakeSnmpService(records)
+        autoload = PanOSGenericSNMPAutoload(snmp_service, create_resource_model())
+        return autoload.discover(["Palo Alto"])
+
+    @staticmethod
+    def _live_objects(cls):
+        gc.collect()
+        return [x for x in gc.get_objects() if isinstance(x, cls)]
+
+    def test_entities_freed_after_repeated_autoloads(self):
+        records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+        details = self._autoload(records)
+        self.assertTrue(
+            any(r.name == "ethernet1-1" for r in details.resources), details.resources
+        )
+
+        for _ in range(self.AUTOLOAD_COUNT):
+            self._autoload(records)
+
+        self.assertEqual(self._live_objects(PANOSSnmpIfEntity), [])
+        self.assertEqual(self._live_objects(PANOSIfTable), [])
+        self.assertEqual(self._live_objects(PanOSGenericSNMPAutoload), [])
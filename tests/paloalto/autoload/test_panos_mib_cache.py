@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+import shutil
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.paloalto.autoload import panos_mib_cache
+from cloudshell.paloalto.autoload.panos_generic_snmp_autoload import MIBS_FOLDER
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+
+
+class TestPanOSMibCache(TestCase):
+    def setUp(self):
+        self._temp_dir_context = TempDirContext()
+        temp_dir = self._temp_dir_context.__enter__()
+        self._mib_dir = os.path.join(temp_dir, "mibs")
+        self._cache_dir = os.path.join(temp_dir, "cache")
+        shutil.copytree(MIBS_FOLDER, self._mib_dir)
+        env_patcher = patch.dict(
+            os.environ, {panos_mib_cache.MIB_CACHE_DIR_ENV: self._cache_dir}
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+    def tearDown(self):
+        self._temp_dir_context.__exit__(None, None, None)
+
+    def test_bundle_is_parsed_once_per_process(self):
+        bundle = panos_mib_cache.get_mib_bundle(self._mib_dir)
+        self.assertIs(panos_mib_cache.get_mib_bundle(self._mib_dir), bundle)
+        self.assertIn("PAN-COMMON-MIB", bundle)
+        self.assertIn("pansysswversion", bundle["PAN-COMMON-MIB"].mib_symbols)
+
+    def test_compiled_file_is_used(self):
+        panos_mib_cache.get_mib_bundle(self._mib_dir)
+        self.assertEqual(len(os.listdir(self._cache_dir)), 1)
+        panos_mib_cache._bundles.clear()
+
+        with patch.object(panos_mib_cache, "_read_json_mibs") as read_json_mibs:
+            bundle = panos_mib_cache.get_mib_bundle(self._mib_dir)
+
+        read_json_mibs.assert_not_called()
+        self.assertIn("PAN-PRODUCTS-MIB", bundle)
+
+    def test_bundle_invalidated_on_json_change(self):
+        bundle = panos_mib_cache.get_mib_bundle(self._mib_dir)
+        os.remove(os.path.join(self._mib_dir, "PAN-PRODUCTS-MIB.json"))
+
+        new_bundle = panos_mib_cache.get_mib_bundle(self._mib_dir)
+
+        self.assertIsNot(new_bundle, bundle)
+        self.assertNotIn("PAN-PRODUCTS-MIB", new_bundle)
+        self.assertEqual(len(os.listdir(self._cache_dir)), 2)
+
+    def test_bind_json_mib_shares_symbol_maps(self):
+        template = panos_mib_cache.get_mib_bundle(self._mib_dir)["PAN-COMMON-MIB"]
+        mib_builder = Mock()
+
+        json_mib = panos_mib_cache.bind_json_mib(
+            template, mib_builder, mib_builder.json_mib_parser
+        )
+
+        self.assertIsNot(json_mib, template)
+        self.assertIs(json_mib._mib_builder, mib_builder)
+        self.assertIsNone(template._mib_builder)
+        self.assertIs(json_mib.mib_symbols, template.mib_symbols)
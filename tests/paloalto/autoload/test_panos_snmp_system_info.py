@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.snmp.cloudshell_snmp import Snmp
+from cloudshell.snmp.snmp_parameters import SNMPReadParameters
+
+from cloudshell.paloalto.autoload.panos_generic_snmp_autoload import MIBS_FOLDER
+from cloudshell.paloalto.autoload.panos_snmp_scalars import SYSTEM_SCALARS
+from cloudshell.paloalto.autoload.panos_snmp_system_info import PanOSSNMPSystemInfo
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    UdpSnmpAgent,
+    create_resource_model,
+    read_snmpwalk,
+)
+
+SYS_LOCATION_OID = "1.3.6.1.2.1.1.6.0"
+SYS_OBJECT_ID_OID = "1.3.6.1.2.1.1.2.0"
+
+
+class TestPanOSSNMPSystemInfo(TestCase):
+    def setUp(self):
+        self._records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+
+    def _create_system_info(self, records=None):
+        snmp_service = FakeSnmpService(records or self._records)
+        snmp_service.add_mib_folder_path(MIBS_FOLDER)
+        snmp_service.load_mib_tables(["PAN-COMMON-MIB"])
+        return PanOSSNMPSystemInfo(snmp_service, Mock()), snmp_service
+
+    def test_fill_attributes_in_one_round_trip(self):
+        system_info, snmp_service = self._create_system_info()
+        resource = create_resource_model()
+
+        self.assertTrue(system_info.is_valid_device_os(["Palo Alto"]))
+        system_info.fill_attributes(resource)
+
+        self.assertEqual(resource.system_name, "pa-220-fw01")
+        self.assertEqual(resource.contact_name, "netops@example.com")
+        self.assertEqual(resource.location, "DC1 Row 4")
+        self.assertEqual(resource.os_version, "10.1.9")
+        self.assertEqual(system_info.round_trips, 1)
+        self.assertEqual(snmp_service.round_trips, 1)
+
+    def test_missing_scalars(self):
+        records = dict(self._records)
+        del records[SYS_LOCATION_OID]
+        del records[SYS_OBJECT_ID_OID]
+        system_info, _ = self._create_system_info(records)
+        resource = create_resource_model()
+
+        system_info.fill_attributes(resource)
+
+        self.assertFalse(resource.location)
+        self.assertFalse(resource.vendor)
+        self.assertEqual(resource.os_version, "10.1.9")
+
+
+class TestPanOSSNMPSystemInfoAgent(TestCase):
+    """Requests go through the real pysnmp dispatcher to a local agent."""
+
+    def setUp(self):
+        self._records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+
+    @staticmethod
+    def _read(agent: UdpSnmpAgent) -> tuple[str, int]:
+        """Get OS version and amount of round trips."""
+        snmp_parameters = SNMPReadParameters("127.0.0.1", "public", port=agent.port)
+        logger = Mock()
+        with Snmp(timeout=1, retry_count=0).get_snmp_service(
+            snmp_parameters, logger
+        ) as snmp_service:
+            snmp_service.add_mib_folder_path(MIBS_FOLDER)
+            snmp_service.load_mib_tables(["PAN-COMMON-MIB"])
+            system_info = PanOSSNMPSystemInfo(snmp_service, logger)
+            try:
+                os_version = system_info._get_device_os_version()
+            finally:
+                round_trips = system_info.round_trips
+        return os_version, round_trips
+
+    def test_one_round_trip(self):
+        with UdpSnmpAgent(self._records) as agent:
+            os_version, round_trips = self._read(agent)
+
+        self.assertEqual(os_version, "10.1.9")
+        self.assertEqual(round_trips, 1)
+        self.assertEqual(agent.requests, len(SYSTEM_SCALARS))
+
+    def test_agent_limiting_pdu_size(self):
+        with UdpSnmpAgent(self._records, max_var_binds=1) as agent:
+            os_version, round_trips = self._read(agent)
+
+        self.assertEqual(os_version, "10.1.9")
+        self.assertEqual(round_trips, 1)
+
+    def test_dead_agent_single_timeout(self):
+        with UdpSnmpAgent(self._records, dead=True) as agent:
+            with self.assertRaises(Exception):
+                self._read(agent)
+
+        # every scalar is requested once, the requests time out together
+        self.assertEqual(agent.requests, len(SYSTEM_SCALARS))
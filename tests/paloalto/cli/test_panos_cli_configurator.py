@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from unittest import TestCase
+
+from cloudshell.paloalto.cli.panos_cli_configurator import (
+    SESSION_SETUP_COMMANDS,
+    PanOSCliConfigurator,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSession:
+    """Operational mode session, every prompt read costs the latency."""
+
+    LATENCY = 0.05
+    PROMPT = "\nadmin@fw1> "
+
+    def __init__(self, unknown_commands=()):
+        self.unknown_commands = set(unknown_commands)
+        self.round_trips = 0
+        self.commands = []
+
+    def hardware_expect(self, command, expected_string, logger, **kwargs):
+        self.round_trips += 1
+        time.sleep(self.LATENCY)
+        output = ""
+        for line in command.splitlines():
+            self.commands.append(line)
+            output += line + "\n"
+            if line in self.unknown_commands:
+                output += f"Unknown command: {line.split()[-1]}\n"
+            output += self.PROMPT
+        if not re.search(expected_string, output, re.DOTALL):
+            raise Exception("Session", f"{expected_string} not found")
+        return output
+
+
+class TestPanOSCliConfigurator(TestCase):
+    def setUp(self):
+        self._configurator = PanOSCliConfigurator("SSH", "10.0.0.1", logger)
+
+    def test_session_setup_in_one_round_trip(self):
+        session = FakeSession()
+        started = time.perf_counter()
+        for command in SESSION_SETUP_COMMANDS:
+            session.hardware_expect(command, r">\s*$", logger)
+        sequential = time.perf_counter() - started
+
+        session = FakeSession()
+        started = time.perf_counter()
+        self._configurator._on_session_start(session, logger)
+        batched = time.perf_counter() - started
+
+        self.assertEqual(session.round_trips, 1)
+        self.assertEqual(session.commands, list(SESSION_SETUP_COMMANDS))
+        self.assertLess(batched, sequential / 2)
+
+    def test_setup_on_every_connect(self):
+        session = FakeSession()
+        self._configurator._on_session_start(session, logger)
+        # reconnect starts the session again
+        self._configurator._on_session_start(session, logger)
+
+        self.assertEqual(session.round_trips, 2)
+        self.assertEqual(session.commands, list(SESSION_SETUP_COMMANDS) * 2)
+
+    def test_setup_failed(self):
+        session = FakeSession(unknown_commands={"set cli pager off"})
+
+        with self.assertRaisesRegex(Exception, "Failed to set up CLI session"):
+            self._configurator._on_session_start(session, logger)
+
+        with self.assertRaises(Exception):
+            self._configurator._on_session_start(session, logger)
+        self.assertEqual(session.round_trips, 2)
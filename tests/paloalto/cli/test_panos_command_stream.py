@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import io
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.cli.session.session_exceptions import (
+    ExpectedSessionException,
+    SessionReadTimeout,
+)
+
+from cloudshell.paloalto.cli.panos_command_modes import (
+    ConfigCommandMode,
+    DefaultCommandMode,
+)
+from cloudshell.paloalto.cli.panos_command_stream import (
+    CommandOutputStream,
+    receive_chunk,
+)
+from cloudshell.paloalto.command_actions.system_actions import (
+    SystemConfigurationActions,
+)
+from cloudshell.paloalto.helpers.set_commands import iter_set_commands
+
+
+class FakeStreamSession:
+    """Sends the command output in chunks that split lines.
+
+    The device sends the output without pauses, so _receive_all would read
+    all of it at once.
+    """
+
+    _clear_buffer_timeout = 0.1
+    _timeout = 1
+
+    def __init__(self, output: str, prompt: str, chunk_size: int = 1000):
+        self._output = output
+        self._prompt = prompt
+        self._chunk_size = chunk_size
+        self.sent = []
+        self.chunks_read = 0
+        self._pending = []
+
+    def _clear_buffer(self, timeout, logger):
+        return ""
+
+    def send_line(self, command, logger):
+        self.sent.append(command)
+        if command == "\x03":
+            self._pending = [f"\n{self._prompt}"]
+            return
+        data = f"{command}\r\n{self._output}{self._prompt}"
+        self._pending = [
+            data[i : i + self._chunk_size]
+            for i in range(0, len(data), self._chunk_size)
+        ]
+
+    def _receive(self, timeout, logger):
+        self.chunks_read += 1
+        return self._pending.pop(0)
+
+    def _receive_all(self, timeout, logger):
+        self.chunks_read += len(self._pending)
+        data = "".join(self._pending)
+        self._pending = []
+        return data
+
+    def hardware_expect(self, command, expected_string, logger, **kwargs):
+        return "".join(self._pending)
+
+
+def _cli_service(session, mode):
+    return Mock(session=session, command_mode=mode(Mock()))
+
+
+class TestCommandOutputStream(TestCase):
+    def setUp(self):
+        self._lines = [
+            f"set address host-{i} ip-netmask 10.0.{i // 256}.{i % 256}"
+            for i in range(5000)
+        ]
+
+    def test_config_mode_lines(self):
+        session = FakeStreamSession(
+            "\r\n".join(self._lines) + "\r\n\r\n[edit]\r\n", "admin@fw1# "
+        )
+
+        with CommandOutputStream(
+            _cli_service(session, ConfigCommandMode), "show address"
+        ) as stream:
+            lines = list(stream)
+
+        self.assertEqual(lines, [*self._lines, ""])
+        self.assertTrue(stream.finished)
+        self.assertEqual(session.sent, ["show address"])
+
+    def test_operational_mode_xml(self):
+        xml = "<config>\n" + "<entry name='a'>\n</entry>\n" * 1000 + "</config>\n"
+        session = FakeStreamSession(xml, "admin@fw1> ", chunk_size=7)
+
+        stream = CommandOutputStream(
+            _cli_service(session, DefaultCommandMode), "show config running"
+        )
+        output = io.StringIO()
+
+        self.assertEqual(stream.write_to(output), 2002)
+        self.assertEqual(output.getvalue(), xml)
+
+    def test_stop_early(self):
+        session = FakeStreamSession("\n".join(self._lines) + "\n", "admin@fw1> ")
+
+        with CommandOutputStream(
+            _cli_service(session, DefaultCommandMode), "show config running"
+        ) as stream:
+            found = next(x for x in stream if "host-10 " in x)
+
+        self.assertEqual(found, self._lines[10])
+        self.assertEqual(session.sent, ["show config running", "\x03"])
+        self.assertEqual(session.chunks_read, 1)
+
+    def test_stream_config_records(self):
+        session = FakeStreamSession(
+            "\n".join(self._lines) + "\n[edit]\n", "admin@fw1# "
+        )
+
+        with SystemConfigurationActions(
+            _cli_service(session, ConfigCommandMode)
+        ).stream_config("address") as stream:
+            records = list(iter_set_commands(stream, "address"))
+
+        self.assertEqual(session.sent, ["show address"])
+        self.assertEqual(len(records), 5000)
+        self.assertEqual(records[0], ("host-0", "ip-netmask", "10.0.0.0"))
+
+    def test_receive_timeout(self):
+        session = Mock(_timeout=30)
+        session._receive.side_effect = SessionReadTimeout()
+
+        with self.assertRaises(ExpectedSessionException):
+            receive_chunk(session, 0.2, read_timeout=0.05)
+        self.assertGreater(session._receive.call_count, 1)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest import TestCase
+from unittest.mock import patch
+
+from cloudshell.cli.service.session_pool_manager import SessionPoolException
+
+from cloudshell.paloalto.cli.panos_cli_configurator import PanOSCliConfigurator
+from cloudshell.paloalto.cli.panos_command_modes import ConfigCommandMode
+from cloudshell.paloalto.cli.panos_session_pool import PanOSSessionPool
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSession:
+    """PanOS SSH session that counts logins and sent commands."""
+
+    session_type = "SSH"
+
+    def __init__(self, host="10.0.0.1", username="admin", device=None):
+        self.host = host
+        self.port = None
+        self.username = username
+        self.device = device if device is not None else {"logins": 0}
+        self.commands = []
+        self.config_mode = False
+        self.alive = False
+
+    def __eq__(self, other):
+        return (self.host, self.username) == (other.host, other.username)
+
+    def connect(self, prompt, logger):
+        self.device["logins"] += 1
+        self.alive = True
+        self.config_mode = False
+
+    def disconnect(self):
+        self.alive = False
+
+    def reconnect(self, prompt, logger, timeout=None):
+        self.connect(prompt, logger)
+
+    def active(self):
+        return self.alive
+
+    def _prompt(self):
+        return "\n[edit]\nadmin@fw1# " if self.config_mode else "\nadmin@fw1> "
+
+    def probe_for_prompt(self, expected_string, logger):
+        if not self.alive:
+            raise Exception("Session", "Socket is closed")
+        self.commands.append("")
+        return self._prompt()
+
+    def match_prompt(self, prompt, match_string, logger):
+        return bool(re.search(prompt, match_string, re.DOTALL))
+
+    def hardware_expect(self, command, expected_string, logger, **kwargs):
+        if not self.alive:
+            raise Exception("Session", "Socket is closed")
+        self.commands.append(command)
+        if command == "configure":
+            self.config_mode = True
+        elif command == "exit":
+            self.config_mode = False
+        return command + self._prompt()
+
+
+class TestPanOSSessionPool(TestCase):
+    def setUp(self):
+        self._pool = PanOSSessionPool(max_sessions_per_device=2, pool_timeout=1)
+        self._device = {"logins": 0}
+
+    def _create_configurator(self, host="10.0.0.1", username="admin"):
+        configurator = PanOSCliConfigurator(
+            "SSH", host, logger, session_pool=self._pool
+        )
+        patcher = patch.object(
+            configurator,
+            "_defined_sessions",
+            lambda: [FakeSession(host, username, self._device)],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return configurator
+
+    def test_save_flow_logs_in_once(self):
+        configurator = self._create_configurator()
+
+        with configurator.config_mode_service() as cli_service:
+            cli_service.send_command("show deviceconfig system hostname")
+        with configurator.enable_mode_service() as cli_service:
+            cli_service.send_command("show system info")
+            session = cli_service.session
+
+        self.assertEqual(self._device["logins"], 1)
+        # fresh session mode is known, the checkout doesn't probe it
+        self.assertEqual(
+            session.commands,
+            ["", "configure", "show deviceconfig system hostname", "exit"]
+            + ["show system info"],
+        )
+
+    def test_mode_aware_checkout(self):
+        configurator = self._create_configurator()
+
+        with configurator.config_mode_service() as config_service:
+            with configurator.enable_mode_service() as enable_service:
+                self.assertIsNot(config_service.session, enable_service.session)
+        with configurator.config_mode_service() as cli_service:
+            self.assertIs(cli_service.session, config_service.session)
+            self.assertIsInstance(cli_service.command_mode, ConfigCommandMode)
+
+        self.assertEqual(self._device["logins"], 2)
+
+    def test_health_check_reconnects_dead_session(self):
+        self._pool.health_check_interval = 0
+        configurator = self._create_configurator()
+        with configurator.enable_mode_service() as cli_service:
+            first = cli_service.session
+        # connection dropped while the session was idle
+        first.alive = False
+
+        with configurator.enable_mode_service() as cli_service:
+            cli_service.send_command("show system info")
+            self.assertIs(cli_service.session, first)
+
+        self.assertEqual(self._device["logins"], 2)
+
+    def test_idle_ttl(self):
+        self._pool.idle_ttl = 0.05
+        configurator = self._create_configurator()
+        with configurator.enable_mode_service() as cli_service:
+            first = cli_service.session
+        time.sleep(0.1)
+
+        with configurator.enable_mode_service() as cli_service:
+            self.assertIsNot(cli_service.session, first)
+        self.assertFalse(first.alive)
+
+    def test_has_idle_session(self):
+        configurator = self._create_configurator()
+        self.assertFalse(configurator.has_idle_session())
+
+        with configurator.enable_mode_service():
+            self.assertFalse(configurator.has_idle_session())
+        self.assertTrue(configurator.has_idle_session())
+
+        self._pool.idle_ttl = 0
+        self.assertFalse(configurator.has_idle_session())
+
+    def test_expired_sessions_reaped(self):
+        self._pool.idle_ttl = 0.05
+        configurator = self._create_configurator()
+        with configurator.enable_mode_service() as cli_service:
+            first = cli_service.session
+        with configurator.enable_mode_service() as cli_service:
+            self.assertIs(cli_service.session, first)
+
+        # closed without another checkout
+        time.sleep(0.2)
+        self.assertFalse(first.alive)
+        self.assertEqual(self._pool.sessions_count("10.0.0.1"), 0)
+        self.assertIsNone(self._pool._reaper)
+
+    def test_other_credentials_replace_idle_session(self):
+        self._pool.max_sessions_per_device = 1
+        with self._create_configurator().enable_mode_service() as cli_service:
+            first = cli_service.session
+
+        configurator = self._create_configurator(username="other")
+        with configurator.enable_mode_service() as cli_service:
+            self.assertEqual(cli_service.session.username, "other")
+        self.assertFalse(first.alive)
+
+    def test_max_sessions_per_device(self):
+        configurator = self._create_configurator()
+
+        def run(_):
+            with configurator.enable_mode_service() as cli_service:
+                time.sleep(0.05)
+                return cli_service.session
+
+        with ThreadPoolExecutor(6) as pool:
+            sessions = list(pool.map(run, range(6)))
+
+        self.assertEqual(self._device["logins"], 2)
+        self.assertEqual(len({id(x) for x in sessions}), 2)
+        self.assertEqual(self._pool.sessions_count("10.0.0.1"), 2)
+
+    def test_pool_timeout(self):
+        self._pool.max_sessions_per_device = 1
+        self._pool.pool_timeout = 0.1
+        configurator = self._create_configurator()
+
+        with configurator.enable_mode_service():
+            with self.assertRaises(SessionPoolException):
+                with configurator.enable_mode_service():
+                    pass
+
+    def test_slow_disconnect_does_not_block_pool(self):
+        disconnecting = Event()
+        released = Event()
+        self.addCleanup(released.set)
+        with self._create_configurator().enable_mode_service() as cli_service:
+            hanging = cli_service.session
+        hanging.disconnect = lambda: disconnecting.set() or released.wait(5)
+
+        with ThreadPoolExecutor(1) as executor:
+            closing = executor.submit(self._pool.close_idle, logger)
+            self.assertTrue(disconnecting.wait(5))
+            # the other device gets its session while the first one disconnects
+            configurator = self._create_configurator(host="10.0.0.2")
+            with configurator.enable_mode_service() as cli_service:
+                self.assertEqual(cli_service.session.host, "10.0.0.2")
+            self.assertFalse(closing.done())
+            released.set()
+            closing.result(5)
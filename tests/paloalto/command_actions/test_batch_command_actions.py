@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.paloalto.cli.panos_command_modes import (
+    ConfigCommandMode,
+    DefaultCommandMode,
+)
+from cloudshell.paloalto.command_actions.batch_command_actions import (
+    BatchCommand,
+    BatchCommandActions,
+)
+
+OUTPUTS = {
+    "show clock": "Thu Dec  2 10:10:10 PST 2021",
+    "show system info": "hostname: fw1\r\nsw-version: 10.1.0",
+    "show interface all": "\r\n".join(f"ethernet1/{i}  up" for i in range(1, 200)),
+    "show counter": "Invalid syntax.",
+    "show config running": "set address a1 ip-netmask 10.0.0.1\r\nset address a1 color",
+    "show jobs all": "",
+    "request restart system": "Server error: Not allowed",
+    "set address a1 ip-netmask 10.0.0.1": "",
+    "set address a1 color": "Validation Error:\r\n address -> a1 'color' is invalid",
+}
+
+
+class FakeBatchSession:
+    """Device answering the commands pasted at once, read in small chunks."""
+
+    _clear_buffer_timeout = 0.1
+    _timeout = 1
+
+    def __init__(self, prompt: str, config: bool = False, chunk_size: int = 50):
+        self._prompt = prompt
+        self._config = config
+        self._chunk_size = chunk_size
+        self._pending = []
+        self.sent = []
+        # commands which don't finish, their prompt isn't sent
+        self.hanging = set()
+
+    def _clear_buffer(self, timeout, logger):
+        return ""
+
+    def run(self, command: str) -> str:
+        if command in self.hanging:
+            return f"{command}\r\n"
+        output = OUTPUTS[command]
+        if self._config:
+            output += "\r\n\r\n[edit]"
+        return f"{command}\r\n{output}\r\n{self._prompt}"
+
+    def send_line(self, command, logger):
+        self.sent.append(command)
+        data = "".join(self.run(x) for x in command.split("\n"))
+        self._pending = [
+            data[i : i + self._chunk_size]
+            for i in range(0, len(data), self._chunk_size)
+        ]
+
+    def _receive(self, timeout, logger):
+        if not self._pending:
+            time.sleep(timeout)
+            return ""
+        return self._pending.pop(0)
+
+
+class FakeBatchCli:
+    def __init__(self, config: bool = False):
+        mode = ConfigCommandMode if config else DefaultCommandMode
+        prompt = "admin@fw1# " if config else "admin@fw1> "
+        self.session = FakeBatchSession(prompt, config)
+        self.command_mode = mode(Mock())
+        self.commands = []
+
+    def send_command(self, command, remove_prompt=False, timeout=None):
+        self.commands.append(command)
+        output = self.session.run(command).split("\r\n", 1)[1]
+        return output.replace(self.session._prompt, "").replace("\r", "")
+
+
+class TestBatchCommandActions(TestCase):
+    def test_pipelined_commands(self):
+        cli = FakeBatchCli()
+        commands = [
+            BatchCommand(x)
+            for x in ("show clock", "show system info", "show interface all") * 3
+        ]
+
+        results = BatchCommandActions(cli).run_commands(commands)
+
+        self.assertEqual(len(cli.session.sent), 1)
+        self.assertEqual(cli.commands, [])
+        self.assertEqual([x.command for x in results], [x.command for x in commands])
+        for result in results:
+            self.assertTrue(result.success)
+            self.assertEqual(result.output, OUTPUTS[result.command].replace("\r", ""))
+            self.assertGreaterEqual(result.latency, 0)
+
+    def test_config_mode_errors(self):
+        cli = FakeBatchCli(config=True)
+        commands = [
+            BatchCommand("set address a1 ip-netmask 10.0.0.1"),
+            BatchCommand("set address a1 color"),
+            BatchCommand("show clock"),
+        ]
+
+        results = BatchCommandActions(cli).run_commands(commands)
+
+        self.assertEqual([x.success for x in results], [True, False, True])
+        self.assertEqual(results[0].output, "")
+        self.assertEqual(results[1].error, "Validation Error:")
+        self.assertEqual(results[2].output, OUTPUTS["show clock"])
+
+    def test_command_line_in_output(self):
+        cli = FakeBatchCli(config=True)
+        commands = [
+            BatchCommand("show config running"),
+            BatchCommand("set address a1 ip-netmask 10.0.0.1"),
+            BatchCommand("set address a1 color"),
+        ]
+
+        results = BatchCommandActions(cli).run_commands(commands)
+
+        self.assertEqual(
+            results[0].output, OUTPUTS["show config running"].replace("\r", "")
+        )
+        self.assertEqual(results[1].output, "")
+        self.assertEqual(results[2].error, "Validation Error:")
+
+    def test_pipeline_timeout(self):
+        cli = FakeBatchCli()
+        cli.session.hanging.add("show jobs all")
+        commands = [
+            BatchCommand(x)
+            for x in ("show clock", "show jobs all", "show clock", "show counter")
+        ]
+
+        start = time.monotonic()
+        results = BatchCommandActions(cli).run_commands(
+            [*commands, BatchCommand("show system info", config=True)],
+            pipeline_size=4,
+            timeout=0.2,
+        )
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0].output, OUTPUTS["show clock"])
+        self.assertEqual(results[1].error, "Command timed out")
+        self.assertEqual([x.executed for x in results], [True, True, False, False])
+
+    def test_unsafe_commands_one_by_one(self):
+        cli = FakeBatchCli()
+        commands = [
+            BatchCommand("show clock"),
+            BatchCommand("request restart system"),
+            BatchCommand("show clock"),
+        ]
+
+        results = BatchCommandActions(cli).run_commands(commands, stop_on_error=True)
+
+        self.assertEqual(cli.commands, ["show clock", "request restart system"])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[1].error, "Server error: Not allowed")
+
+    def test_session_error_stops_batch(self):
+        cli = FakeBatchCli()
+        cli.session._receive = Mock(side_effect=Exception("Socket closed"))
+        commands = [BatchCommand("show clock"), BatchCommand("show counter")]
+
+        results = BatchCommandActions(cli).run_commands(
+            [*commands, BatchCommand("request restart system")]
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any(x.success for x in results))
+        self.assertEqual(results[0].error, "Socket closed")
+
+    def test_command_mode(self):
+        self.assertTrue(BatchCommand("set deviceconfig system hostname fw1").is_config)
+        self.assertTrue(BatchCommand("commit").is_config)
+        self.assertFalse(BatchCommand("show running security-policy").is_config)
+        self.assertTrue(BatchCommand("show address", config=True).is_config)
+        self.assertTrue(BatchCommand("delete address a1").can_pipeline())
+        self.assertFalse(BatchCommand("delete address a1").can_pipeline(True))
+        self.assertFalse(BatchCommand("commit").can_pipeline())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.paloalto.command_actions.job_actions import JobActions, PanOSJob
+
+HEADER = (
+    "Enqueued              Dequeued      ID  Type       Status Result Completed\n"
+    "--------------------------------------------------------------------------\n"
+)
+ACTIVE_JOB = (
+    HEADER + "2024/10/03 12:00:00   12:00:01    1234  Commit     ACT    PEND   {}%\n"
+)
+FINISHED_JOB = HEADER + (
+    "2024/10/03 12:00:00   12:00:01    1234  Commit     FIN    OK     12:01:10\n"
+    "Warnings:\n"
+    "rule 'allow-all' shadows rule 'deny-web'\n"
+    "Details:Configuration committed successfully\n"
+)
+FAILED_JOB = HEADER + (
+    "2024/10/03 12:00:00   12:00:01    1234  Commit     FIN    FAIL   12:00:30\n"
+    "Warnings:\n"
+    "Details:\n"
+    "Validation Error:\n"
+    " rulebase -> security is invalid\n"
+)
+
+
+class TestPanOSJob(TestCase):
+    def test_active_job(self):
+        job = PanOSJob.from_output(1234, ACTIVE_JOB.format(45))
+
+        self.assertEqual(job.job_type, "Commit")
+        self.assertEqual(job.progress, 45)
+        self.assertFalse(job.finished)
+
+    def test_finished_job(self):
+        job = PanOSJob.from_output(1234, FINISHED_JOB)
+
+        self.assertTrue(job.success)
+        self.assertIsNone(job.progress)
+        self.assertEqual(job.warnings, ["rule 'allow-all' shadows rule 'deny-web'"])
+        self.assertEqual(job.details, ["Configuration committed successfully"])
+
+    def test_failed_job(self):
+        job = PanOSJob.from_output(1234, FAILED_JOB)
+
+        self.assertTrue(job.finished)
+        self.assertFalse(job.success)
+        self.assertEqual(job.warnings, [])
+        self.assertEqual(
+            job.details, ["Validation Error:", "rulebase -> security is invalid"]
+        )
+
+    def test_missing_job(self):
+        with self.assertRaises(Exception):
+            PanOSJob.from_output(1, FINISHED_JOB)
+
+
+@patch("cloudshell.paloalto.command_actions.job_actions.time.sleep")
+class TestJobActions(TestCase):
+    def setUp(self):
+        self._cli_service = Mock()
+
+    def test_wait_for_job(self, sleep):
+        self._cli_service.send_command.side_effect = [
+            ACTIVE_JOB.format(0),
+            ACTIVE_JOB.format(50),
+            FINISHED_JOB,
+        ]
+
+        job = JobActions(self._cli_service, config_mode=True).wait_for_job(1234)
+
+        self.assertTrue(job.success)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(
+            self._cli_service.send_command.call_args[0][0], "run show jobs id 1234"
+        )
+
+    def test_wait_for_job_timeout(self, sleep):
+        self._cli_service.send_command.return_value = ACTIVE_JOB.format(10)
+
+        with patch(
+            "cloudshell.paloalto.command_actions.job_actions.time.monotonic",
+            side_effect=[0, 5, 11],
+        ):
+            with self.assertRaisesRegex(Exception, "didn't finish"):
+                JobActions(self._cli_service).wait_for_job(1234, timeout=10)
+
+        self.assertEqual(
+            self._cli_service.send_command.call_args[0][0], "show jobs id 1234"
+        )
+        self.assertLessEqual(sleep.call_args[0][0], 5)
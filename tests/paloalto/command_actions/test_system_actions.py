@@ -1,9 +1,25 @@
 from __future__ import annotations
 
+import os
+import time
+from threading import Thread
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
-from cloudshell.paloalto.command_actions.system_actions import SystemActions
+import tftpy
+
+from cloudshell.paloalto.cli.panos_command_modes import DefaultCommandMode
+from cloudshell.paloalto.command_actions.job_actions import PanOSJob
+from cloudshell.paloalto.command_actions.system_actions import (
+    FirmwareActions,
+    SoftwareImage,
+    SystemActions,
+    SystemConfigurationActions,
+)
+from cloudshell.paloalto.helpers.bounded_pipe import BoundedPipe
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+
+from tests.paloalto.cli.test_panos_command_stream import FakeStreamSession
 
 
 class TestUtils(TestCase):
@@ -29,3 +45,351 @@ class TestUtils(TestCase):
         execute_command.execute_command.assert_called_once_with(
             action_map=None, error_map=None
         )
+
+    def test_import_config_received_size(self):
+        self._cli_service.send_command.return_value = (
+            "Received 1048576 bytes in 1.2 seconds\nadmin@fw1> "
+        )
+
+        received_size = self._instance.import_config(
+            filename="PanOS_vm-10.1.3",
+            protocol="tftp",
+            host="192.168.1.2",
+            file_type="software",
+            remote_path="/images/PanOS_vm-10.1.3",
+        )
+
+        self.assertEqual(received_size, 1048576)
+
+    def test_config_fingerprint_ignores_framing(self):
+        config = "<config>\n" + "  <entry name='a'/>\n" * 500 + "</config>\n"
+
+        def fingerprint(output, chunk_size):
+            session = FakeStreamSession(output, "admin@fw1> ", chunk_size)
+            cli_service = Mock(session=session, command_mode=DefaultCommandMode(Mock()))
+            return SystemActions(cli_service).get_config_fingerprint()
+
+        expected = fingerprint(config, 1000)
+        framed = config.replace("\n", " \r\n") + "\r\n\r\n"
+        self.assertEqual(fingerprint(framed, 7), expected)
+        self.assertNotEqual(
+            fingerprint(config.replace("name='a'/>\n", "name='b'/>\n", 1), 1000),
+            expected,
+        )
+
+    @patch("cloudshell.paloalto.command_actions.system_actions.CommandTemplateExecutor")
+    def test_reload_device(self, command_template_executor):
+        prober = Mock(wait_for=lambda check, timeout: check() or check())
+        command_template_executor.return_value.execute_command.side_effect = [
+            Exception("Session closed"),
+            "Server error: Client not ready",
+            "hostname: fw1\nsw-version: 10.1.0\n",
+        ]
+
+        with patch.object(
+            SystemActions, "_create_readiness_prober", return_value=prober
+        ):
+            timings = self._instance.reload_device()
+
+        prober.wait_down.assert_called_once()
+        prober.wait_up.assert_called_once()
+        self._cli_service.reconnect.assert_called_once()
+        self.assertGreaterEqual(timings.total, 0)
+
+    @patch("cloudshell.paloalto.command_actions.system_actions.CommandTemplateExecutor")
+    def test_reload_device_not_back(self, command_template_executor):
+        prober = Mock()
+        prober.wait_up.return_value = False
+
+        with patch.object(
+            SystemActions, "_create_readiness_prober", return_value=prober
+        ):
+            with self.assertRaisesRegex(Exception, "didn't come back"):
+                self._instance.reload_device(timeout=10)
+
+        self._cli_service.reconnect.assert_not_called()
+
+
+SOFTWARE_INFO_OUTPUT = """
+Version                   Size          Release Date  Available  Downloaded  Currently Installed
+-------------------------------------------------------------------------------------------------
+10.1.3-h1                 412MB  2021/11/30 11:52:03        yes         yes                   no
+10.1.3                    401MB  2021/10/26 07:14:22         no         yes                  yes
+10.1.2                    399MB  2021/09/29 10:20:34        yes          no                   no
+
+admin@fw1> """  # noqa: E501
+
+
+class TestFirmwareActions(TestCase):
+    def test_parse_software_list(self):
+        self.assertEqual(
+            SoftwareImage.parse_list(SOFTWARE_INFO_OUTPUT),
+            [
+                SoftwareImage("10.1.3-h1", downloaded=True, current=False),
+                SoftwareImage("10.1.3", downloaded=True, current=True),
+                SoftwareImage("10.1.2", downloaded=False, current=False),
+            ],
+        )
+
+    def test_get_version_from_file_name(self):
+        get_version = FirmwareActions.get_version_from_file_name
+        self.assertEqual(get_version("PanOS_vm-10.1.3"), "10.1.3")
+        self.assertEqual(get_version("PanOS_3000-10.1.3-h1"), "10.1.3-h1")
+        self.assertIsNone(get_version("firmware.bin"))
+
+    def test_get_software_image(self):
+        cli_service = Mock()
+        cli_service.send_command.return_value = SOFTWARE_INFO_OUTPUT
+        actions = FirmwareActions(cli_service)
+
+        self.assertTrue(actions.get_software_image("10.1.3-h1").downloaded)
+        self.assertIsNone(actions.get_software_image("9.1.0"))
+
+    def test_install_software(self):
+        cli_service = Mock()
+        cli_service.send_command.return_value = (
+            "Software install job enqueued with jobid 12. "
+            "Run 'show jobs id 12' to monitor its status."
+        )
+
+        job_id = FirmwareActions(cli_service).install_software("PanOS_vm-10.1.3")
+
+        self.assertEqual(job_id, 12)
+        cli_service.send_command.assert_called_once()
+        self.assertEqual(
+            cli_service.send_command.call_args[0][0],
+            "request system software install file PanOS_vm-10.1.3",
+        )
+
+    def test_install_software_failed_to_start(self):
+        cli_service = Mock()
+        cli_service.send_command.return_value = "Server error: Image not found"
+
+        with self.assertRaisesRegex(Exception, "failed to start"):
+            FirmwareActions(cli_service).install_software_version("10.1.3")
+
+    @patch("cloudshell.paloalto.command_actions.system_actions.JobActions")
+    def test_wait_for_failed_install(self, job_actions):
+        job_actions.return_value.wait_for_job.return_value = PanOSJob(
+            12, "SWInstall", "FIN", "FAIL", details=["Not enough space"]
+        )
+
+        with self.assertRaisesRegex(Exception, "Software install failed"):
+            FirmwareActions(Mock()).wait_for_install(12)
+
+
+class FakeConfigCli:
+    """Config mode session that processes pasted lines one by one."""
+
+    PROMPT = "\n[edit]\nadmin@fw1# "
+
+    def __init__(self, pending_changes: str = "yes"):
+        self.pending_changes = pending_changes
+        self.round_trips = 0
+        self.applied = []
+
+    def send_command(self, command, expected_string=None, **kwargs):
+        self.round_trips += 1
+        output = ""
+        for line in command.splitlines():
+            output += line + "\n"
+            if line == "check pending-changes":
+                output += self.pending_changes
+            elif line == "commit":
+                output += "Configuration committed successfully"
+            elif "invalid" in line:
+                output += "Invalid syntax."
+            else:
+                self.applied.append(line)
+            output += self.PROMPT
+        return output
+
+
+class TestSystemConfigurationActions(TestCase):
+    def setUp(self):
+        self._cli_service = Mock()
+        self._instance = SystemConfigurationActions(self._cli_service)
+
+    def test_apply_commands(self):
+        cli = FakeConfigCli()
+        commands = [
+            f"set address host-{i} ip-netmask 10.0.{i // 256}.{i % 256}/32"
+            for i in range(250)
+        ]
+
+        applied = SystemConfigurationActions(cli).apply_commands(commands)
+
+        self.assertEqual(applied, 250)
+        self.assertEqual(cli.applied, commands)
+        # 3 chunks and commit
+        self.assertEqual(cli.round_trips, 4)
+
+    def test_apply_commands_errors(self):
+        cli = FakeConfigCli()
+        commands = ["set address a ip-netmask 10.0.0.1", "set address b invalid"]
+
+        with self.assertRaisesRegex(Exception, "1 of 2 commands failed"):
+            SystemConfigurationActions(cli).apply_commands(commands)
+
+        self.assertEqual(cli.applied, commands[:1])
+        self.assertEqual(cli.round_trips, 1)
+
+    def test_apply_commands_without_changes(self):
+        cli = FakeConfigCli(pending_changes="no")
+
+        SystemConfigurationActions(cli).apply_commands(["set address a 10.0.0.1"])
+
+        self.assertEqual(cli.round_trips, 1)
+
+    def test_apply_unsupported_command(self):
+        with self.assertRaisesRegex(Exception, "Unsupported command"):
+            self._instance.apply_commands(["set address a", "run request restart"])
+        self._cli_service.send_command.assert_not_called()
+
+    def test_start_commit(self):
+        self._cli_service.send_command.side_effect = [
+            "commit\nCommit job 1234 is in progress. "
+            "Use Ctrl+C to return to command prompt",
+            "\n[edit]\nadmin@fw1# ",
+        ]
+
+        self.assertEqual(self._instance.start_commit(), 1234)
+        self.assertEqual(self._cli_service.send_command.call_args[0][0], "\x03")
+
+    def test_start_commit_without_changes(self):
+        self._cli_service.send_command.return_value = (
+            "commit\nThere are no changes to commit.\n[edit]\nadmin@fw1# "
+        )
+
+        self.assertIsNone(self._instance.start_commit())
+        self._cli_service.send_command.assert_called_once()
+
+    def test_start_commit_failed(self):
+        self._cli_service.send_command.return_value = "Server error: locked by admin"
+
+        with self.assertRaisesRegex(Exception, "Commit failed"):
+            self._instance.start_commit()
+
+    @patch("cloudshell.paloalto.command_actions.system_actions.JobActions")
+    def test_commit_changes_async(self, job_actions):
+        self._cli_service.send_command.return_value = "Commit job 7 is in progress"
+        job = job_actions.return_value.wait_for_job.return_value
+        job.success = True
+        job.warnings = ["shadowed rule"]
+
+        self.assertIs(self._instance.commit_changes_async(timeout=30), job)
+        job_actions.return_value.wait_for_job.assert_called_once_with(7, timeout=30)
+
+    @patch("cloudshell.paloalto.command_actions.system_actions.JobActions")
+    def test_wait_for_failed_commit(self, job_actions):
+        job = job_actions.return_value.wait_for_job.return_value
+        job.success = False
+        job.warnings = []
+        job.details = ["rulebase -> security is invalid"]
+
+        with self.assertRaisesRegex(
+            Exception, "Commit failed: rulebase -> security is invalid"
+        ):
+            self._instance.wait_for_commit(7)
+
+
+class TestRenameFileOnTftp(TestCase):
+    FILE_SIZE = 1024 * 1024 + 100
+
+    def setUp(self):
+        temp_dir_context = TempDirContext()
+        self._tftp_root = temp_dir_context.__enter__()
+        self.addCleanup(temp_dir_context.__exit__, None, None, None)
+        self._server = tftpy.TftpServer(self._tftp_root)
+        self._server_thread = Thread(
+            target=self._server.listen, args=("127.0.0.1", 0), daemon=True
+        )
+        self._server_thread.start()
+        self.assertTrue(self._server.is_running.wait(5))
+        self.addCleanup(self._server_thread.join, 10)
+        self.addCleanup(self._server.stop, now=True)
+        self._instance = SystemActions(Mock())
+
+    def _rename(self, initial_file_name, new_file_name):
+        self._instance._rename_file_on_tftp(
+            initial_file_name=initial_file_name,
+            new_file_name=new_file_name,
+            tftp_host="127.0.0.1",
+            tftp_port=str(self._server.listenport),
+        )
+
+    def test_rename_file(self):
+        data = os.urandom(self.FILE_SIZE)
+        with open(os.path.join(self._tftp_root, "running-config.xml"), "wb") as f:
+            f.write(data)
+
+        pipes = []
+        with patch(
+            "cloudshell.paloalto.command_actions.system_actions.BoundedPipe",
+            side_effect=lambda: pipes.append(BoundedPipe()) or pipes[-1],
+        ):
+            self._rename("running-config.xml", "fw1-running-config.xml")
+        # server closes received file when its session ends
+        self._server.stop()
+        self._server_thread.join(10)
+
+        with open(os.path.join(self._tftp_root, "fw1-running-config.xml"), "rb") as f:
+            self.assertEqual(f.read(), data)
+        self.assertLessEqual(pipes[0].peak_size, pipes[0].max_size)
+
+    def _wait_server_sessions_closed(self, timeout):
+        deadline = time.monotonic() + timeout
+        while self._server.sessions and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self._server.sessions
+
+    def test_rename_missing_file(self):
+        with self.assertRaises(tftpy.TftpException):
+            self._rename("missing.xml", "fw1-missing.xml")
+        self.assertTrue(self._wait_server_sessions_closed(1))
+
+    def test_rename_failing_source(self):
+        def download(tftp, file_name, pipe):
+            pipe.write(os.urandom(self.FILE_SIZE // 2))
+            pipe.close_writer(OSError("connection reset"))
+
+        with patch.object(
+            SystemActions, "_download_from_tftp", staticmethod(download)
+        ), self.assertLogs(
+            "cloudshell.paloalto.command_actions.system_actions", "WARNING"
+        ) as logs:
+            with self.assertRaisesRegex(OSError, "connection reset"):
+                self._rename("running-config.xml", "fw1-running-config.xml")
+
+        # the upload is aborted, the server doesn't wait for its timeout
+        self.assertTrue(self._wait_server_sessions_closed(1))
+        self.assertIn("fw1-running-config.xml", logs.output[0])
+
+
+class TestBoundedPipe(TestCase):
+    def test_read_after_writer_closed(self):
+        pipe = BoundedPipe(max_size=4)
+        writer = Thread(target=lambda: (pipe.write(b"0123456789"), pipe.close_writer()))
+        writer.start()
+
+        self.assertEqual(pipe.read(3), b"012")
+        self.assertEqual(pipe.read(3), b"345")
+        self.assertEqual(pipe.read(3), b"678")
+        self.assertEqual(pipe.read(3), b"9")
+        self.assertEqual(pipe.read(3), b"")
+        writer.join()
+        self.assertEqual(pipe.peak_size, 4)
+
+    def test_writer_error(self):
+        pipe = BoundedPipe()
+        pipe.close_writer(ValueError("failed"))
+
+        with self.assertRaisesRegex(ValueError, "failed"):
+            pipe.read(512)
+
+    def test_write_to_closed_reader(self):
+        pipe = BoundedPipe(max_size=4)
+        pipe.close()
+
+        with self.assertRaises(BrokenPipeError):
+            pipe.write(b"data")
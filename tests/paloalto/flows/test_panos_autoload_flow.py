@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+from contextlib import nullcontext
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from pysnmp.proto import rfc1902
+
+from cloudshell.snmp.cloudshell_snmp import Snmp
+from cloudshell.snmp.snmp_parameters import SNMPReadParameters, SNMPV3Parameters
+
+from cloudshell.paloalto.autoload.panos_autoload_cache import (
+    DeviceState,
+    PanOSAutoloadCache,
+)
+from cloudshell.paloalto.flows.panos_autoload_flow import PanOSSnmpAutoloadFlow
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    UdpSnmpAgent,
+    create_resource_model,
+    read_snmpwalk,
+)
+
+SYS_UP_TIME_OID = "1.3.6.1.2.1.1.3.0"
+IF_NUMBER_OID = "1.3.6.1.2.1.2.1.0"
+
+
+class TestDeviceState(TestCase):
+    def test_from_device(self):
+        records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+        snmp_service = FakeSnmpService(records)
+
+        state = DeviceState.from_device(snmp_service)
+
+        self.assertEqual(state.sys_up_time, 123456789)
+        self.assertEqual(state.if_number, 22)
+        self.assertEqual(state.if_table_last_change, 4567)
+        self.assertEqual(snmp_service.round_trips, 1)
+
+    def test_from_device_agent(self):
+        records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+        with UdpSnmpAgent(records) as agent:
+            with Snmp(timeout=1, retry_count=0).get_snmp_service(
+                SNMPReadParameters("127.0.0.1", "public", port=agent.port), Mock()
+            ) as snmp_service:
+                state = DeviceState.from_device(snmp_service)
+
+        self.assertEqual(state.sys_up_time, 123456789)
+        self.assertEqual(state.if_table_last_change, 4567)
+
+    def test_from_device_incomplete(self):
+        snmp_service = FakeSnmpService({})
+        self.assertIsNone(DeviceState.from_device(snmp_service))
+
+    def test_is_changed_since(self):
+        state = DeviceState(1000, 10, 500, 100.0)
+
+        self.assertFalse(DeviceState(31000, 10, 500, 400.0).is_changed_since(state))
+        self.assertTrue(DeviceState(100, 10, 500, 400.0).is_changed_since(state))
+        self.assertTrue(DeviceState(31000, 11, 500, 400.0).is_changed_since(state))
+        self.assertTrue(DeviceState(31000, 10, 600, 400.0).is_changed_since(state))
+
+
+class TestPanOSSnmpAutoloadFlow(TestCase):
+    def setUp(self):
+        self._records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+        self._temp_dir_context = TempDirContext()
+        self._cache = PanOSAutoloadCache(self._temp_dir_context.__enter__())
+        self._snmp_configurator = Mock()
+        self._flow = PanOSSnmpAutoloadFlow(
+            self._snmp_configurator,
+            self._cache,
+            SNMPReadParameters("192.168.1.1", "public"),
+        )
+        self._device_key = self._flow._get_device_key(create_resource_model())
+
+    def tearDown(self):
+        self._temp_dir_context.__exit__(None, None, None)
+
+    def _autoload(self, records=None):
+        snmp_service = FakeSnmpService(records or self._records)
+        self._snmp_configurator.get_service.return_value = nullcontext(snmp_service)
+        details = self._flow._autoload_flow(["Palo Alto"], create_resource_model())
+        return details, snmp_service
+
+    def test_autoload_without_cache(self):
+        flow = PanOSSnmpAutoloadFlow(self._snmp_configurator)
+        snmp_service = FakeSnmpService(self._records)
+        self._snmp_configurator.get_service.return_value = nullcontext(snmp_service)
+
+        details = flow._autoload_flow(["Palo Alto"], create_resource_model())
+
+        self.assertTrue(details.resources)
+        self.assertIsNone(self._cache.load(self._device_key))
+
+    def test_unchanged_device_uses_cache(self):
+        details, _ = self._autoload()
+
+        cached_details, snmp_service = self._autoload()
+
+        self.assertEqual(snmp_service.round_trips, 1)
+        self.assertEqual(
+            [x.relative_address for x in cached_details.resources],
+            [x.relative_address for x in details.resources],
+        )
+        self.assertEqual(
+            [(x.attribute_name, x.attribute_value) for x in cached_details.attributes],
+            [(x.attribute_name, x.attribute_value) for x in details.attributes],
+        )
+
+    @patch("cloudshell.paloalto.flows.panos_autoload_flow.PanOSGenericSNMPAutoload")
+    def test_changed_interfaces_rediscovered(self, autoload_class):
+        autoload_class.return_value.discover.return_value.resources = []
+        autoload_class.return_value.discover.return_value.attributes = []
+        self._autoload()
+        self.assertIsNotNone(self._cache.load(self._device_key))
+        records = dict(self._records)
+        records[IF_NUMBER_OID] = rfc1902.Integer32(23)
+
+        details, _ = self._autoload(records)
+
+        self.assertIs(details, autoload_class.return_value.discover.return_value)
+        self.assertEqual(autoload_class.return_value.discover.call_count, 2)
+
+    @patch("cloudshell.paloalto.flows.panos_autoload_flow.PanOSGenericSNMPAutoload")
+    def test_rebooted_device_rediscovered(self, autoload_class):
+        autoload_class.return_value.discover.return_value.resources = []
+        autoload_class.return_value.discover.return_value.attributes = []
+        self._autoload()
+        records = dict(self._records)
+        records[SYS_UP_TIME_OID] = rfc1902.TimeTicks(100)
+
+        self._autoload(records)
+
+        self.assertEqual(autoload_class.return_value.discover.call_count, 2)
+
+    def test_other_address_not_using_cache(self):
+        self._autoload()
+
+        self._flow._snmp_parameters = SNMPReadParameters("192.168.1.2", "public")
+        _, snmp_service = self._autoload()
+
+        self.assertGreater(snmp_service.round_trips, 1)
+
+    def test_other_community_not_using_cache(self):
+        self._autoload()
+
+        self._flow._snmp_parameters = SNMPReadParameters("192.168.1.1", "private")
+        _, snmp_service = self._autoload()
+
+        self.assertGreater(snmp_service.round_trips, 1)
+        self.assertNotIn("private", self._flow._get_device_key(create_resource_model()))
+
+    def test_snmp_v3_user_in_key(self):
+        self._flow._snmp_parameters = SNMPV3Parameters(
+            "192.168.1.1", "admin", "pa$$word", "pr1v4te"
+        )
+        admin_key = self._flow._get_device_key(create_resource_model())
+        self._flow._snmp_parameters = SNMPV3Parameters(
+            "192.168.1.1", "monitor", "pa$$word", "pr1v4te"
+        )
+
+        self.assertNotEqual(
+            self._flow._get_device_key(create_resource_model()), admin_key
+        )
+        self.assertIn("/v3/", admin_key)
+
+    def test_unknown_snmp_parameters_skip_cache(self):
+        self._flow._snmp_parameters = None
+        self._autoload()
+
+        _, snmp_service = self._autoload()
+
+        self.assertGreater(snmp_service.round_trips, 1)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.snmp.snmp_parameters import SNMPReadParameters, SNMPV3Parameters
+
+from cloudshell.paloalto.flows.panos_enable_disable_snmp_flow import (
+    PanOSEnableDisableSnmpFlow,
+)
+from cloudshell.paloalto.helpers.commit_coordinator import CommitCoordinator
+
+PREFIX = "set deviceconfig system snmp-setting access-setting"
+SERVICES_ENABLED = (
+    "HTTP        : Disabled\nSNMP        : Enabled\nSSH         : Enabled"
+)
+SERVICES_DISABLED = "HTTP        : Disabled\nSNMP        : Disabled\n"
+V3_USER_COMMAND = (
+    f"{PREFIX} version v3 users quali_user authpwd pass privpwd key " "view quali_views"
+)
+
+
+class FakeCliService:
+    def __init__(self, services: str, settings: str, pending_changes: str = "no"):
+        self.outputs = {
+            "show system services": services,
+            "show deviceconfig system snmp-setting access-setting": settings,
+            "check pending-changes": pending_changes,
+            "commit": "Configuration committed successfully",
+        }
+        self.commands = []
+
+    def send_command(self, command, *args, **kwargs):
+        self.commands.append(command)
+        return self.outputs.get(command, "")
+
+    def enter_mode(self, command_mode):
+        return nullcontext(self)
+
+
+class TestPanOSEnableDisableSnmpFlow(TestCase):
+    def setUp(self):
+        patcher = patch.object(CommitCoordinator, "BATCH_WINDOW", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _enable_snmp(self, cli_service, snmp_parameters):
+        cli_configurator = Mock()
+        cli_configurator.enable_mode_service.return_value = nullcontext(cli_service)
+        PanOSEnableDisableSnmpFlow(cli_configurator).enable_snmp(snmp_parameters)
+        return cli_service.commands
+
+    def test_v2c_already_configured(self):
+        cli_service = FakeCliService(
+            SERVICES_ENABLED, f"{PREFIX} version v2c snmp-community-string public\n"
+        )
+
+        commands = self._enable_snmp(
+            cli_service, SNMPReadParameters("10.0.0.1", "public")
+        )
+
+        self.assertNotIn("commit", commands)
+        self.assertFalse([x for x in commands if x.startswith("set ")])
+
+    def test_v2c_other_community(self):
+        cli_service = FakeCliService(
+            SERVICES_ENABLED, f"{PREFIX} version v2c snmp-community-string other\n"
+        )
+
+        commands = self._enable_snmp(
+            cli_service, SNMPReadParameters("10.0.0.1", "public")
+        )
+
+        self.assertEqual(
+            [x for x in commands if x.startswith("set ") or x == "commit"],
+            [f"{PREFIX} version v2c snmp-community-string public", "commit"],
+        )
+
+    def test_v2c_service_disabled(self):
+        cli_service = FakeCliService(
+            SERVICES_DISABLED, f"{PREFIX} version v2c snmp-community-string public\n"
+        )
+
+        commands = self._enable_snmp(
+            cli_service, SNMPReadParameters("10.0.0.1", "public")
+        )
+
+        self.assertEqual(
+            [x for x in commands if x.startswith("set ") or x == "commit"],
+            ["set deviceconfig system service disable-snmp no", "commit"],
+        )
+
+    def test_v2c_configured_in_candidate_config(self):
+        cli_service = FakeCliService(
+            SERVICES_ENABLED,
+            f"{PREFIX} version v2c snmp-community-string public\n",
+            pending_changes="yes",
+        )
+
+        commands = self._enable_snmp(
+            cli_service, SNMPReadParameters("10.0.0.1", "public")
+        )
+
+        self.assertEqual(commands[-1], "commit")
+
+    def test_v3_already_configured(self):
+        cli_service = FakeCliService(SERVICES_ENABLED, "")
+
+        commands = self._enable_snmp(
+            cli_service, SNMPV3Parameters("10.0.0.1", "quali_user", "pass", "key")
+        )
+
+        # the same passwords don't make pending changes
+        self.assertIn(V3_USER_COMMAND, commands)
+        self.assertNotIn("commit", commands)
+
+    def test_v3_password_changed(self):
+        cli_service = FakeCliService(SERVICES_ENABLED, "", pending_changes="yes")
+
+        commands = self._enable_snmp(
+            cli_service, SNMPV3Parameters("10.0.0.1", "quali_user", "pass", "key")
+        )
+
+        self.assertIn(V3_USER_COMMAND, commands)
+        self.assertEqual(commands[-1], "commit")
+
+    def test_v3_service_disabled(self):
+        cli_service = FakeCliService(SERVICES_DISABLED, "", pending_changes="yes")
+
+        commands = self._enable_snmp(
+            cli_service, SNMPV3Parameters("10.0.0.1", "quali_user", "pass", "key")
+        )
+
+        self.assertIn("set deviceconfig system service disable-snmp no", commands)
+        self.assertEqual(commands[-1], "commit")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+from contextlib import nullcontext
+from threading import Event
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.snmp.snmp_parameters import SNMPReadParameters
+
+from cloudshell.paloalto.autoload.panos_autoload_cache import PanOSAutoloadCache
+from cloudshell.paloalto.flows.panos_fleet_autoload_flow import (
+    FleetAutoloadDevice,
+    PanOSFleetAutoloadFlow,
+)
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    create_resource_model,
+    read_snmpwalk,
+)
+
+
+class TestPanOSFleetAutoloadFlow(TestCase):
+    def setUp(self):
+        self._records = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+
+    def _create_device(self, name, snmp_service=None, error=None):
+        snmp_configurator = Mock()
+        if error:
+            snmp_configurator.get_service.side_effect = error
+        else:
+            snmp_service = snmp_service or FakeSnmpService(self._records)
+            snmp_configurator.get_service.return_value = nullcontext(snmp_service)
+        return FleetAutoloadDevice(name, snmp_configurator, create_resource_model(name))
+
+    def test_discover(self):
+        devices = [self._create_device(f"fw{x}") for x in range(3)]
+
+        results = PanOSFleetAutoloadFlow(max_workers=2).discover(["Palo Alto"], devices)
+
+        self.assertEqual(set(results), {"fw0", "fw1", "fw2"})
+        for result in results.values():
+            self.assertTrue(result.success, result.error)
+            self.assertTrue(result.details.resources)
+            self.assertGreater(result.duration, 0)
+
+    def test_failed_device_is_isolated(self):
+        devices = [
+            self._create_device("broken", error=OSError("no route to host")),
+            self._create_device("fw"),
+        ]
+
+        results = PanOSFleetAutoloadFlow().discover(["Palo Alto"], devices)
+
+        self.assertFalse(results["broken"].success)
+        self.assertIsInstance(results["broken"].error, OSError)
+        self.assertIsNone(results["broken"].details)
+        self.assertTrue(results["fw"].success)
+
+    def test_timed_out_device(self):
+        released = Event()
+        self.addCleanup(released.set)
+        details = Mock()
+
+        def discover(supported_os, resource_model):
+            if resource_model.name == "slow":
+                released.wait()
+            return details
+
+        devices = [self._create_device("slow"), self._create_device("fw")]
+
+        with patch(
+            "cloudshell.paloalto.flows.panos_fleet_autoload_flow."
+            "PanOSSnmpAutoloadFlow.discover",
+            side_effect=discover,
+        ):
+            results = PanOSFleetAutoloadFlow(timeout=1).discover(["Palo Alto"], devices)
+
+        self.assertIsInstance(results["slow"].error, TimeoutError)
+        self.assertIs(results["fw"].details, details)
+
+    def test_cached_autoload(self):
+        temp_dir_context = TempDirContext()
+        flow = PanOSFleetAutoloadFlow(
+            autoload_cache=PanOSAutoloadCache(temp_dir_context.__enter__())
+        )
+        self.addCleanup(temp_dir_context.__exit__, None, None, None)
+        snmp_parameters = SNMPReadParameters("192.168.1.1", "public")
+        device = self._create_device("fw")
+        device.snmp_parameters = snmp_parameters
+        flow.discover(["Palo Alto"], [device])
+        snmp_service = FakeSnmpService(self._records)
+        device = self._create_device("fw", snmp_service)
+        device.snmp_parameters = snmp_parameters
+
+        results = flow.discover(["Palo Alto"], [device])
+
+        self.assertTrue(results["fw"].success)
+        self.assertEqual(snmp_service.round_trips, 1)
+
+    def test_duplicate_names_rejected(self):
+        devices = [self._create_device("fw"), self._create_device("fw")]
+
+        with self.assertRaisesRegex(Exception, "Duplicate device names"):
+            PanOSFleetAutoloadFlow().discover(["Palo Alto"], devices)
+        devices[0].snmp_configurator.get_service.assert_not_called()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.paloalto.flows.panos_fleet_firmware_flow import (
+    FleetFirmwareDevice,
+    PanOSFleetFirmwareFlow,
+)
+from cloudshell.paloalto.flows.panos_load_firmware_flow import FirmwareLoadTimings
+
+FIRMWARE_PATH = "tftp://192.168.1.2/images/PanOS_vm-10.1.3"
+
+
+class TestPanOSFleetFirmwareFlow(TestCase):
+    def setUp(self):
+        self._lock = Lock()
+        self._running = 0
+        self.max_running = 0
+        patcher = patch(
+            "cloudshell.paloalto.flows.panos_fleet_firmware_flow."
+            "PanOSLoadFirmwareFlow.upgrade_firmware",
+            autospec=True,
+            side_effect=self._upgrade_firmware,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _upgrade_firmware(self, flow, path):
+        with self._lock:
+            self._running += 1
+            self.max_running = max(self.max_running, self._running)
+        try:
+            time.sleep(0.05)
+            if flow._resource_config.address == "broken":
+                raise Exception("Install software", "Software install failed")
+            return FirmwareLoadTimings(transfer=1, install=2)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    @staticmethod
+    def _create_devices(*addresses):
+        return [
+            FleetFirmwareDevice(f"fw-{i}", Mock(address=address), Mock())
+            for i, address in enumerate(addresses)
+        ]
+
+    def test_concurrency_limit(self):
+        flow = PanOSFleetFirmwareFlow(max_workers=2)
+
+        results = flow.upgrade(FIRMWARE_PATH, self._create_devices(*"abcdef"))
+
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(x.success for x in results.values()))
+        self.assertEqual(self.max_running, 2)
+        self.assertEqual(results["fw-0"].timings.total, 3)
+        self.assertGreater(max(x.queued for x in results.values()), 0.05)
+
+    def test_failed_device_is_isolated(self):
+        flow = PanOSFleetFirmwareFlow()
+
+        results = flow.upgrade(FIRMWARE_PATH, self._create_devices("a", "broken"))
+
+        self.assertTrue(results["fw-0"].success)
+        self.assertFalse(results["fw-1"].success)
+        self.assertIsNone(results["fw-1"].timings)
+        self.assertIn("Software install failed", str(results["fw-1"].error))
+
+    def test_duplicate_names_rejected(self):
+        devices = self._create_devices("a", "b")
+        devices[1].name = devices[0].name
+
+        with self.assertRaisesRegex(Exception, "Duplicate device names"):
+            PanOSFleetFirmwareFlow().upgrade(FIRMWARE_PATH, devices)
+        self.assertEqual(self.max_running, 0)
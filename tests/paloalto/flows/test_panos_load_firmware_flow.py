@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.paloalto.command_actions.system_actions import SoftwareImage
+from cloudshell.paloalto.flows.panos_load_firmware_flow import PanOSLoadFirmwareFlow
+from cloudshell.paloalto.helpers.readiness_prober import ReloadTimings
+
+
+@patch("cloudshell.paloalto.flows.panos_load_firmware_flow.SystemActions")
+@patch("cloudshell.paloalto.flows.panos_load_firmware_flow.FirmwareActions")
+class TestPanOSLoadFirmwareFlow(TestCase):
+    def _load_firmware(
+        self, firmware_actions, image=None, reload=False, transfer_verifier=None
+    ):
+        actions = firmware_actions.return_value
+        actions.get_version_from_file_name.return_value = "10.1.3"
+        actions.get_software_image.return_value = image
+        cli_configurator = Mock()
+        cli_configurator.enable_mode_service.return_value = nullcontext(Mock())
+        flow = PanOSLoadFirmwareFlow(
+            Mock(), cli_configurator, reload, transfer_verifier
+        )
+        self.timings = flow.upgrade_firmware(
+            "tftp://192.168.1.2/images/PanOS_vm-10.1.3", "a" * 64
+        )
+        return actions
+
+    def test_import_new_image(self, firmware_actions, system_actions):
+        actions = self._load_firmware(
+            firmware_actions, SoftwareImage("10.1.3", downloaded=False, current=False)
+        )
+
+        system_actions.return_value.import_config.assert_called_once()
+        actions.install_software.assert_called_once_with("PanOS_vm-10.1.3")
+        actions.wait_for_install.assert_called_once_with(
+            actions.install_software.return_value, 3600
+        )
+        system_actions.return_value.reload_device.assert_not_called()
+        self.assertIsNone(self.timings.reload)
+
+    def test_command_logged(self, firmware_actions, system_actions):
+        with self.assertLogs(
+            "cloudshell.paloalto.flows.panos_load_firmware_flow", "DEBUG"
+        ) as logs:
+            self._load_firmware(firmware_actions)
+
+        self.assertIn(
+            'Command "upgrade_firmware" finished successfully', logs.output[-1]
+        )
+
+    def test_skip_import_of_downloaded_image(self, firmware_actions, system_actions):
+        actions = self._load_firmware(
+            firmware_actions, SoftwareImage("10.1.3", downloaded=True, current=False)
+        )
+
+        system_actions.return_value.import_config.assert_not_called()
+        actions.install_software_version.assert_called_once_with("10.1.3")
+        actions.install_software.assert_not_called()
+        self.assertEqual(self.timings.transfer, 0)
+
+    def test_reload_after_install(self, firmware_actions, system_actions):
+        reload_timings = ReloadTimings(down=30, booting=200, management_ready=60)
+        system_actions.return_value.reload_device.return_value = reload_timings
+
+        self._load_firmware(firmware_actions, reload=True)
+
+        system_actions.return_value.reload_device.assert_called_once()
+        self.assertIs(self.timings.reload, reload_timings)
+        self.assertGreaterEqual(self.timings.total, 290)
+
+    def test_skip_installed_image(self, firmware_actions, system_actions):
+        actions = self._load_firmware(
+            firmware_actions, SoftwareImage("10.1.3", downloaded=True, current=True)
+        )
+
+        system_actions.return_value.import_config.assert_not_called()
+        actions.install_software_version.assert_not_called()
+
+    def test_verify_imported_image(self, firmware_actions, system_actions):
+        system_actions.return_value.import_config.return_value = 1024
+        transfer_verifier = Mock()
+        transfer_verifier.verify.side_effect = Exception("Verify transfer", "")
+
+        with self.assertRaisesRegex(Exception, "Verify transfer"):
+            self._load_firmware(firmware_actions, transfer_verifier=transfer_verifier)
+
+        url, received_size, expected_sha256 = transfer_verifier.verify.call_args[0]
+        self.assertEqual(url.filename, "PanOS_vm-10.1.3")
+        self.assertEqual(received_size, 1024)
+        self.assertEqual(expected_sha256, "a" * 64)
+        firmware_actions.return_value.install_software.assert_not_called()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.paloalto.command_actions.batch_command_actions import BatchCommand
+from cloudshell.paloalto.flows.panos_run_command_flow import PanOSRunCommandFlow
+
+from tests.paloalto.command_actions.test_batch_command_actions import FakeBatchCli
+
+
+class TestPanOSRunCommandFlow(TestCase):
+    def setUp(self):
+        self._enable_cli = FakeBatchCli()
+        self._config_cli = FakeBatchCli(config=True)
+        self._enable_cli.enter_mode = Mock(return_value=nullcontext(self._config_cli))
+        self._cli_configurator = Mock()
+        self._cli_configurator.enable_mode_service.return_value = nullcontext(
+            self._enable_cli
+        )
+        self._flow = PanOSRunCommandFlow(self._cli_configurator)
+
+    def test_health_script_in_one_session(self):
+        commands = ["show clock", "show system info", "show interface all"] * 16
+        commands += ["set address a1 ip-netmask 10.0.0.1", "show clock"]
+
+        results = self._flow.run_commands(commands)
+
+        self._cli_configurator.enable_mode_service.assert_called_once()
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(x.success for x in results))
+        self.assertEqual([x.config for x in results[-3:]], [False, True, False])
+        # 48 show commands in 3 round trips, single commands wait for prompt
+        self.assertEqual(len(self._enable_cli.session.sent), 3)
+        self.assertEqual(self._enable_cli.commands, ["show clock"])
+        self.assertEqual(len(self._config_cli.commands), 1)
+
+    def test_stop_on_error(self):
+        commands = [
+            "show clock",
+            "set address a1 color",
+            BatchCommand("show clock", config=True),
+            "show system info",
+        ]
+
+        results = self._flow.run_commands(commands, stop_on_error=True)
+
+        self.assertEqual([x.success for x in results], [True, False, False, False])
+        self.assertEqual([x.executed for x in results], [True, True, False, False])
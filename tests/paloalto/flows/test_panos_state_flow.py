@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from pysnmp.proto import rfc1902
+
+from cloudshell.snmp.cloudshell_snmp import Snmp
+from cloudshell.snmp.snmp_parameters import SNMPReadParameters
+
+from cloudshell.paloalto.flows.panos_state_flow import (
+    CLI_LOGIN_TIER,
+    POOLED_CLI_TIER,
+    SNMP_TIER,
+    PanOSStateFlow,
+)
+
+from tests.paloalto.autoload.snmp_fixtures import (
+    FIXTURES_DIR,
+    FakeSnmpService,
+    UdpSnmpAgent,
+    read_snmpwalk,
+)
+
+PAN_SYS_SW_VERSION_OID = "1.3.6.1.4.1.25461.2.1.2.1.1.0"
+RECORDS = read_snmpwalk(os.path.join(FIXTURES_DIR, "pa-220.snmpwalk"))
+
+
+class TestPanOSStateFlow(TestCase):
+    def setUp(self):
+        patcher = patch.dict(PanOSStateFlow._results, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self._resource_config = Mock(address="10.0.0.1")
+        self._resource_config.name = "PA-1"
+        self._api = Mock()
+        self._cli_service = Mock()
+        self._cli_service.send_command.return_value = ""
+        self._cli_configurator = Mock()
+        self._cli_configurator.has_idle_session.return_value = False
+        self._cli_configurator.enable_mode_service.return_value = nullcontext(
+            self._cli_service
+        )
+        self._snmp_service = FakeSnmpService(dict(RECORDS))
+        self._snmp_configurator = Mock()
+        self._snmp_configurator.get_service.return_value = nullcontext(
+            self._snmp_service
+        )
+
+    def _create_flow(self, snmp: bool = True) -> PanOSStateFlow:
+        return PanOSStateFlow(
+            self._resource_config,
+            self._cli_configurator,
+            self._api,
+            self._snmp_configurator if snmp else None,
+        )
+
+    def test_snmp_answers_without_cli(self):
+        result = self._create_flow().check_health()
+
+        self.assertTrue(result.online)
+        self.assertEqual(result.tier, SNMP_TIER)
+        self.assertEqual(list(result.latencies), [SNMP_TIER])
+        self.assertEqual(self._snmp_service.round_trips, 1)
+        self._cli_configurator.enable_mode_service.assert_not_called()
+
+    def test_pooled_session_after_snmp_failure(self):
+        self._snmp_service.records.clear()
+        self._cli_configurator.has_idle_session.return_value = True
+
+        result = self._create_flow().check_health()
+
+        self.assertEqual(result.tier, POOLED_CLI_TIER)
+        self.assertEqual(list(result.latencies), [SNMP_TIER, POOLED_CLI_TIER])
+        self._cli_configurator.enable_mode_service.assert_called_once()
+
+    def test_empty_snmp_value_fails_tier(self):
+        self._snmp_service.records[PAN_SYS_SW_VERSION_OID] = rfc1902.OctetString("")
+
+        result = self._create_flow().check_health()
+
+        self.assertEqual(result.tier, CLI_LOGIN_TIER)
+
+    def test_cli_login_without_snmp(self):
+        result = self._create_flow(snmp=False).check_health()
+
+        self.assertEqual(result.tier, CLI_LOGIN_TIER)
+        self._snmp_configurator.get_service.assert_not_called()
+
+    def test_health_check_failed(self):
+        self._snmp_service.records.clear()
+        self._cli_configurator.has_idle_session.return_value = True
+        self._cli_service.send_command.side_effect = Exception("CLI", "timeout")
+
+        output = self._create_flow().health_check()
+
+        self.assertEqual(output, "Health check on resource PA-1 failed.")
+        # the idle session is reconnected by the pool, no second login
+        self._cli_configurator.enable_mode_service.assert_called_once()
+        self._api.SetResourceLiveStatus.assert_called_once_with("PA-1", "Error", output)
+
+    def test_result_cached(self):
+        self._create_flow().health_check()
+        output = self._create_flow().health_check()
+
+        self.assertEqual(output, "Health check on resource PA-1 passed.")
+        self.assertEqual(self._snmp_service.round_trips, 1)
+        self.assertEqual(self._api.SetResourceLiveStatus.call_count, 2)
+
+    def test_expired_result_checked_again(self):
+        with patch.object(PanOSStateFlow, "HEALTH_CHECK_TTL", 0):
+            self._create_flow().check_health()
+            self._create_flow().check_health()
+
+        self.assertEqual(self._snmp_service.round_trips, 2)
+
+    def test_offline_result_expires_sooner(self):
+        self._snmp_service.records.clear()
+        self._cli_service.send_command.side_effect = Exception("CLI", "timeout")
+
+        self.assertFalse(self._create_flow().check_health().online)
+        self.assertFalse(self._create_flow().check_health().online)
+        self.assertEqual(self._snmp_service.round_trips, 1)
+
+        with patch.object(PanOSStateFlow, "OFFLINE_RESULT_TTL", 0):
+            self._create_flow().check_health()
+        self.assertEqual(self._snmp_service.round_trips, 2)
+
+    def test_concurrent_checks_probe_once(self):
+        checks = []
+
+        def check_snmp():
+            checks.append(1)
+            time.sleep(0.1)
+
+        with patch.object(PanOSStateFlow, "_check_snmp", side_effect=check_snmp):
+            with ThreadPoolExecutor(4) as executor:
+                results = list(
+                    executor.map(lambda _: self._create_flow().check_health(), range(4))
+                )
+
+        self.assertEqual(len(checks), 1)
+        self.assertTrue(all(x is results[0] for x in results))
+
+    def test_snmp_agent(self):
+        with UdpSnmpAgent(dict(RECORDS)) as agent:
+            with Snmp(timeout=1, retry_count=0).get_snmp_service(
+                SNMPReadParameters("127.0.0.1", "public", port=agent.port), Mock()
+            ) as snmp_service:
+                self._snmp_configurator.get_service.return_value = nullcontext(
+                    snmp_service
+                )
+                result = self._create_flow().check_health()
+
+        self.assertEqual(result.tier, SNMP_TIER)
+        self.assertEqual(agent.requests, 2)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cloudshell.paloalto.helpers.commit_coordinator import CommitCoordinator
+
+
+class TestCommitCoordinator(TestCase):
+    def setUp(self):
+        self._coordinator = CommitCoordinator("10.0.0.1", batch_window=0.2)
+
+    def test_concurrent_commits_coalesced(self):
+        commit = Mock(return_value="Configuration committed successfully")
+
+        with ThreadPoolExecutor(5) as pool:
+            results = list(
+                pool.map(lambda _: self._coordinator.commit(commit), range(5))
+            )
+
+        commit.assert_called_once()
+        self.assertEqual(self._coordinator.commits, 1)
+        self.assertEqual(set(results), {"Configuration committed successfully"})
+
+    def test_error_shared(self):
+        commit = Mock(side_effect=Exception("Commit", "another commit in progress"))
+
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(self._coordinator.commit, commit) for _ in range(3)]
+
+        for future in futures:
+            self.assertIn("another commit in progress", str(future.exception()))
+        commit.assert_called_once()
+
+    def test_next_batch_waits_for_running_commit(self):
+        started, release = Event(), Event()
+        calls = []
+
+        def slow_commit():
+            calls.append(time.monotonic())
+            started.set()
+            release.wait(5)
+
+        with ThreadPoolExecutor(4) as pool:
+            first = pool.submit(self._coordinator.commit, slow_commit)
+            started.wait(5)
+            later = [
+                pool.submit(self._coordinator.commit, slow_commit) for _ in range(3)
+            ]
+            time.sleep(0.3)
+            self.assertEqual(len(calls), 1)
+            release.set()
+            first.result(5)
+            for future in later:
+                future.result(5)
+
+        self.assertEqual(self._coordinator.commits, 2)
+
+    def test_for_device(self):
+        self.assertIs(
+            CommitCoordinator.for_device("10.0.0.2"),
+            CommitCoordinator.for_device("10.0.0.2"),
+        )
+        self.assertIsNot(
+            CommitCoordinator.for_device("10.0.0.2"),
+            CommitCoordinator.for_device("10.0.0.3"),
+        )
+
+    def test_exclusive_waits_for_changes(self):
+        events = []
+        changing, release = Event(), Event()
+
+        def change():
+            with self._coordinator.changes():
+                changing.set()
+                release.wait(5)
+                events.append("set")
+                self._coordinator.commit(lambda: events.append("commit"))
+
+        def load():
+            with self._coordinator.exclusive():
+                events.append("load")
+
+        with ThreadPoolExecutor(2) as pool:
+            first = pool.submit(change)
+            changing.wait(5)
+            second = pool.submit(load)
+            time.sleep(0.1)
+            self.assertEqual(events, [])
+            release.set()
+            first.result(5)
+            second.result(5)
+
+        self.assertEqual(events, ["set", "commit", "load"])
+
+    def test_changes_wait_for_exclusive(self):
+        events = []
+        loading, release = Event(), Event()
+
+        def load():
+            with self._coordinator.exclusive():
+                loading.set()
+                release.wait(5)
+                events.append("load")
+
+        def change():
+            with self._coordinator.changes():
+                events.append("set")
+
+        with ThreadPoolExecutor(3) as pool:
+            first = pool.submit(load)
+            loading.wait(5)
+            second = pool.submit(change)
+            third = pool.submit(self._coordinator.commit, lambda: events.append("c"))
+            time.sleep(0.3)
+            self.assertEqual(events, [])
+            release.set()
+            for future in (first, second, third):
+                future.result(5)
+
+        self.assertEqual(events[0], "load")
+        self.assertEqual(sorted(events[1:]), ["c", "set"])
+
+    @patch.object(CommitCoordinator, "IDLE_TTL", 0)
+    def test_idle_coordinators_evicted(self):
+        with patch.dict(CommitCoordinator._coordinators, clear=True):
+            CommitCoordinator.for_device("10.0.0.2")
+            time.sleep(0.01)
+            CommitCoordinator.for_device("10.0.0.3")
+
+            self.assertEqual(list(CommitCoordinator._coordinators), ["10.0.0.3"])
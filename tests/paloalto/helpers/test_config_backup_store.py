@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+from unittest import TestCase
+
+from cloudshell.paloalto.helpers.config_backup_store import ConfigBackupStore
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+
+
+def _create_config(rules: int, changed: int | None = None) -> bytes:
+    lines = ["<config>"]
+    for i in range(rules):
+        action = "deny" if i == changed else "allow"
+        lines.append(f'  <entry name="rule-{i}"><action>{action}</action></entry>')
+    lines.append("</config>")
+    return "\n".join(lines).encode()
+
+
+class TestConfigBackupStore(TestCase):
+    def setUp(self):
+        temp_dir_context = TempDirContext()
+        self._temp_dir = temp_dir_context.__enter__()
+        self.addCleanup(temp_dir_context.__exit__, None, None, None)
+        self._store = ConfigBackupStore(self._temp_dir)
+
+    def _object_size(self, config_hash: str) -> int:
+        return os.path.getsize(self._store._object_path(config_hash))
+
+    def test_delta_versions(self):
+        configs = [_create_config(5000, changed) for changed in (None, 10, 4000)]
+
+        versions = [self._store.add("fw1", config) for config in configs]
+
+        for version, config in zip(versions, configs):
+            self.assertEqual(self._store.load(version["hash"]), config)
+        full_size = self._object_size(versions[0]["hash"])
+        self.assertLess(self._object_size(versions[1]["hash"]) * 20, full_size)
+        self.assertLess(self._object_size(versions[2]["hash"]) * 20, full_size)
+
+    def test_same_config_stored_once(self):
+        config = _create_config(100)
+
+        first = self._store.add("fw1", config, fingerprint="a")
+        second = self._store.add("fw2", config, fingerprint="b")
+
+        self.assertEqual(first["hash"], second["hash"])
+        objects = [
+            x
+            for _, _, files in os.walk(os.path.join(self._temp_dir, "objects"))
+            for x in files
+        ]
+        self.assertEqual(objects, [first["hash"]])
+
+    def test_find_version(self):
+        self._store.add("fw1", _create_config(10), fingerprint="a")
+        version = self._store.add("fw1", _create_config(10, 1), fingerprint="b")
+
+        self.assertEqual(self._store.find_version("fw1", "b"), version)
+        self.assertIsNone(self._store.find_version("fw1", "a"))
+        self.assertIsNone(self._store.find_version("fw2", "b"))
+
+    def test_find_version_after_startup_backup(self):
+        version = self._store.add("fw1", _create_config(10), fingerprint="a")
+        self._store.add("fw1", _create_config(10, 1))
+
+        self.assertEqual(self._store.find_version("fw1", "a"), version)
+        self.assertIsNone(self._store.find_version("fw1", "b"))
+
+    def test_delta_chain_limited(self):
+        self._store.MAX_DELTA_CHAIN = 2
+        versions = [self._store.add("fw1", _create_config(1000, x)) for x in range(4)]
+
+        kinds = [self._store._read_object(x["hash"])[0] for x in versions]
+
+        self.assertEqual(kinds, [b"F", b"D", b"D", b"F"])
+        self.assertEqual(self._store.load(versions[2]["hash"]), _create_config(1000, 2))
+
+    def test_export(self):
+        version = self._store.add("fw1", b"<config/>\xff")
+        path = os.path.join(self._temp_dir, "export", "fw1.xml")
+
+        self._store.export(version["hash"], path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"<config/>\xff")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.paloalto.cli.panos_command_modes import (
+    ConfigCommandMode,
+    DefaultCommandMode,
+)
+from cloudshell.paloalto.command_actions.system_actions import (
+    SystemConfigurationActions,
+)
+from cloudshell.paloalto.helpers import output_patterns
+
+
+class TestOutputPattern(TestCase):
+    def test_values_escaped(self):
+        pattern = output_patterns.CONFIG_SAVED
+
+        self.assertTrue(pattern.search("Config saved to fw+1.xml", filename="fw+1.xml"))
+        self.assertFalse(pattern.search("Config saved to fw1Xxml", filename="fw+1.xml"))
+
+    def test_compiled_once(self):
+        pattern = output_patterns.SCP_IMPORTED
+
+        self.assertIs(
+            pattern.compile(filename="a.xml"), pattern.compile(filename="a.xml")
+        )
+
+    def test_save_config_with_dotted_name(self):
+        cli_service = Mock()
+        cli_service.send_command.return_value = "Config saved to backupXxml"
+
+        with self.assertRaisesRegex(Exception, "Save configuration failed"):
+            SystemConfigurationActions(cli_service).save_config("backup.xml")
+
+
+class TestMatchPrompt(TestCase):
+    PROMPTS = f"{DefaultCommandMode.PROMPT}|{ConfigCommandMode.PROMPT}"
+
+    def test_prompt_on_the_end(self):
+        output = "set address a ip-netmask 10.0.0.1\n" * 100000
+
+        self.assertTrue(
+            output_patterns.match_prompt(self.PROMPTS, output + "[edit]\nadmin@fw1# ")
+        )
+        self.assertFalse(output_patterns.match_prompt(self.PROMPTS, output))
+
+    def test_not_registered_pattern_searches_whole_output(self):
+        output = "Commit job 5 is in progress\n" + "x" * 10000
+        pattern = output_patterns.COMMIT_JOB_STARTED.pattern
+
+        self.assertTrue(output_patterns.match_prompt(pattern, output))
+        self.assertFalse(
+            output_patterns.match_prompt(f"{pattern}|{DefaultCommandMode.PROMPT}", "x")
+        )
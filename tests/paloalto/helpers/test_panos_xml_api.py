@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import os
+import ssl
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import TestCase
+from urllib.parse import parse_qs, urlparse
+
+from cloudshell.paloalto.helpers.panos_xml_api import PanOSXmlApiClient
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+
+API_KEY = "LUFRPT14MW5xOEo1R09KVlBZNnpnemh0VHRBOWl6TGM9bXcwM3JHUGVhRlNiY0dCR0srNERUQT09"
+RUNNING_CONFIG = b"<config version='10.1.0'>" + b"<entry/>" * 50000 + b"</config>"
+ERROR = b'<response status="error"><result><msg>{}</msg></result></response>'
+
+
+class PanOSApiHandler(BaseHTTPRequestHandler):
+    """Stand-in for the PanOS management server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type="application/xml"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers["Content-Length"]))
+
+    def _get_params(self) -> dict[str, str]:
+        return {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+
+    def do_GET(self):
+        params = self._get_params()
+        if self.headers["X-PAN-KEY"] != self.server.api_key:
+            return self._send(403, ERROR.replace(b"{}", b"Invalid credentials."))
+        if params == {"type": "export", "category": "configuration"}:
+            return self._send(200, RUNNING_CONFIG, "application/octet-stream")
+        self._send(400, ERROR.replace(b"{}", b"Bad request"))
+
+    def do_POST(self):
+        params = self._get_params()
+        body = self._read_body()
+        if params["type"] == "keygen":
+            form = parse_qs(body.decode())
+            if form == {"user": ["admin"], "password": ["pa$$word"]}:
+                self.server.keygens += 1
+                key = self.server.api_key
+                return self._send(
+                    200,
+                    f'<response status="success"><result><key>{key}</key>'
+                    f"</result></response>".encode(),
+                )
+            return self._send(403, ERROR.replace(b"{}", b"Invalid credentials."))
+        if self.headers["X-PAN-KEY"] != self.server.api_key:
+            return self._send(403, ERROR.replace(b"{}", b"Invalid credentials."))
+        boundary = self.headers["Content-Type"].split("boundary=")[1].encode()
+        part = body.split(b"--" + boundary)[1]
+        headers, _, content = part.partition(b"\r\n\r\n")
+        filename = headers.split(b'filename="')[1].split(b'"')[0].decode()
+        self.server.files[filename] = content.removesuffix(b"\r\n")
+        msg = f"<msg>{filename} saved</msg>"
+        self._send(200, f'<response status="success">{msg}</response>'.encode())
+
+
+class TestPanOSXmlApiClient(TestCase):
+    def setUp(self):
+        temp_dir_context = TempDirContext()
+        self._temp_dir = temp_dir_context.__enter__()
+        self.addCleanup(temp_dir_context.__exit__, None, None, None)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), PanOSApiHandler)
+        self._server.daemon_threads = True
+        self._server.connections = 0
+        self._server.files = {}
+        self._server.api_key = API_KEY
+        self._server.keygens = 0
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        self.addCleanup(self._server.server_close)
+        self.addCleanup(self._server.shutdown)
+
+    def _create_client(self, password="pa$$word") -> PanOSXmlApiClient:
+        client = PanOSXmlApiClient(
+            "127.0.0.1",
+            "admin",
+            password,
+            port=self._server.server_address[1],
+            use_https=False,
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_export_running_config(self):
+        client = self._create_client()
+        path = os.path.join(self._temp_dir, "running.xml")
+
+        for _ in range(3):
+            self.assertEqual(client.export_running_config(path), len(RUNNING_CONFIG))
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), RUNNING_CONFIG)
+        # keygen and exports use the same kept-alive connection
+        self.assertEqual(client.connections_created, 1)
+        self.assertEqual(self._server.connections, 1)
+
+    def test_import_config(self):
+        client = self._create_client()
+        path = os.path.join(self._temp_dir, "fw1-running.xml")
+        config = RUNNING_CONFIG.replace(b"entry", b"rule") + b"\r\n"
+        with open(path, "wb") as f:
+            f.write(config)
+
+        client.import_config(path)
+
+        self.assertEqual(self._server.files, {"fw1-running.xml": config})
+
+    def test_invalid_credentials(self):
+        client = self._create_client(password="wrong")
+
+        with self.assertRaisesRegex(Exception, "Invalid credentials"):
+            client.export_running_config(os.path.join(self._temp_dir, "r.xml"))
+
+        self.assertFalse(os.listdir(self._temp_dir))
+
+    def test_renew_rejected_key(self):
+        client = self._create_client()
+        path = os.path.join(self._temp_dir, "running.xml")
+        client.export_running_config(path)
+        # the admin password or the master key is changed on the device
+        self._server.api_key = API_KEY[::-1]
+
+        client.export_running_config(path)
+        client.import_config(path)
+
+        self.assertEqual(self._server.keygens, 2)
+        self.assertEqual(self._server.files, {"running.xml": RUNNING_CONFIG})
+
+    def test_verify_certificate_by_default(self):
+        client = PanOSXmlApiClient("127.0.0.1", "admin", "pa$$word")
+
+        self.assertEqual(client._ssl_context.verify_mode, ssl.CERT_REQUIRED)
+        self.assertTrue(client._ssl_context.check_hostname)
+
+    def test_reconnect_closed_idle_connection(self):
+        PanOSApiHandler.timeout = 0.1
+        self.addCleanup(setattr, PanOSApiHandler, "timeout", None)
+        client = self._create_client()
+        path = os.path.join(self._temp_dir, "running.xml")
+        client.export_running_config(path)
+        time.sleep(0.5)
+
+        client.export_running_config(path)
+
+        self.assertEqual(client.connections_created, 2)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import socket
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import Mock
+
+from cloudshell.paloalto.helpers.readiness_prober import ReadinessProber
+
+
+class TestReadinessProber(TestCase):
+    def _start_server(self, banner: bytes) -> int:
+        server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(server.close)
+
+        def serve():
+            try:
+                while True:
+                    conn, _ = server.accept()
+                    with conn:
+                        conn.sendall(banner)
+            except OSError:
+                pass
+
+        Thread(target=serve, daemon=True).start()
+        return server.getsockname()[1]
+
+    @staticmethod
+    def _get_closed_port() -> int:
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            return server.getsockname()[1]
+
+    def test_probe_ssh_banner(self):
+        port = self._start_server(b"SSH-2.0-OpenSSH_8.0\r\n")
+        self.assertTrue(ReadinessProber("127.0.0.1", port, b"SSH-").probe())
+
+    def test_probe_without_banner(self):
+        port = self._start_server(b"")
+        self.assertFalse(ReadinessProber("127.0.0.1", port, b"SSH-").probe())
+        self.assertTrue(ReadinessProber("127.0.0.1", port).probe())
+
+    def test_probe_closed_port(self):
+        prober = ReadinessProber("127.0.0.1", self._get_closed_port())
+        self.assertFalse(prober.probe())
+        self.assertTrue(prober.wait_down(1))
+
+    def test_intervals(self):
+        prober = ReadinessProber("127.0.0.1", 22, initial_interval=1, max_interval=8)
+        intervals = prober.intervals()
+        result = [next(intervals) for _ in range(6)]
+
+        for interval, expected in zip(result, (1, 2, 4, 8, 8, 8)):
+            self.assertGreaterEqual(interval, expected * (1 - prober.JITTER))
+            self.assertLessEqual(interval, expected * (1 + prober.JITTER))
+
+    def test_wait_for(self):
+        prober = ReadinessProber("127.0.0.1", 22, initial_interval=0.01)
+        check = Mock(side_effect=[False, False, True])
+
+        self.assertTrue(prober.wait_for(check, 5))
+        self.assertEqual(check.call_count, 3)
+        self.assertFalse(prober.wait_for(Mock(return_value=False), 0.05))
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import patch
+
+import tftpy
+
+from cloudshell.shell.flows.utils.url import RemoteURL
+
+from cloudshell.paloalto.helpers.local_tftp_receiver import LocalTftpReceiver
+from cloudshell.paloalto.helpers.temp_dir_context import TempDirContext
+from cloudshell.paloalto.helpers.transfer_verifier import TransferVerifier
+
+IMAGE = os.urandom(300 * 1024)
+IMAGE_SHA256 = hashlib.sha256(IMAGE).hexdigest()
+
+
+class _CountingReader(io.FileIO):
+    # a real file, the TFTP server locks the files it serves
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+class TestTransferVerifier(TestCase):
+    def setUp(self):
+        temp_dir_context = TempDirContext()
+        self._temp_dir = temp_dir_context.__enter__()
+        self.addCleanup(temp_dir_context.__exit__, None, None, None)
+        self._receiver = LocalTftpReceiver(
+            listen_ip="127.0.0.1", root_dir=os.path.join(self._temp_dir, "tftp")
+        )
+        self._receiver.start()
+        self.addCleanup(self._receiver.stop)
+        os.makedirs(os.path.join(self._temp_dir, "tftp", "images"))
+        self._image_path = os.path.join(self._temp_dir, "tftp", "images", "PanOS_vm")
+        with open(self._image_path, "wb") as f:
+            f.write(IMAGE)
+        self._url = RemoteURL.from_str(
+            f"tftp://127.0.0.1:{self._receiver.port}/images/PanOS_vm"
+        )
+
+    def test_verify_tftp_source(self):
+        # the receiver doesn't serve files, the source is on a TFTP server
+        server = tftpy.TftpServer(os.path.join(self._temp_dir, "tftp"))
+        Thread(target=server.listen, args=("127.0.0.1", 0), daemon=True).start()
+        server.is_running.wait(10)
+        self.addCleanup(server.stop)
+        url = RemoteURL.from_str(
+            f"tftp://127.0.0.1:{server.listenport}/images/PanOS_vm"
+        )
+
+        digest = TransferVerifier().verify(url, len(IMAGE), IMAGE_SHA256)
+
+        self.assertEqual(digest.size, len(IMAGE))
+        self.assertEqual(digest.sha256, IMAGE_SHA256)
+
+    def _start_tftp_server(self, sources: list[_CountingReader]) -> RemoteURL:
+        def open_source(*args, **kwargs):
+            sources.append(_CountingReader(self._image_path))
+            return sources[-1]
+
+        server = tftpy.TftpServer(
+            os.path.join(self._temp_dir, "tftp", "images"), dyn_file_func=open_source
+        )
+        Thread(target=server.listen, args=("127.0.0.1", 0), daemon=True).start()
+        server.is_running.wait(10)
+        self.addCleanup(server.stop)
+        return RemoteURL.from_str(f"tftp://127.0.0.1:{server.listenport}/PanOS_dyn")
+
+    def test_verify_tftp_size_without_download(self):
+        sources = []
+        url = self._start_tftp_server(sources)
+        verifier = TransferVerifier()
+
+        digest = verifier.verify(url, len(IMAGE))
+
+        self.assertEqual(digest.size, len(IMAGE))
+        self.assertIsNone(digest.sha256)
+        with self.assertRaisesRegex(Exception, "source file has 307200 bytes"):
+            verifier.verify(url, 1000)
+        self.assertEqual(len(sources), 2)
+        self.assertEqual([source.reads for source in sources], [0, 0])
+
+    def test_tftp_size_not_supported(self):
+        verifier = TransferVerifier()
+
+        with patch.object(verifier, "_get_tftp_size", return_value=None):
+            self.assertIsNone(verifier.verify(self._url, 1000))
+
+    def test_verify_local_receiver_file(self):
+        self._receiver.stop()
+        verifier = TransferVerifier(self._receiver)
+
+        digest = verifier.verify(self._url, len(IMAGE), IMAGE_SHA256)
+
+        self.assertEqual(digest.sha256, IMAGE_SHA256)
+
+    def test_truncated_transfer(self):
+        verifier = TransferVerifier(self._receiver)
+
+        with self.assertRaisesRegex(Exception, "Device received 1000 bytes"):
+            verifier.verify(self._url, 1000)
+
+    def test_checksum_mismatch(self):
+        verifier = TransferVerifier(self._receiver)
+
+        with self.assertRaisesRegex(Exception, "doesn't match"):
+            verifier.verify(self._url, len(IMAGE), "0" * 64)
+
+    def test_cached_digest(self):
+        verifier = TransferVerifier(self._receiver)
+        verifier.verify(self._url, len(IMAGE), IMAGE_SHA256)
+        os.remove(self._image_path)
+
+        digest = verifier.verify(self._url, len(IMAGE), IMAGE_SHA256.upper())
+
+        self.assertEqual(digest.sha256, IMAGE_SHA256)
+        self.assertIs(verifier.verify(self._url, len(IMAGE)), digest)
+        with self.assertRaises(FileNotFoundError):
+            verifier.verify(self._url, len(IMAGE) + 1)